@@ -1,10 +1,22 @@
 from ._version import version
-from .services.engine import Engine
-from .services.engine_cloud import EngineCloud
-from .services.insight import Insight
-from .services.nebula import Nebula
-from .services.storage import Storage
+from .services.engine import AsyncEngine, Engine
+from .services.engine_cloud import AsyncEngineCloud, EngineCloud
+from .services.insight import AsyncInsight, Insight
+from .services.nebula import AsyncNebula, Nebula
+from .services.storage import AsyncStorage, Storage
 from .tools.tool import Tool
 
 __version__ = version
-__all__ = ["Engine", "EngineCloud", "Insight", "Nebula", "Storage", "Tool"]
+__all__ = [
+    "AsyncEngine",
+    "AsyncEngineCloud",
+    "AsyncInsight",
+    "AsyncNebula",
+    "AsyncStorage",
+    "Engine",
+    "EngineCloud",
+    "Insight",
+    "Nebula",
+    "Storage",
+    "Tool",
+]
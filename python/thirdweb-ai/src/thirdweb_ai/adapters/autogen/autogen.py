@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 from typing import Any
 
 from autogen_core import CancellationToken
@@ -5,9 +6,10 @@ from autogen_core.tools import BaseTool as AutogenBaseTool
 from pydantic import BaseModel
 
 from thirdweb_ai import Tool
+from thirdweb_ai.tools.executor import run_tool_json_async
 
 
-def get_autogen_tools(tools: list[Tool]):
+def get_autogen_tools(tools: list[Tool], executor: Executor | None = None):
     class WrappedTool(AutogenBaseTool[BaseModel, BaseModel]):
         def __init__(self, tool: Tool):
             self.tool = tool
@@ -20,6 +22,6 @@ def get_autogen_tools(tools: list[Tool]):
             )
 
         async def run(self, args: BaseModel, cancellation_token: CancellationToken) -> Any:
-            return self.tool.run_json(args.model_dump())
+            return await run_tool_json_async(self.tool, args.model_dump(), executor=executor)
 
     return [WrappedTool(tool) for tool in tools]
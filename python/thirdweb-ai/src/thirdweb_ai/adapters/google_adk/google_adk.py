@@ -1,9 +1,11 @@
 import copy
+from concurrent.futures import Executor
 from typing import Any
 
 from google.adk.tools import BaseTool, ToolContext
 from google.genai import types
 
+from thirdweb_ai.tools.executor import run_tool_json_async
 from thirdweb_ai.tools.tool import Tool, ToolSchema
 
 
@@ -13,13 +15,15 @@ class GoogleAdkTool(BaseTool):
     This allows Thirdweb tools to be used with Google ADK agents.
     """
 
-    def __init__(self, tool: Tool):
+    def __init__(self, tool: Tool, executor: Executor | None = None):
         """Initialize the Google ADK Tool wrapper.
 
         Args:
             tool: The Thirdweb Tool to wrap
+            executor: Executor used to run synchronous tools. Defaults to the shared tool executor.
         """
         self.tool = tool
+        self.executor = executor
         super().__init__(
             name=tool.name,
             description=tool.description,
@@ -70,21 +74,23 @@ class GoogleAdkTool(BaseTool):
     async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
         """Execute the tool asynchronously.
 
-        This method adapts the Thirdweb tool to work with Google ADK's async execution.
+        This method adapts the Thirdweb tool to work with Google ADK's async execution. Native async tools are
+        awaited directly, synchronous tools are run on the executor so the event loop is never blocked.
 
         Returns:
             The result of running the tool
         """
-        return self.tool.run_json(args)
+        return await run_tool_json_async(self.tool, args, executor=self.executor)
 
 
-def get_google_adk_tools(tools: list[Tool]) -> list[BaseTool]:
+def get_google_adk_tools(tools: list[Tool], executor: Executor | None = None) -> list[BaseTool]:
     """Convert Thirdweb tools to Google ADK tools.
 
     Args:
         tools: List of Thirdweb tools to convert
+        executor: Executor used to run synchronous tools. Defaults to the shared tool executor.
 
     Returns:
         List of Google ADK tools
     """
-    return [GoogleAdkTool(tool) for tool in tools]
+    return [GoogleAdkTool(tool, executor=executor) for tool in tools]
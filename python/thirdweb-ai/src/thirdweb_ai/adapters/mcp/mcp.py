@@ -1,3 +1,4 @@
+from concurrent.futures import Executor
 from typing import Any, cast
 
 import mcp.types as types
@@ -5,25 +6,32 @@ from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.tools.base import Tool as FastMCPTool
 from mcp.server.fastmcp.utilities.func_metadata import func_metadata
 from thirdweb_ai import Tool
+from thirdweb_ai.tools.executor import run_tool_json_async
 
 
-def get_fastmcp_tools(tools: list[Tool]) -> list[FastMCPTool]:
+def get_fastmcp_tools(tools: list[Tool], executor: Executor | None = None) -> list[FastMCPTool]:
+    def _get_fn(tool: Tool):
+        async def _run(**kwargs: Any) -> Any:
+            return await run_tool_json_async(tool, kwargs, executor=executor)
+
+        return _run
+
     return [
         FastMCPTool(  # type: ignore[reportUnknownVariableType]
-            fn=lambda _t=tool, **kwargs: _t.run_json(kwargs),
+            fn=_get_fn(tool),
             name=tool.name,
             description=tool.description,
             parameters=cast(dict[str, Any], tool.schema.get("parameters") or {}),
             fn_metadata=func_metadata(tool._func_definition, skip_names=["self"]),  # noqa: SLF001
-            is_async=False,
+            is_async=True,
             context_kwarg=None,
         )
         for tool in tools
     ]
 
 
-def add_fastmcp_tools(fastmcp: FastMCP, tools: list[Tool]):
-    for tool in get_fastmcp_tools(tools):
+def add_fastmcp_tools(fastmcp: FastMCP, tools: list[Tool], executor: Executor | None = None):
+    for tool in get_fastmcp_tools(tools, executor=executor):
         fastmcp._tool_manager._tools[tool.name] = tool  # type: ignore[reportPrivateUsage]  # noqa: SLF001
 
 
@@ -1,9 +1,11 @@
 import json
+from concurrent.futures import Executor
 from typing import Any
 
 from agents import FunctionTool, RunContextWrapper
 
 from thirdweb_ai import Tool
+from thirdweb_ai.tools.executor import run_tool_json_async
 
 
 def _get_openai_schema(schema: Any):
@@ -27,11 +29,11 @@ def _get_openai_schema(schema: Any):
     return schema
 
 
-def get_agents_tools(tools: list[Tool]):
+def get_agents_tools(tools: list[Tool], executor: Executor | None = None):
     def _get_tool(tool: Tool):
         async def _invoke_tool(ctx: RunContextWrapper[Any], tool_input: str, _t: Tool = tool) -> str:
             input_args = json.loads(tool_input) if tool_input else {}
-            return _t.return_value_as_string(_t.run_json(input_args))
+            return _t.return_value_as_string(await run_tool_json_async(_t, input_args, executor=executor))
 
         schema = _get_openai_schema(tool.schema.get("parameters"))
         return FunctionTool(
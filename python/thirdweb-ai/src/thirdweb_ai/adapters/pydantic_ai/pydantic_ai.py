@@ -1,15 +1,17 @@
+from concurrent.futures import Executor
 from typing import Any
 
 from pydantic_ai import RunContext
 from pydantic_ai import Tool as PydanticTool
 from pydantic_ai.tools import ToolDefinition
 from thirdweb_ai import Tool
+from thirdweb_ai.tools.executor import run_tool_json_async
 
 
-def get_pydantic_ai_tools(tools: list[Tool]) -> list[PydanticTool]:
+def get_pydantic_ai_tools(tools: list[Tool], executor: Executor | None = None) -> list[PydanticTool]:
     def _get_tool(tool: Tool):
         async def execute(**kwargs: Any) -> Any:
-            return tool.run_json(kwargs)
+            return await run_tool_json_async(tool, kwargs, executor=executor)
 
         async def prepare(ctx: RunContext, tool_def: ToolDefinition) -> ToolDefinition:
             if "parameters" not in tool.schema:
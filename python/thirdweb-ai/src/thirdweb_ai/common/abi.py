@@ -0,0 +1,260 @@
+import functools
+import itertools
+import json
+import threading
+from collections.abc import Callable, Generator, Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Literal, cast
+
+import httpx
+from eth_abi.abi import decode as abi_decode
+from eth_abi.exceptions import DecodingError
+from eth_typing import ABIEvent, ABIFunction
+from eth_utils.abi import (
+    abi_to_signature,
+    event_abi_to_log_topic,
+    function_abi_to_4byte_selector,
+    get_abi_input_types,
+)
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.pagination import Item
+
+# fetches the ABI of a contract given its chain and address
+AbiFetcher = Callable[[int, str], list[dict[str, Any]]]
+
+DecodeKind = Literal["logs", "inputs"]
+
+DEFAULT_BATCH_SIZE = 1_000
+
+# batches with fewer logs than this are decoded in-process even when a process pool is requested
+MIN_PROCESS_BATCH = 1_000
+
+# types whose indexed values are stored as the hash of the value rather than the value
+_HASHED_TYPES = ("string", "bytes", "tuple")
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    if isinstance(value, list | tuple):
+        return [_json_value(v) for v in value]
+    return value
+
+
+def _hex_bytes(value: str) -> bytes:
+    return bytes.fromhex(value.removeprefix("0x"))
+
+
+class _Event:
+    def __init__(self, abi: ABIEvent):
+        self.name: str = abi["name"]
+        self.signature = abi_to_signature(abi)
+        inputs = abi.get("inputs", [])
+        types = get_abi_input_types(abi)
+        self.indexed = [(i.get("name", ""), t) for i, t in zip(inputs, types, strict=True) if i.get("indexed")]
+        self.data = [(i.get("name", ""), t) for i, t in zip(inputs, types, strict=True) if not i.get("indexed")]
+
+    def decode(self, topics: Sequence[str], data: str) -> dict[str, Any]:
+        indexed: dict[str, Any] = {}
+        for (name, type_), topic in zip(self.indexed, topics[1:], strict=False):
+            if type_.startswith(_HASHED_TYPES) or type_.endswith("]"):
+                indexed[name] = topic
+            else:
+                indexed[name] = _json_value(abi_decode([type_], _hex_bytes(topic))[0])
+        values = abi_decode([t for _, t in self.data], _hex_bytes(data)) if self.data else ()
+        return {
+            "name": self.name,
+            "signature": self.signature,
+            "indexed_params": indexed,
+            "non_indexed_params": {name: _json_value(v) for (name, _), v in zip(self.data, values, strict=True)},
+        }
+
+
+class _Function:
+    def __init__(self, abi: ABIFunction):
+        self.name: str = abi["name"]
+        self.signature = abi_to_signature(abi)
+        self.names = [i.get("name", "") for i in abi.get("inputs", [])]
+        self.types = get_abi_input_types(abi)
+
+    def decode(self, input_data: str) -> dict[str, Any]:
+        values = abi_decode(self.types, _hex_bytes(input_data)[4:])
+        return {
+            "name": self.name,
+            "signature": self.signature,
+            "inputs": {name: _json_value(v) for name, v in zip(self.names, values, strict=True)},
+        }
+
+
+class AbiDecoder:
+    """Decodes event logs and transaction input of one contract locally, from its ABI.
+
+    Decoded values have the shape of the ``decoded`` field of Insight responses.
+    """
+
+    def __init__(self, abi: Sequence[dict[str, Any]]):
+        self.events: dict[str, _Event] = {}
+        self.functions: dict[str, _Function] = {}
+        for entry in abi:
+            if entry.get("type") == "event" and not entry.get("anonymous"):
+                event = cast("ABIEvent", entry)
+                self.events["0x" + event_abi_to_log_topic(event).hex()] = _Event(event)
+            elif entry.get("type") == "function":
+                function = cast("ABIFunction", entry)
+                self.functions["0x" + function_abi_to_4byte_selector(function).hex()] = _Function(function)
+
+    def decode_log(self, log: Item) -> dict[str, Any] | None:
+        """Decode a log with ``topics`` and ``data``, returning None if it is not an event of the ABI."""
+        topics: list[str] = log.get("topics") or []
+        event = self.events.get(topics[0].lower()) if topics else None
+        if event is None:
+            return None
+        try:
+            return event.decode(topics, log.get("data") or "0x")
+        except (DecodingError, ValueError):
+            return None
+
+    def decode_input(self, input_data: str) -> dict[str, Any] | None:
+        """Decode transaction input, returning None if it does not call a function of the ABI."""
+        function = self.functions.get(input_data[:10].lower())
+        if function is None:
+            return None
+        try:
+            return function.decode(input_data)
+        except (DecodingError, ValueError):
+            return None
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_decoder(abi_json: str) -> AbiDecoder:
+    return AbiDecoder(json.loads(abi_json))
+
+
+def _decode_chunk(abi_json: str, kind: DecodeKind, items: list[Item]) -> list[dict[str, Any] | None]:
+    # runs in worker processes too, where the decoder is built once per ABI and process
+    decoder = _cached_decoder(abi_json)
+    if kind == "logs":
+        return [decoder.decode_log(item) for item in items]
+    return [decoder.decode_input(item.get("data") or item.get("input") or "0x") for item in items]
+
+
+def _contract_key(item: Item, kind: DecodeKind) -> tuple[int, str]:
+    address = item.get("address") if kind == "logs" else item.get("to_address")
+    return int(item.get("chain_id") or 0), str(address or "").lower()
+
+
+class AbiRegistry:
+    """Fetches contract ABIs once and decodes logs and transaction input with them locally.
+
+    ABIs are kept for the lifetime of the registry; the fetcher is typically ``Insight.get_abi``, whose responses are
+    also kept in the service caches.
+
+    Args:
+        fetch_abi: Returns the ABI of a contract
+        processes: Number of worker processes used to decode large batches, or None to decode in-process
+    """
+
+    def __init__(self, fetch_abi: AbiFetcher, processes: int | None = None):
+        self.fetch_abi = fetch_abi
+        self.processes = processes
+        self._abis: dict[tuple[int, str], str | None] = {}
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _abi_json(self, chain_id: int, address: str) -> str | None:
+        key = (chain_id, address.lower())
+        with self._lock:
+            if key in self._abis:
+                return self._abis[key]
+        try:
+            abi = self.fetch_abi(chain_id, address)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                return self._fetch_failed(chain_id)
+            # unverified contracts have no ABI, their logs are left undecoded
+            abi = None
+        except Exception:
+            return self._fetch_failed(chain_id)
+        abi_json = json.dumps(abi, sort_keys=True) if abi else None
+        metrics.increment("abi.fetches", chain=chain_id)
+        with self._lock:
+            self._abis[key] = abi_json
+        return abi_json
+
+    @staticmethod
+    def _fetch_failed(chain_id: int) -> None:
+        # not remembered, the next batch with logs of the contract tries again
+        metrics.increment("abi.fetch_errors", chain=chain_id)
+
+    def decoder(self, chain_id: int, address: str) -> AbiDecoder | None:
+        """Return the decoder of a contract, or None if its ABI is not available."""
+        abi_json = self._abi_json(chain_id, address)
+        return _cached_decoder(abi_json) if abi_json else None
+
+    def decode_logs(self, logs: Iterable[Item]) -> list[dict[str, Any] | None]:
+        """Decode a batch of logs, each with ``chain_id``, ``address``, ``topics`` and ``data``.
+
+        Returns:
+            The decoded events in the order of the logs, None for logs that could not be decoded
+        """
+        return self._decode(list(logs), "logs")
+
+    def decode_inputs(self, transactions: Iterable[Item]) -> list[dict[str, Any] | None]:
+        """Decode the input of a batch of transactions, each with ``chain_id``, ``to_address`` and ``data``.
+
+        Returns:
+            The decoded function calls in the order of the transactions, None for input that could not be decoded
+        """
+        return self._decode(list(transactions), "inputs")
+
+    def decode_stream(
+        self, items: Iterable[Item], kind: DecodeKind = "logs", batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Generator[Item, None, None]:
+        """Decode a stream of logs or transactions in batches, setting ``decoded`` on every item it can decode.
+
+        Items are returned in order, as soon as their batch is decoded, so arbitrarily long streams like
+        backfills are decoded without holding them in memory.
+        """
+        iterator = iter(items)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            for item, decoded in zip(batch, self._decode(batch, kind), strict=True):
+                if decoded is not None:
+                    item["decoded"] = decoded
+                yield item
+
+    def _decode(self, items: list[Item], kind: DecodeKind) -> list[dict[str, Any] | None]:
+        groups: dict[tuple[int, str], list[int]] = {}
+        for i, item in enumerate(items):
+            groups.setdefault(_contract_key(item, kind), []).append(i)
+
+        results: list[dict[str, Any] | None] = [None] * len(items)
+        use_pool = self.processes is not None and len(items) >= MIN_PROCESS_BATCH
+        pending: list[tuple[list[int], Future[list[dict[str, Any] | None]]]] = []
+        for (chain_id, address), indexes in groups.items():
+            abi_json = self._abi_json(chain_id, address) if address else None
+            if abi_json is None:
+                continue
+            chunk = [items[i] for i in indexes]
+            if use_pool:
+                pending.append((indexes, self._process_pool().submit(_decode_chunk, abi_json, kind, chunk)))
+            else:
+                for i, decoded in zip(indexes, _decode_chunk(abi_json, kind, chunk), strict=True):
+                    results[i] = decoded
+        for indexes, future in pending:
+            for i, decoded in zip(indexes, future.result(), strict=True):
+                results[i] = decoded
+        metrics.increment(f"abi.decoded_{kind}", sum(result is not None for result in results))
+        return results
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._pool
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
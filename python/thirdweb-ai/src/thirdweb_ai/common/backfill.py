@@ -0,0 +1,192 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.pagination import DEFAULT_PAGE_SIZE, Item, paginate
+
+DEFAULT_SHARD_SIZE = 10_000
+
+
+class Shard(NamedTuple):
+    """An inclusive block range fetched as one unit of work."""
+
+    number: int
+    from_block: int
+    to_block: int
+
+
+def shard_range(from_block: int, to_block: int, shard_size: int = DEFAULT_SHARD_SIZE) -> list[Shard]:
+    """Split the inclusive block range into consecutive shards of at most ``shard_size`` blocks."""
+    if shard_size <= 0:
+        raise ValueError("shard_size must be positive")
+    if to_block < from_block:
+        raise ValueError("to_block must not be lower than from_block")
+    starts = range(from_block, to_block + 1, shard_size)
+    return [Shard(i, start, min(start + shard_size - 1, to_block)) for i, start in enumerate(starts)]
+
+
+class BackfillCheckpoint:
+    """Remembers which shards of a backfill have been written out, in a SQLite database file.
+
+    Args:
+        path: Path of the database file. Parent directories are created if needed.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shards ("
+            "job TEXT NOT NULL, shard INTEGER NOT NULL, from_block INTEGER NOT NULL, to_block INTEGER NOT NULL, "
+            "completed_at REAL NOT NULL, PRIMARY KEY (job, shard))"
+        )
+
+    def completed(self, job: str) -> set[int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT shard FROM shards WHERE job = ?", (job,)).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_completed(self, job: str, shard: Shard) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO shards (job, shard, from_block, to_block, completed_at) VALUES (?, ?, ?, ?, ?)",
+                (job, shard.number, shard.from_block, shard.to_block, time.time()),
+            )
+
+    def reset(self, job: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM shards WHERE job = ?", (job,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def make_job_id(*parts: Any) -> str:
+    """Derive a stable backfill job ID from the query it runs."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class ShardFetcher:
+    """Fetches all items of a shard from a paginated endpoint with a block range filter.
+
+    Only holds plain values so that it can be sent to worker processes, where it creates its own service.
+    """
+
+    base_url: str
+    secret_key: str
+    path: str
+    params: dict[str, Any]
+    limit: int = DEFAULT_PAGE_SIZE
+
+    def __call__(self, shard: Shard) -> list[Item]:
+        from thirdweb_ai.services.service import Service
+
+        service = Service(base_url=self.base_url, secret_key=self.secret_key)
+        params = {
+            **self.params,
+            "filter_block_number_gte": shard.from_block,
+            "filter_block_number_lte": shard.to_block,
+        }
+
+        def fetch_page(page: int, limit: int) -> list[Item]:
+            return service._get(self.path, {**params, "page": page, "limit": limit})["data"]  # noqa: SLF001  # pyright: ignore[reportPrivateUsage]
+
+        return list(paginate(fetch_page, limit=self.limit, prefetch=False))
+
+
+class Backfill:
+    """Fetches a large block range as shards on a pool of workers and returns the items in block order.
+
+    Shards are fetched concurrently, at most ``max_pending`` at a time, and their items are returned strictly in
+    shard order. A shard is recorded in ``checkpoint`` once all of its items have been consumed, so an interrupted
+    backfill started again with the same job ID continues with the first shard that was not consumed. Items of a
+    shard that was only partially consumed are returned again.
+
+    Args:
+        fetch_shard: Returns all items of a shard, ordered by block. Must be picklable when ``processes`` is set.
+        from_block: First block of the range (inclusive)
+        to_block: Last block of the range (inclusive)
+        job_id: Identifies the backfill in the checkpoint
+        shard_size: Number of blocks per shard
+        workers: Number of shards fetched concurrently
+        processes: Fetch shards in worker processes instead of threads
+        checkpoint: Where completed shards are recorded. Without one a backfill cannot be resumed.
+        max_pending: Maximum number of shards fetched ahead of the one being consumed. Defaults to twice the
+            number of workers.
+
+    Example:
+        >>> backfill = insight.backfill_events(
+        ...     contract_address="0x...",
+        ...     from_block=18_000_000,
+        ...     to_block=19_000_000,
+        ...     workers=16,
+        ...     checkpoint=BackfillCheckpoint("~/.thirdweb/backfill.db"),
+        ... )
+        >>> for event in backfill:
+        ...     write(event)
+    """
+
+    def __init__(
+        self,
+        fetch_shard: Callable[[Shard], list[Item]],
+        from_block: int,
+        to_block: int,
+        job_id: str,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        workers: int = 8,
+        processes: bool = False,
+        checkpoint: BackfillCheckpoint | None = None,
+        max_pending: int | None = None,
+    ):
+        self.fetch_shard = fetch_shard
+        self.shards = shard_range(from_block, to_block, shard_size)
+        self.job_id = job_id
+        self.workers = workers
+        self.processes = processes
+        self.checkpoint = checkpoint
+        self.max_pending = max_pending or 2 * workers
+
+    def remaining(self) -> list[Shard]:
+        """Return the shards that have not been completed yet."""
+        completed = self.checkpoint.completed(self.job_id) if self.checkpoint else set()
+        return [shard for shard in self.shards if shard.number not in completed]
+
+    def _make_executor(self) -> Executor:
+        if self.processes:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thirdweb-backfill")
+
+    def __iter__(self) -> Iterator[Item]:
+        queue = deque(self.remaining())
+        executor = self._make_executor()
+        in_flight: deque[tuple[Shard, Future[list[Item]], float]] = deque()
+        try:
+            while queue or in_flight:
+                while queue and len(in_flight) < self.max_pending:
+                    shard = queue.popleft()
+                    in_flight.append((shard, executor.submit(self.fetch_shard, shard), time.monotonic()))
+                # shards are submitted in order, the oldest one in flight is the next one to return
+                shard, future, submitted = in_flight.popleft()
+                items = future.result()
+                metrics.observe("backfill.shard_seconds", time.monotonic() - submitted)
+                metrics.increment("backfill.items", len(items))
+                yield from items
+                if self.checkpoint:
+                    self.checkpoint.mark_completed(self.job_id, shard)
+                metrics.increment("backfill.shards")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,199 @@
+import json
+import threading
+import time
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Generic, TypeVar
+
+from thirdweb_ai.common.metrics import metrics
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+R = TypeVar("R")
+
+# contract calls per read request, Engine executes each request as one multicall
+DEFAULT_READ_BATCH_SIZE = 100
+
+# sends the items of one batch and returns one result per item, in order
+BatchSender = Callable[[K, list[T]], list[R]]
+# applies a function to every batch, e.g. concurrently, and returns the results in order
+BatchMapper = Callable[[Callable[[list[T]], list[R]], list[list[T]]], list[list[R]]]
+
+
+def map_batched(
+    send_batch: Callable[[list[T]], list[R]],
+    items: Sequence[T],
+    key: Callable[[T], Hashable],
+    batch_size: int,
+    map_batches: BatchMapper[T, R] | None = None,
+) -> list[R]:
+    """Send the distinct items in batches and return the result of every item, in order.
+
+    Items with the same ``key`` are sent once and share their result.
+
+    Args:
+        send_batch: Sends the items of one batch and returns their results in order
+        key: Identifies items with the same result
+        batch_size: Largest number of items sent together
+        map_batches: Sends the batches, one after the other unless given
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    positions: dict[Hashable, int] = {}
+    distinct: list[T] = []
+    indexes: list[int] = []
+    for item in items:
+        index = positions.setdefault(key(item), len(distinct))
+        if index == len(distinct):
+            distinct.append(item)
+        indexes.append(index)
+    batches = [distinct[i : i + batch_size] for i in range(0, len(distinct), batch_size)]
+    results = map_batches(send_batch, batches) if map_batches else [send_batch(batch) for batch in batches]
+    flat: list[R] = []
+    for batch, batch_results in zip(batches, results, strict=True):
+        if len(batch_results) != len(batch):
+            raise ValueError(f"Expected {len(batch)} results for the batch, got {len(batch_results)}")
+        flat.extend(batch_results)
+    metrics.increment("batcher.deduplicated", len(indexes) - len(distinct))
+    return [flat[index] for index in indexes]
+
+
+def contract_call_key(call: dict[str, Any]) -> str:
+    """Identify a contract read call by its payload for :func:`map_batched`, addresses are compared case-insensitively."""
+    contract_address = str(call.get("contractAddress") or "").lower()
+    return json.dumps([contract_address, {**call, "contractAddress": None}], sort_keys=True, default=str)
+
+
+class _Batch(Generic[T, R]):
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.items: list[T] = []
+        self.futures: list[Future[R]] = []
+
+
+class Batcher(Generic[K, T, R]):
+    """Coalesces items submitted concurrently under the same key into batches.
+
+    A batch is sent once it holds ``max_batch_size`` items, by the thread that filled it before ``submit`` returns,
+    or ``max_delay`` seconds after its first item, on ``executor`` so that a slow key does not hold up the batches
+    of the others. Every caller gets a future of the result for its own item; if a batch fails, all of its futures
+    fail with the same exception.
+
+    Args:
+        send_batch: Sends the items of one key and returns their results in order
+        max_batch_size: Largest number of items sent together
+        max_delay: Longest time in seconds an item waits for others to join its batch
+        name: Prefix of the metrics recorded for the batches
+        executor: Where batches are sent after their delay. Defaults to a pool of ``max_senders`` threads owned by
+            the batcher. Don't pass the tool executor if tools wait for the results.
+        max_senders: Threads of the default executor
+
+    Example:
+        >>> batcher = Batcher(lambda chain, payloads: send(chain, payloads), max_batch_size=100, max_delay=0.05)
+        >>> queue_id = batcher.submit(137, payload).result()
+    """
+
+    def __init__(
+        self,
+        send_batch: BatchSender[K, T, R],
+        max_batch_size: int = 50,
+        max_delay: float = 0.05,
+        name: str = "batcher",
+        executor: Executor | None = None,
+        max_senders: int = 8,
+    ):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self.send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.name = name
+        self.executor = executor
+        self.max_senders = max_senders
+        self._own_executor: ThreadPoolExecutor | None = None
+        self._batches: dict[K, _Batch[T, R]] = {}
+        self._cond = threading.Condition()
+        self._flusher: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, key: K, item: T) -> Future[R]:
+        """Add an item to the open batch of ``key`` and return the future of its result."""
+        future: Future[R] = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Batcher is closed")
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch(time.monotonic() + self.max_delay)
+                self._start_flusher()
+                self._cond.notify()
+            batch.items.append(item)
+            batch.futures.append(future)
+            full = len(batch.items) >= self.max_batch_size
+            if full:
+                del self._batches[key]
+        if full:
+            self._send(key, batch)
+        return future
+
+    def flush(self) -> None:
+        """Send all open batches now."""
+        with self._cond:
+            batches, self._batches = self._batches, {}
+        for key, batch in batches.items():
+            self._send(key, batch)
+
+    def close(self) -> None:
+        """Send the open batches and stop the background thread, later submits raise RuntimeError."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            # the flusher may still be handing batches to the executor
+            self._flusher.join()
+        if self._own_executor is not None:
+            self._own_executor.shutdown(wait=True)
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+            self._flusher.start()
+
+    def _get_executor(self) -> Executor:
+        if self.executor is not None:
+            return self.executor
+        # only used by the flusher thread
+        if self._own_executor is None:
+            self._own_executor = ThreadPoolExecutor(self.max_senders, thread_name_prefix=f"{self.name}-sender")
+        return self._own_executor
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                due = [key for key, batch in self._batches.items() if batch.deadline <= now]
+                if not due:
+                    deadlines = [batch.deadline for batch in self._batches.values()]
+                    self._cond.wait(min(deadlines) - now if deadlines else None)
+                    continue
+                batches = [(key, self._batches.pop(key)) for key in due]
+            executor = self._get_executor()
+            for key, batch in batches:
+                executor.submit(self._send, key, batch)
+
+    def _send(self, key: K, batch: _Batch[T, R]) -> None:
+        metrics.increment(f"{self.name}.batches")
+        metrics.observe(f"{self.name}.batch_size", len(batch.items))
+        try:
+            results = self.send_batch(key, batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(f"Expected {len(batch.items)} results for the batch, got {len(results)}")
+        except Exception as e:
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results, strict=True):
+            future.set_result(result)
@@ -0,0 +1,176 @@
+import bisect
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any, Literal, NamedTuple
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.pagination import Item
+
+# fetches blocks of a chain from the blocks endpoint given the chain and the query parameters
+BlockFetcher = Callable[[int, dict[str, Any]], list[Item]]
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)\s*(s|m|h|d|w)(?:\s+ago)?$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+# Unix timestamps above this are in milliseconds
+_MAX_SECONDS = 10**11
+
+
+def parse_time(value: str | float | datetime, now: float | None = None) -> int:
+    """Parse a point in time into a Unix timestamp in seconds.
+
+    Accepts Unix timestamps in seconds or milliseconds, datetimes, ISO 8601 strings (UTC unless they have an
+    offset), ``"now"`` and durations before now such as ``"24h"``, ``"7d"`` or ``"30m ago"``.
+    """
+    if isinstance(value, datetime):
+        return int(value.timestamp() if value.tzinfo else value.replace(tzinfo=timezone.utc).timestamp())
+    if isinstance(value, int | float):
+        return int(value / 1000 if value > _MAX_SECONDS else value)
+    text = value.strip().lower()
+    now = time.time() if now is None else now
+    if text == "now":
+        return int(now)
+    if text.isdigit():
+        return parse_time(int(text))
+    if match := _DURATION.match(text):
+        return int(now - float(match.group(1)) * _UNITS[match.group(2)])
+    try:
+        return parse_time(datetime.fromisoformat(value.strip().replace("Z", "+00:00")))
+    except ValueError:
+        raise ValueError(
+            f"Invalid time: {value}. Use an ISO 8601 date, a Unix timestamp or a duration like '24h'."
+        ) from None
+
+
+class BlockSample(NamedTuple):
+    number: int
+    timestamp: int
+
+
+class BlockIndex:
+    """A per-chain index of block numbers and their timestamps, to translate time windows into block ranges.
+
+    The index holds the blocks it has seen, sorted by number, and extends itself with every block it fetches.
+    A timestamp is answered locally, by binary search, when the index holds the two adjacent blocks around it.
+    Otherwise one request to the blocks endpoint, narrowed to the blocks between the nearest known ones, finds
+    the boundary, and its answer is remembered.
+
+    Args:
+        fetch_blocks: Returns the blocks of a chain matching the query parameters
+        max_boundaries: Number of looked up boundaries remembered
+
+    Example:
+        >>> first, last = insight.block_index.block_range(1, since=parse_time("24h"), until=parse_time("now"))
+    """
+
+    def __init__(self, fetch_blocks: BlockFetcher, max_boundaries: int = 4096):
+        self.fetch_blocks = fetch_blocks
+        self.max_boundaries = max_boundaries
+        self._samples: dict[int, list[BlockSample]] = {}
+        self._boundaries: OrderedDict[tuple[int, str, int], int | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, chain_id: int, blocks: Iterable[Item]) -> None:
+        """Add blocks, or any items with ``block_number`` and ``block_timestamp`` like events, to the index."""
+        new = [
+            BlockSample(int(block["block_number"]), int(block["block_timestamp"]))
+            for block in blocks
+            if block.get("block_number") is not None and block.get("block_timestamp") is not None
+        ]
+        with self._lock:
+            samples = self._samples.setdefault(chain_id, [])
+            for sample in new:
+                i = bisect.bisect_left(samples, sample.number, key=lambda s: s.number)
+                if i == len(samples) or samples[i].number != sample.number:
+                    samples.insert(i, sample)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(samples) for samples in self._samples.values())
+
+    def _remember(self, key: tuple[int, str, int], block: int | None) -> None:
+        with self._lock:
+            self._boundaries[key] = block
+            while len(self._boundaries) > self.max_boundaries:
+                self._boundaries.popitem(last=False)
+
+    def _local(
+        self, chain_id: int, side: Literal["gte", "lte"], timestamp: int
+    ) -> tuple[bool, int | None, dict[str, Any]]:
+        """Answer from the index if possible, otherwise return the block range the answer must be looked up in."""
+        with self._lock:
+            if (key := (chain_id, side, timestamp)) in self._boundaries:
+                return True, self._boundaries[key], {}
+            samples = self._samples.get(chain_id, [])
+            if side == "gte":
+                i = bisect.bisect_left(samples, timestamp, key=lambda s: s.timestamp)
+            else:
+                i = bisect.bisect_right(samples, timestamp, key=lambda s: s.timestamp)
+            before = samples[i - 1] if i > 0 else None
+            after = samples[i] if i < len(samples) else None
+        if before is not None and after is not None and after.number == before.number + 1:
+            return True, after.number if side == "gte" else before.number, {}
+        bounds: dict[str, Any] = {}
+        if before is not None:
+            bounds["filter_block_number_gt" if side == "gte" else "filter_block_number_gte"] = before.number
+        if after is not None:
+            bounds["filter_block_number_lte" if side == "gte" else "filter_block_number_lt"] = after.number
+        return False, None, bounds
+
+    def _lookup(self, chain_id: int, side: Literal["gte", "lte"], timestamp: int, local: bool) -> int | None:
+        bounds: dict[str, Any] = {}
+        if local:
+            found, block, bounds = self._local(chain_id, side, timestamp)
+            if found:
+                metrics.increment("block_index.hits", chain=chain_id)
+                return block
+        params = {
+            **bounds,
+            f"filter_block_timestamp_{side}": timestamp,
+            "sort_by": "block_number",
+            "sort_order": "asc" if side == "gte" else "desc",
+            "limit": 1,
+        }
+        blocks = self.fetch_blocks(chain_id, params)
+        metrics.increment("block_index.misses", chain=chain_id)
+        self.add(chain_id, blocks)
+        block = int(blocks[0]["block_number"]) if blocks else None
+        # blocks at or after a timestamp may still be mined, and so may later blocks at or before it until a
+        # block after it is known, the other boundaries never change
+        if (block is not None and (side == "gte" or self._known_after(chain_id, timestamp))) or (
+            block is None and side == "lte"
+        ):
+            self._remember((chain_id, side, timestamp), block)
+        return block
+
+    def _known_after(self, chain_id: int, timestamp: int) -> bool:
+        with self._lock:
+            samples = self._samples.get(chain_id, [])
+            return bool(samples) and samples[-1].timestamp > timestamp
+
+    def first_block_at_or_after(self, chain_id: int, timestamp: int, local: bool = True) -> int | None:
+        """Return the first block with a timestamp at or after ``timestamp``, None if there is none yet.
+
+        Args:
+            local: Answer from the index when possible. Without it a request is always sent.
+        """
+        return self._lookup(chain_id, "gte", timestamp, local)
+
+    def last_block_at_or_before(self, chain_id: int, timestamp: int, local: bool = True) -> int | None:
+        """Return the last block with a timestamp at or before ``timestamp``, None if there is none."""
+        return self._lookup(chain_id, "lte", timestamp, local)
+
+    def block_range(
+        self, chain_id: int, since: int | None = None, until: int | None = None, local: bool = True
+    ) -> tuple[int | None, int | None]:
+        """Translate an inclusive time window into the first and the last block in it.
+
+        Returns:
+            The first and the last block, each None if that side of the window is open or no block matches it
+        """
+        first = self.first_block_at_or_after(chain_id, since, local) if since is not None else None
+        last = self.last_block_at_or_before(chain_id, until, local) if until is not None else None
+        return first, last
@@ -0,0 +1,235 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, NamedTuple, Protocol, runtime_checkable
+
+import httpx
+
+
+@runtime_checkable
+class ResponseCache(Protocol):
+    """Storage for raw response bodies, keyed by request keys that include a digest of the credentials."""
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+
+class CacheEntry(NamedTuple):
+    """Where and for how long the response of one request is cached."""
+
+    cache: ResponseCache
+    tier: str
+    key: str
+    endpoint: str
+    ttl: float
+
+
+def make_cache_key(method: str, url: str, params: dict[str, Any] | None = None) -> str:
+    """Build a cache key that does not depend on the order of the query parameters."""
+    query = sorted(httpx.QueryParams(params or {}).multi_items())
+    return f"{method.upper()} {httpx.URL(url, params=query)}"
+
+
+def headers_digest(headers: Mapping[str, Any] | None) -> str:
+    """Digest of request headers, to keep apart the responses of requests made with different credentials."""
+    return hashlib.sha256(repr(sorted((headers or {}).items())).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MemoryCache:
+    """A thread-safe in-memory LRU cache with per-entry expiry.
+
+    Memory is bounded both by the number of entries and by the total size of the cached bodies. The least
+    recently used entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._size -= len(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+            )
+
+
+class SqliteCache:
+    """A persistent cache backed by a SQLite database file.
+
+    Entries survive process restarts and the database can be shared by several worker processes on the same host.
+    The total size of the cached bodies is capped: whenever it grows beyond ``max_bytes`` the expired and then the
+    least recently used entries are removed and the freed pages are returned to the file system.
+
+    Args:
+        path: Path of the database file. Parent directories are created if needed.
+        max_bytes: Maximum total size of the cached bodies
+        compact_interval: Number of writes between two size checks
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = 512 * 1024 * 1024, compact_interval: int = 256):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compact_interval = compact_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        conn = self._connect()
+        # must be set before the first table is created to take effect
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> bytes | None:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[1] <= now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            row = None
+        if row is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        with self._lock:
+            self._hits += 1
+        return bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), now + ttl, now),
+        )
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.compact_interval == 0
+        if due:
+            self.compact(vacuum=False)
+
+    def compact(self, vacuum: bool = True) -> None:
+        """Remove expired entries, evict least recently used entries beyond the size cap and free disk space.
+
+        Args:
+            vacuum: Rebuild the whole database file instead of only releasing free pages. This briefly locks the
+                database for all processes.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            # keep the most recently used entries that fit into max_bytes
+            evicted = conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS total FROM entries) "
+                "WHERE total > ?)",
+                (self.max_bytes,),
+            ).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._evictions += evicted
+        conn.execute("VACUUM" if vacuum else "PRAGMA incremental_vacuum")
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM entries")
+
+    def stats(self) -> CacheStats:
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits, misses=self._misses, evictions=self._evictions, entries=entries, size_bytes=size
+            )
+
+    def close(self) -> None:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+default_cache = MemoryCache()
@@ -0,0 +1,218 @@
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+from thirdweb_ai.common.pagination import Item
+
+ColumnKind = Literal["int", "float", "bool", "str", "json", "null"]
+
+_INT64 = (-(2**63), 2**63 - 1)
+_UINT64 = (0, 2**64 - 1)
+# largest magnitudes of the Arrow decimal types with a scale of 0
+_DECIMAL128_MAX = 10**38 - 1
+_DECIMAL256_MAX = 10**76 - 1
+
+
+def _missing_extra(module: str) -> ImportError:
+    return ImportError(
+        f"{module} is required for columnar results, install it with: pip install 'thirdweb-ai[columns]'"
+    )
+
+
+def _get(item: Item, path: list[str]) -> Any:
+    value: Any = item
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)  # pyright: ignore[reportUnknownMemberType]
+    return value
+
+
+def _is_decimal(value: str) -> bool:
+    return value.isdigit() or (value[:1] == "-" and value[1:].isdigit())
+
+
+def column_kind(values: Iterable[Any]) -> ColumnKind:
+    """Infer the type of a column from its values, ignoring nulls.
+
+    Integers given as decimal strings, like token amounts, are integers: the API sends values beyond the range of
+    JSON numbers as strings. Hex strings stay strings.
+    """
+    kind: ColumnKind = "null"
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            current: ColumnKind = "bool"
+        elif isinstance(value, int) or (isinstance(value, str) and _is_decimal(value)):
+            current = "int"
+        elif isinstance(value, float):
+            current = "float"
+        elif isinstance(value, str):
+            current = "str"
+        else:
+            return "json"
+        if kind == "null" or kind == current:
+            kind = current
+        elif {kind, current} == {"int", "float"}:
+            kind = "float"
+        else:
+            kind = "str"
+    return kind
+
+
+def _ints(values: list[Any]) -> list[int | None]:
+    return [None if value is None else int(value) for value in values]
+
+
+def _texts(values: list[Any], kind: ColumnKind) -> list[str | None]:
+    if kind == "json":
+        return [None if value is None else json.dumps(value, separators=(",", ":")) for value in values]
+    return [None if value is None else str(value) for value in values]
+
+
+class Columns:
+    """Items of an Insight result stored column by column, to analyze large results with NumPy or Arrow.
+
+    Items are appended as they arrive, e.g. straight from a pagination iterator, so only the column values are kept
+    in memory, not the items. Keys of nested values are given as paths like ``"decoded.name"``. Without ``keys`` the
+    columns are the top-level keys of the items, and columns that first appear in later items are padded with nulls.
+
+    Integers keep their exact value: columns of integers beyond 64 bits, like uint256 amounts, become Arrow decimals
+    (or decimal strings beyond 76 digits) and NumPy arrays of Python integers. Lists and objects become JSON text in
+    Arrow and stay Python objects in NumPy.
+
+    Example:
+        >>> columns = Columns.collect(insight.iter_transactions(from_address=wallet, max_items=1_000_000))
+        >>> values = columns.to_numpy()["value"]
+        >>> columns.write_parquet("transactions.parquet")
+    """
+
+    def __init__(self, keys: Sequence[str] | None = None):
+        self._fixed = keys is not None
+        self._paths = {key: key.split(".") for key in keys or []}
+        self._values: dict[str, list[Any]] = {key: [] for key in keys or []}
+        self._rows = 0
+
+    @classmethod
+    def collect(cls, items: Iterable[Item], keys: Sequence[str] | None = None) -> "Columns":
+        """Create columns from all items of an iterable."""
+        columns = cls(keys)
+        columns.extend(items)
+        return columns
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._values)
+
+    def __getitem__(self, key: str) -> list[Any]:
+        return self._values[key]
+
+    def append(self, item: Item) -> None:
+        if not self._fixed:
+            # new columns in the order of the item, so the layout is the same in every run
+            for key in item:
+                if key not in self._values:
+                    self._paths[key] = [key]
+                    self._values[key] = [None] * self._rows
+        for key, values in self._values.items():
+            path = self._paths[key]
+            values.append(item.get(key) if len(path) == 1 else _get(item, path))
+        self._rows += 1
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.append(item)
+
+    def rows(self) -> Iterator[Item]:
+        """Iterate over the rows as dictionaries of the column values."""
+        keys = self.keys
+        for row in zip(*self._values.values(), strict=True):
+            yield dict(zip(keys, row, strict=True))
+
+    def kinds(self) -> dict[str, ColumnKind]:
+        return {key: column_kind(values) for key, values in self._values.items()}
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return the columns as NumPy arrays.
+
+        Integer columns without nulls that fit into 64 bits are ``int64`` or ``uint64`` arrays, other integer columns
+        are object arrays of Python integers so that no value is rounded. Float columns are ``float64`` with NaN for
+        nulls, boolean columns without nulls are ``bool``, everything else is an object array.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise _missing_extra("numpy") from None
+
+        arrays: dict[str, Any] = {}
+        for key, kind in self.kinds().items():
+            values = self._values[key]
+            has_nulls = any(value is None for value in values)
+            if kind == "int":
+                ints = _ints(values)
+                if not has_nulls and ints:
+                    low, high = min(ints), max(ints)  # pyright: ignore[reportArgumentType]
+                    if _INT64[0] <= low and high <= _INT64[1]:
+                        arrays[key] = np.array(ints, dtype=np.int64)
+                        continue
+                    if _UINT64[0] <= low and high <= _UINT64[1]:
+                        arrays[key] = np.array(ints, dtype=np.uint64)
+                        continue
+                arrays[key] = np.array(ints, dtype=object)
+            elif kind == "float":
+                arrays[key] = np.array(
+                    [np.nan if value is None else float(value) for value in values], dtype=np.float64
+                )
+            elif kind == "bool" and not has_nulls:
+                arrays[key] = np.array(values, dtype=bool)
+            else:
+                # filled one by one, numpy would turn lists of equal length into a second dimension
+                array = np.empty(len(values), dtype=object)
+                for i, value in enumerate(values):
+                    array[i] = value
+                arrays[key] = array
+        return arrays
+
+    def to_arrow(self) -> Any:
+        """Return the columns as a ``pyarrow.Table``, see the class docstring for how integers are stored."""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise _missing_extra("pyarrow") from None
+
+        arrays: dict[str, Any] = {}
+        for key, kind in self.kinds().items():
+            values = self._values[key]
+            if kind == "int":
+                ints = _ints(values)
+                largest = max((abs(value) for value in ints if value is not None), default=0)
+                if largest <= _INT64[1]:
+                    arrays[key] = pa.array(ints, type=pa.int64())
+                elif largest <= _DECIMAL128_MAX:
+                    arrays[key] = pa.array(ints, type=pa.decimal128(38, 0))
+                elif largest <= _DECIMAL256_MAX:
+                    arrays[key] = pa.array(ints, type=pa.decimal256(76, 0))
+                else:
+                    arrays[key] = pa.array(_texts(values, kind), type=pa.string())
+            elif kind == "float":
+                arrays[key] = pa.array([None if value is None else float(value) for value in values], type=pa.float64())
+            elif kind == "bool":
+                arrays[key] = pa.array(values, type=pa.bool_())
+            elif kind == "null":
+                arrays[key] = pa.nulls(len(values))
+            else:
+                arrays[key] = pa.array(_texts(values, kind), type=pa.string())
+        return pa.table(arrays)
+
+    def write_parquet(self, path: str | Path, **kwargs: Any) -> None:
+        """Write the columns to a Parquet file, ``kwargs`` are passed to ``pyarrow.parquet.write_table``."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise _missing_extra("pyarrow") from None
+        pq.write_table(self.to_arrow(), str(path), **kwargs)
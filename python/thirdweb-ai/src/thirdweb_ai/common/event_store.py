@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Any, Literal, NamedTuple
+
+from thirdweb_ai.common.pagination import Item
+
+# the topic of a sync that tracks all events of a contract
+ALL_TOPICS = ""
+
+
+class SyncState(NamedTuple):
+    """How far the events of a (chain, contract, topic) have been synced."""
+
+    from_block: int
+    last_block: int
+    synced_at: float
+
+
+def _int(value: Any) -> int:
+    if isinstance(value, str):
+        return int(value, 16) if value.startswith("0x") else int(value)
+    return int(value or 0)
+
+
+class EventStore:
+    """A local, indexed store of contract events kept up to date by incremental syncs.
+
+    Events are stored as returned by the API, keyed by chain, transaction hash and log index, so storing the same
+    event twice is harmless. For every synced (chain, contract, topic) the store remembers the first and the last
+    block synced and when it was last synced.
+
+    Args:
+        path: Path of the database file. Parent directories are created if needed.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "chain_id INTEGER NOT NULL, address TEXT NOT NULL, block_number INTEGER NOT NULL, "
+            "transaction_hash TEXT NOT NULL, log_index INTEGER NOT NULL, topic_0 TEXT, block_timestamp INTEGER, "
+            "body TEXT NOT NULL, PRIMARY KEY (chain_id, transaction_hash, log_index));"
+            "CREATE INDEX IF NOT EXISTS events_address ON events (chain_id, address, block_number);"
+            "CREATE INDEX IF NOT EXISTS events_topic ON events (chain_id, address, topic_0, block_number);"
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "chain_id INTEGER NOT NULL, address TEXT NOT NULL, topic TEXT NOT NULL, from_block INTEGER NOT NULL, "
+            "last_block INTEGER NOT NULL, synced_at REAL NOT NULL, PRIMARY KEY (chain_id, address, topic));"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def sync_state(self, chain_id: int, address: str, topic: str = ALL_TOPICS) -> SyncState | None:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT from_block, last_block, synced_at FROM sync_state WHERE chain_id = ? AND address = ? AND topic = ?",
+                (chain_id, address.lower(), topic.lower()),
+            )
+            .fetchone()
+        )
+        return SyncState(*row) if row else None
+
+    def add_events(self, events: Iterable[Item]) -> int:
+        """Store events, returning how many of them were not stored yet."""
+        rows = [
+            (
+                _int(event.get("chain_id")),
+                str(event.get("address", "")).lower(),
+                _int(event.get("block_number")),
+                str(event.get("transaction_hash", "")).lower(),
+                _int(event.get("log_index")),
+                str(topics[0]).lower() if (topics := event.get("topics")) else None,
+                _int(event.get("block_timestamp")),
+                json.dumps(event),
+            )
+            for event in events
+        ]
+        conn = self._connect()
+        before = conn.total_changes
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return conn.total_changes - before
+
+    def mark_synced(
+        self, chain_id: int, address: str, last_block: int, from_block: int = 0, topic: str = ALL_TOPICS
+    ) -> None:
+        """Record that all events from ``from_block`` up to ``last_block`` have been stored."""
+        state = self.sync_state(chain_id, address, topic)
+        if state is not None:
+            from_block = min(from_block, state.from_block)
+            last_block = max(last_block, state.last_block)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?, ?)",
+            (chain_id, address.lower(), topic.lower(), from_block, last_block, time.time()),
+        )
+
+    def query(
+        self,
+        chain_ids: Sequence[int],
+        address: str,
+        topic_0: str | None = None,
+        transaction_hash: str | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[Item]:
+        """Return stored events of a contract, ordered by block number and log index."""
+        clauses = [f"chain_id IN ({', '.join('?' * len(chain_ids))})", "address = ?"]
+        args: list[Any] = [*chain_ids, address.lower()]
+        for clause, value in (
+            ("topic_0 = ?", topic_0.lower() if topic_0 else None),
+            ("transaction_hash = ?", transaction_hash.lower() if transaction_hash else None),
+            ("block_number >= ?", from_block),
+            ("block_number <= ?", to_block),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        rows = (
+            self._connect()
+            .execute(
+                f"SELECT body FROM events WHERE {' AND '.join(clauses)} "
+                f"ORDER BY block_number {direction}, log_index {direction} LIMIT ? OFFSET ?",
+                (*args, limit, offset),
+            )
+            .fetchall()
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator, Iterator, Sequence
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.pagination import DEFAULT_PAGE_SIZE, Item, apaginate, paginate
+from thirdweb_ai.tools.executor import get_tool_executor
+
+# the API accepts at most this many chains per request
+MAX_CHAINS_PER_REQUEST = 5
+
+# fetches one page for a group of chains given the chains, the page number and its size
+GroupPageFetcher = Callable[[list[int], int, int], list[Item]]
+AsyncGroupPageFetcher = Callable[[list[int], int, int], Awaitable[list[Item]]]
+
+
+def chain_groups(chain_ids: Sequence[int], size: int = MAX_CHAINS_PER_REQUEST) -> list[list[int]]:
+    """Split chain IDs into groups the API accepts in a single request, dropping duplicates."""
+    unique = list(dict.fromkeys(chain_ids))
+    return [unique[i : i + size] for i in range(0, len(unique), size)]
+
+
+def sort_value(item: Item, field: str) -> Any:
+    value = item.get(field)
+    # large numbers may be returned as decimal strings, compare them as numbers
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+def _observe_latency(chains: list[int], started: float) -> None:
+    elapsed = time.monotonic() - started
+    for chain in chains:
+        metrics.observe("fanout.chain_latency_seconds", elapsed, chain=chain)
+
+
+def _timed(fetch_page: GroupPageFetcher, chains: list[int], page: int, limit: int) -> list[Item]:
+    started = time.monotonic()
+    try:
+        return fetch_page(chains, page, limit)
+    finally:
+        _observe_latency(chains, started)
+
+
+async def _atimed(fetch_page: AsyncGroupPageFetcher, chains: list[int], page: int, limit: int) -> list[Item]:
+    started = time.monotonic()
+    try:
+        return await fetch_page(chains, page, limit)
+    finally:
+        _observe_latency(chains, started)
+
+
+def _limit(items: Iterator[Item], max_items: int | None, stop_when: Callable[[Item], bool] | None) -> Iterator[Item]:
+    for count, item in enumerate(items):
+        if (max_items is not None and count >= max_items) or (stop_when is not None and stop_when(item)):
+            return
+        yield item
+
+
+def fan_out(
+    fetch_page: GroupPageFetcher,
+    chain_ids: Sequence[int],
+    sort_by: str | None = None,
+    descending: bool = True,
+    limit: int = DEFAULT_PAGE_SIZE,
+    max_items: int | None = None,
+    stop_when: Callable[[Item], bool] | None = None,
+    executor: Executor | None = None,
+) -> Generator[Item, None, None]:
+    """Iterate over a paginated endpoint for any number of chains as one stream.
+
+    The chains are split into groups of at most :data:`MAX_CHAINS_PER_REQUEST`. The first page of every group is
+    requested at once on ``executor`` and following pages are prefetched per group. When ``sort_by`` is set the
+    groups, each sorted by the API, are k-way merged into a single sorted stream; otherwise the groups are
+    returned one after the other. The latency of every request is recorded for each chain it covers as the
+    ``fanout.chain_latency_seconds`` summary.
+
+    Args:
+        fetch_page: Returns the items of a page for a group of chains
+        chain_ids: The chains to query
+        sort_by: The field the API sorts items by
+        descending: Whether the API sorts in descending order
+        limit: Number of items per request
+        max_items: Stop after this many items
+        stop_when: Stop before the first item of the merged stream this returns True for
+        executor: Where requests are sent. Defaults to the process-wide tool executor. Requests it has not started
+            when their items are needed are sent from the calling thread, which may be one of its own.
+    """
+    executor = executor or get_tool_executor()
+    page_size = min(limit, max_items) if max_items else limit
+    groups = chain_groups(chain_ids)
+    # paginate fetches first pages inline that are still queued, so a busy executor can't deadlock the caller
+    first_pages = [executor.submit(_timed, fetch_page, group, 0, page_size) for group in groups]
+    iterators = [
+        paginate(
+            partial(_timed, fetch_page, group),
+            limit=limit,
+            max_items=max_items,
+            executor=executor,
+            first_page=first_page,
+        )
+        for group, first_page in zip(groups, first_pages, strict=True)
+    ]
+    if sort_by is None:
+        merged = itertools.chain.from_iterable(iterators)
+    else:
+        merged = heapq.merge(*iterators, key=lambda item: sort_value(item, sort_by), reverse=descending)
+    try:
+        yield from _limit(merged, max_items, stop_when)
+    finally:
+        for iterator in iterators:
+            iterator.close()
+        for first_page in first_pages:
+            first_page.cancel()
+
+
+class _HeapEntry:
+    __slots__ = ("descending", "index", "item", "key")
+
+    def __init__(self, key: Any, index: int, item: Item, descending: bool):
+        self.key = key
+        self.index = index
+        self.item = item
+        self.descending = descending
+
+    def __lt__(self, other: "_HeapEntry") -> bool:
+        if self.key != other.key:
+            return self.key > other.key if self.descending else self.key < other.key
+        # keep the order of the groups for equal keys, like heapq.merge
+        return self.index < other.index
+
+
+async def _amerge(
+    iterators: list[AsyncGenerator[Item, None]], sort_by: str | None, descending: bool
+) -> AsyncGenerator[Item, None]:
+    if sort_by is None:
+        for iterator in iterators:
+            async for item in iterator:
+                yield item
+        return
+
+    async def _next(index: int) -> _HeapEntry | None:
+        try:
+            item = await anext(iterators[index])
+        except StopAsyncIteration:
+            return None
+        return _HeapEntry(sort_value(item, sort_by), index, item, descending)
+
+    heap = [entry for entry in await asyncio.gather(*(_next(i) for i in range(len(iterators)))) if entry]
+    heapq.heapify(heap)
+    while heap:
+        entry = heap[0]
+        yield entry.item
+        following = await _next(entry.index)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, following)
+
+
+async def afan_out(
+    fetch_page: AsyncGroupPageFetcher,
+    chain_ids: Sequence[int],
+    sort_by: str | None = None,
+    descending: bool = True,
+    limit: int = DEFAULT_PAGE_SIZE,
+    max_items: int | None = None,
+    stop_when: Callable[[Item], bool] | None = None,
+) -> AsyncGenerator[Item, None]:
+    """Asynchronously iterate over a paginated endpoint for any number of chains, see :func:`fan_out`."""
+    page_size = min(limit, max_items) if max_items else limit
+    groups = chain_groups(chain_ids)
+    first_pages = [asyncio.ensure_future(_atimed(fetch_page, group, 0, page_size)) for group in groups]
+    for first_page in first_pages:
+        # mark the outcome as retrieved, the stream may stop before every group is read
+        first_page.add_done_callback(lambda f: f.cancelled() or f.exception())
+    iterators = [
+        apaginate(partial(_atimed, fetch_page, group), limit=limit, max_items=max_items, first_page=first_page)
+        for group, first_page in zip(groups, first_pages, strict=True)
+    ]
+    merged = _amerge(iterators, sort_by, descending)
+    count = 0
+    try:
+        async for item in merged:
+            if (max_items is not None and count >= max_items) or (stop_when is not None and stop_when(item)):
+                return
+            yield item
+            count += 1
+    finally:
+        await merged.aclose()
+        for iterator in iterators:
+            await iterator.aclose()
+        for first_page in first_pages:
+            first_page.cancel()
@@ -0,0 +1,261 @@
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+import httpx
+
+
+@dataclass(frozen=True)
+class HttpConfig:
+    """Settings for the HTTP clients shared by all services.
+
+    Attributes:
+        timeout: Request timeout in seconds
+        retries: Number of retries on connection failures
+        max_connections: Maximum number of open connections per pool
+        max_keepalive_connections: Maximum number of idle connections kept alive per pool
+        keepalive_expiry: Seconds an idle connection is kept alive before it is closed
+        http2: Multiplex requests over HTTP/2 connections. Requires the ``http2`` extra.
+        host_limits: Maximum number of connections for specific hosts (e.g. ``{"insight.thirdweb.com": 50}``).
+            Each listed host gets a dedicated pool so a busy host cannot exhaust connections for the others.
+    """
+
+    timeout: float = 120.0
+    retries: int = 5
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    host_limits: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """A snapshot of the utilization of one connection pool."""
+
+    client: Literal["sync", "async"]
+    host: str
+    max_connections: int
+    connections: int
+    idle_connections: int
+    in_flight: int
+    peak_in_flight: int
+    requests: int
+
+    @property
+    def utilization(self) -> float:
+        """Share of the pool's connection limit that is currently busy."""
+        return (self.connections - self.idle_connections) / self.max_connections
+
+
+class _PoolCounters:
+    def __init__(self, host: str, max_connections: int):
+        self.host = host
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def snapshot(self, client: Literal["sync", "async"], connections: list[Any]) -> PoolStats:
+        return PoolStats(
+            client=client,
+            host=self.host,
+            max_connections=self.max_connections,
+            connections=len(connections),
+            idle_connections=sum(1 for connection in connections if connection.is_idle()),
+            in_flight=self.in_flight,
+            peak_in_flight=self.peak_in_flight,
+            requests=self.requests,
+        )
+
+
+class _TrackedTransport(httpx.HTTPTransport):
+    def __init__(self, host: str, limits: httpx.Limits, **kwargs: Any):
+        super().__init__(limits=limits, **kwargs)
+        self.counters = _PoolCounters(host, limits.max_connections or 0)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.counters.start()
+        try:
+            return super().handle_request(request)
+        finally:
+            self.counters.finish()
+
+    def stats(self) -> PoolStats:
+        return self.counters.snapshot("sync", list(self._pool.connections))
+
+
+class _TrackedAsyncTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, host: str, limits: httpx.Limits, **kwargs: Any):
+        super().__init__(limits=limits, **kwargs)
+        self.counters = _PoolCounters(host, limits.max_connections or 0)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.counters.start()
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            self.counters.finish()
+
+    def stats(self) -> PoolStats:
+        return self.counters.snapshot("async", list(self._pool.connections))
+
+
+class HttpClientFactory:
+    """Creates and hands out the HTTP clients shared by all services.
+
+    A single synchronous client is shared by the whole process. Async clients are bound to the event loop they
+    are used on, so one is created per running loop.
+    """
+
+    def __init__(self, config: HttpConfig | None = None):
+        self.config = config or HttpConfig()
+        self._lock = threading.Lock()
+        self._client: httpx.Client | None = None
+        self._sync_transports: list[_TrackedTransport] = []
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_transports: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, list[_TrackedAsyncTransport]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _limits(self, max_connections: int | None = None) -> httpx.Limits:
+        max_connections = max_connections or self.config.max_connections
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(self.config.max_keepalive_connections, max_connections),
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+
+    def _pool_limits(self) -> list[tuple[str, httpx.Limits]]:
+        pools = [("*", self._limits())]
+        pools.extend((host, self._limits(limit)) for host, limit in self.config.host_limits.items())
+        return pools
+
+    def get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                transports = [
+                    _TrackedTransport(host, limits, http2=self.config.http2, retries=self.config.retries)
+                    for host, limits in self._pool_limits()
+                ]
+                self._sync_transports = transports
+                self._client = httpx.Client(
+                    timeout=self.config.timeout,
+                    transport=transports[0],
+                    mounts={f"all://{t.counters.host}": t for t in transports[1:]},
+                )
+            return self._client
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                transports = [
+                    _TrackedAsyncTransport(host, limits, http2=self.config.http2, retries=self.config.retries)
+                    for host, limits in self._pool_limits()
+                ]
+                self._async_transports[loop] = transports
+                client = httpx.AsyncClient(
+                    timeout=self.config.timeout,
+                    transport=transports[0],
+                    mounts={f"all://{t.counters.host}": t for t in transports[1:]},
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def stats(self) -> list[PoolStats]:
+        with self._lock:
+            transports: list[_TrackedTransport | _TrackedAsyncTransport] = list(self._sync_transports)
+            for loop_transports in self._async_transports.values():
+                transports.extend(loop_transports)
+        return [transport.stats() for transport in transports]
+
+    def close(self) -> None:
+        """Close the shared synchronous client and the async clients of all event loops.
+
+        Async clients are closed on their own loop: right away if it is not running, otherwise soon after on the
+        loop. Clients of closed loops can't be closed anymore. Use :meth:`aclose` to wait for the client of the
+        running loop to be closed.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+            self._sync_transports = []
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+            self._async_transports.clear()
+        if client is not None:
+            client.close()
+        for loop, async_client in async_clients:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(async_client.aclose(), loop)
+            elif not loop.is_closed() and not _loop_running_in_this_thread():
+                loop.run_until_complete(async_client.aclose())
+
+    async def aclose(self) -> None:
+        """Close the async client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+            self._async_transports.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+def _loop_running_in_this_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+_factory = HttpClientFactory()
+
+
+def configure_http(config: HttpConfig | None = None, **kwargs: Any) -> HttpClientFactory:
+    """Replace the process-wide HTTP client factory.
+
+    Services created afterwards share clients built from the new settings. Already created clients are closed.
+
+    Example:
+        >>> configure_http(max_connections=200, http2=True, host_limits={"insight.thirdweb.com": 100})
+    """
+    global _factory
+    previous, _factory = _factory, HttpClientFactory(config or HttpConfig(**kwargs))
+    previous.close()
+    return _factory
+
+
+def get_http_factory() -> HttpClientFactory:
+    return _factory
+
+
+def get_http_client() -> httpx.Client:
+    """Return the synchronous HTTP client shared by all services."""
+    return _factory.get_client()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Return the async HTTP client shared by all services on the running event loop."""
+    return _factory.get_async_client()
+
+
+def get_pool_stats() -> list[PoolStats]:
+    """Return utilization stats for every connection pool of the shared HTTP clients."""
+    return _factory.stats()
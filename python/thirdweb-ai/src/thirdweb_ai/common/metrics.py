@@ -0,0 +1,102 @@
+import threading
+from dataclasses import dataclass
+
+LabelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class Summary:
+    """Running count, sum and extremes of observed values."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def observe(self, value: float) -> None:
+        self.min = value if self.count == 0 else min(self.min, value)
+        self.max = value if self.count == 0 else max(self.max, value)
+        self.count += 1
+        self.total += value
+
+
+class Metrics:
+    """A minimal, thread-safe registry of labelled counters and summaries.
+
+    Counters and summaries are created on first use. Labels are free-form keyword arguments, e.g.
+    ``metrics.increment("http.retries", host="insight.thirdweb.com", status=429)``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[LabelKey, int] = {}
+        self._summaries: dict[LabelKey, Summary] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, object]) -> LabelKey:
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def increment(self, name: str, value: int = 1, **labels: object) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._summaries.setdefault(key, Summary()).observe(value)
+
+    def get_counter(self, name: str, **labels: object) -> int:
+        """Return a counter, summed over all label sets that contain the given labels."""
+        expected = set(self._key(name, labels)[1])
+        with self._lock:
+            return sum(
+                value
+                for (key, key_labels), value in self._counters.items()
+                if key == name and expected <= set(key_labels)
+            )
+
+    def get_summary(self, name: str, **labels: object) -> Summary:
+        """Return a summary, merged over all label sets that contain the given labels."""
+        expected = set(self._key(name, labels)[1])
+        merged = Summary()
+        with self._lock:
+            for (key, key_labels), summary in self._summaries.items():
+                if key != name or not expected <= set(key_labels) or not summary.count:
+                    continue
+                merged.min = summary.min if not merged.count else min(merged.min, summary.min)
+                merged.max = summary.max if not merged.count else max(merged.max, summary.max)
+                merged.count += summary.count
+                merged.total += summary.total
+        return merged
+
+    def snapshot(self) -> dict[str, int | Summary]:
+        """Return every counter and summary keyed by ``name{label=value,...}``."""
+
+        def _format(key: LabelKey) -> str:
+            name, labels = key
+            if not labels:
+                return name
+            return f"{name}{{{','.join(f'{k}={v}' for k, v in labels)}}}"
+
+        with self._lock:
+            out: dict[str, int | Summary] = {_format(key): value for key, value in self._counters.items()}
+            out.update(
+                {
+                    _format(key): Summary(summary.count, summary.total, summary.min, summary.max)
+                    for key, summary in self._summaries.items()
+                }
+            )
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+metrics = Metrics()
@@ -0,0 +1,241 @@
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+
+from thirdweb_ai.common.block_index import parse_time
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.tx_watcher import TransactionWatcher
+
+# a backend wallet on a chain
+WalletKey = tuple[int, str]
+# sends a transaction from the given backend wallet and returns its queue ID
+WalletSender = Callable[[str], str]
+
+# statuses of transactions whose nonce is used up on chain
+_SETTLED_STATUSES = frozenset({"mined", "cancelled"})
+
+
+class NonceBackend(Protocol):
+    """The nonce endpoints of Engine used by :class:`NonceManager`."""
+
+    def get_nonce(self, chain_id: int | None = None, backend_wallet_address: str | None = None) -> int: ...
+
+    def get_transactions_by_nonce(
+        self,
+        from_nonce: int,
+        to_nonce: int | None = None,
+        chain_id: int | None = None,
+        backend_wallet_address: str | None = None,
+    ) -> list[dict[str, Any]]: ...
+
+    def cancel_nonces(
+        self, to_nonce: int, chain_id: int | None = None, backend_wallet_address: str | None = None
+    ) -> list[int]: ...
+
+    def reset_nonces(
+        self, chain_id: int | None = None, backend_wallet_address: str | None = None, sync_onchain: bool = True
+    ) -> dict[str, Any]: ...
+
+
+class NonceManager:
+    """Spreads transactions over a pool of backend wallets and repairs wallets whose nonces are stuck.
+
+    Engine assigns the nonce of a transaction when it sends it, so a wallet's transactions are mined one after the
+    other and a single transaction that never gets mined blocks all later ones. The manager tracks the transactions
+    in flight for every (chain, wallet) until they are final, sends every transaction from the least loaded wallet
+    of the pool and, with ``max_in_flight``, waits for a free slot instead of queueing more on a busy wallet.
+
+    A wallet is stalled when one of its transactions is in flight for longer than ``stuck_after`` seconds. Repairing
+    it looks up its recent nonces: the nonces up to the newest transaction that was sent more than ``stuck_after``
+    seconds ago and is still not mined are stuck. They are cancelled, and the wallet's nonce is synced with the chain.
+    The wallet gets no new transactions while it is repaired.
+
+    Args:
+        backend: Engine, or anything else with its nonce endpoints
+        watcher: Tracks the transactions until they are final
+        wallets: Addresses of the backend wallets in the pool
+        max_in_flight: Transactions in flight per wallet and chain at most, unlimited if None
+        stuck_after: Seconds after which an unmined transaction is considered stuck
+        scan_depth: Nonces below the last used one that are looked at for stuck transactions
+
+    Example:
+        >>> manager = engine.enable_wallet_pool([wallet_1, wallet_2, wallet_3], max_in_flight=20)
+        >>> engine.send_transaction(recipient, "0", "0x", 137)
+        >>> manager.repair_stalled()
+    """
+
+    def __init__(
+        self,
+        backend: NonceBackend,
+        watcher: TransactionWatcher,
+        wallets: Iterable[str],
+        max_in_flight: int | None = None,
+        stuck_after: float = 300,
+        scan_depth: int = 64,
+    ):
+        if max_in_flight is not None and max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        self.backend = backend
+        self.watcher = watcher
+        self.wallets: list[str] = list(dict.fromkeys(wallets))
+        if not self.wallets:
+            raise ValueError("At least one backend wallet is required")
+        self.max_in_flight = max_in_flight
+        self.stuck_after = stuck_after
+        self.scan_depth = scan_depth
+        # queue IDs in flight and when they were sent, per wallet
+        self._in_flight: dict[WalletKey, dict[str, float]] = {}
+        # sends in progress, which have no queue ID yet
+        self._reserved: dict[WalletKey, int] = {}
+        self._repairing: set[WalletKey] = set()
+        self._turn = 0
+        self._cond = threading.Condition()
+
+    def add_wallet(self, wallet: str) -> None:
+        with self._cond:
+            if wallet not in self.wallets:
+                self.wallets.append(wallet)
+                self._cond.notify_all()
+
+    def _load(self, key: WalletKey) -> int:
+        return len(self._in_flight.get(key, ())) + self._reserved.get(key, 0)
+
+    def acquire(self, chain_id: int, timeout: float | None = None) -> str:
+        """Reserve a slot on the least loaded wallet of the pool and return the wallet.
+
+        Blocks until a wallet has a free slot. Hand the slot back with :meth:`release` once the transaction was sent.
+
+        Raises:
+            TimeoutError: If no wallet had a free slot within ``timeout`` seconds
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                # start at a different wallet every time, so that wallets with the same load take turns
+                start = self._turn % len(self.wallets)
+                candidates = [
+                    wallet
+                    for wallet in self.wallets[start:] + self.wallets[:start]
+                    if (chain_id, wallet) not in self._repairing
+                    and (self.max_in_flight is None or self._load((chain_id, wallet)) < self.max_in_flight)
+                ]
+                if candidates:
+                    wallet = min(candidates, key=lambda wallet: self._load((chain_id, wallet)))
+                    self._turn += 1
+                    self._reserved[(chain_id, wallet)] = self._reserved.get((chain_id, wallet), 0) + 1
+                    return wallet
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    metrics.increment("nonces.acquire_timeouts", chain=chain_id)
+                    raise TimeoutError(f"No backend wallet had a free slot on chain {chain_id} within {timeout}s")
+                self._cond.wait(remaining)
+
+    def release(self, chain_id: int, wallet: str, queue_id: str | None = None) -> None:
+        """Hand back a slot reserved by :meth:`acquire`, tracking ``queue_id`` until it is final if it was sent."""
+        key = (chain_id, wallet)
+        with self._cond:
+            self._reserved[key] -= 1
+            if queue_id is not None:
+                self._in_flight.setdefault(key, {})[queue_id] = time.monotonic()
+            self._cond.notify_all()
+        if queue_id is not None:
+            try:
+                future = self.watcher.watch(queue_id, chain_id)
+            except RuntimeError:
+                # the watcher is closed, the transaction can't be tracked
+                self._finished(key, queue_id)
+                return
+            # also called if the watcher is closed before the transaction is final
+            future.add_done_callback(lambda _: self._finished(key, queue_id))
+
+    def _finished(self, key: WalletKey, queue_id: str) -> None:
+        with self._cond:
+            self._in_flight.get(key, {}).pop(queue_id, None)
+            self._cond.notify_all()
+
+    def submit(self, chain_id: int, send: WalletSender, timeout: float | None = None) -> str:
+        """Send a transaction from the least loaded wallet and return its queue ID.
+
+        Args:
+            send: Sends the transaction from the given wallet and returns its queue ID
+            timeout: Longest time in seconds to wait for a wallet with a free slot
+        """
+        wallet = self.acquire(chain_id, timeout)
+        try:
+            queue_id = send(wallet)
+        except BaseException:
+            self.release(chain_id, wallet)
+            raise
+        self.release(chain_id, wallet, queue_id)
+        metrics.increment("nonces.sent", chain=chain_id)
+        return queue_id
+
+    def in_flight(self, chain_id: int | None = None) -> dict[WalletKey, int]:
+        """Return the number of transactions in flight, or being sent, per wallet."""
+        with self._cond:
+            keys = set(self._in_flight) | set(self._reserved)
+            return {key: self._load(key) for key in sorted(keys) if chain_id is None or key[0] == chain_id}
+
+    def stalled(self, chain_id: int | None = None) -> list[WalletKey]:
+        """Return the wallets with a transaction in flight for longer than ``stuck_after`` seconds."""
+        cutoff = time.monotonic() - self.stuck_after
+        with self._cond:
+            return sorted(
+                key
+                for key, queue_ids in self._in_flight.items()
+                if (chain_id is None or key[0] == chain_id) and queue_ids and min(queue_ids.values()) < cutoff
+            )
+
+    def find_stuck_nonces(self, chain_id: int, wallet: str, now: float | None = None) -> list[int]:
+        """Return the nonces of a wallet that are stuck, in ascending order.
+
+        A transaction that was sent more than ``stuck_after`` seconds ago and is still not mined is stuck, and so are
+        all unsettled nonces before it: gaps left by errored transactions or transactions Engine does not know of.
+        """
+        last = self.backend.get_nonce(chain_id, wallet)
+        entries = self.backend.get_transactions_by_nonce(max(last - self.scan_depth + 1, 0), last, chain_id, wallet)
+        cutoff = (time.time() if now is None else now) - self.stuck_after
+        unsettled: list[int] = []
+        newest_stuck = None
+        for entry in sorted(entries, key=lambda entry: int(entry["nonce"])):
+            nonce = int(entry["nonce"])
+            transaction = entry.get("transaction") or {}
+            status = transaction.get("status")
+            if status in _SETTLED_STATUSES:
+                continue
+            unsettled.append(nonce)
+            if status == "sent" and transaction.get("sentAt") and parse_time(transaction["sentAt"]) < cutoff:
+                newest_stuck = nonce
+        if newest_stuck is None:
+            return []
+        return [nonce for nonce in unsettled if nonce <= newest_stuck]
+
+    def repair(self, chain_id: int, wallet: str) -> list[int]:
+        """Cancel the stuck nonces of a wallet and sync its nonce with the chain.
+
+        Returns:
+            The cancelled nonces, empty if the wallet was not stuck or is already being repaired
+        """
+        key = (chain_id, wallet)
+        with self._cond:
+            if key in self._repairing:
+                return []
+            self._repairing.add(key)
+        try:
+            stuck = self.find_stuck_nonces(chain_id, wallet)
+            if not stuck:
+                return []
+            cancelled = self.backend.cancel_nonces(stuck[-1], chain_id, wallet)
+            self.backend.reset_nonces(chain_id, wallet, sync_onchain=True)
+            metrics.increment("nonces.repaired", len(cancelled), chain=chain_id)
+            return cancelled
+        finally:
+            with self._cond:
+                self._repairing.discard(key)
+                self._cond.notify_all()
+
+    def repair_stalled(self, chain_id: int | None = None) -> dict[WalletKey, list[int]]:
+        """Repair every stalled wallet and return the cancelled nonces of those that were stuck."""
+        repaired = {key: self.repair(*key) for key in self.stalled(chain_id)}
+        return {key: nonces for key, nonces in repaired.items() if nonces}
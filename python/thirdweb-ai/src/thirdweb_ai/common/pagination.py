@@ -0,0 +1,129 @@
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+from concurrent.futures import Executor, Future
+from typing import Any
+
+from thirdweb_ai.tools.executor import get_tool_executor, result_or_run
+
+Item = dict[str, Any]
+# fetches one page given its number (starting from 0) and its size
+PageFetcher = Callable[[int, int], list[Item]]
+AsyncPageFetcher = Callable[[int, int], Awaitable[list[Item]]]
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def _page_size(limit: int, max_items: int | None) -> int:
+    if limit <= 0:
+        raise ValueError("limit must be positive")
+    return min(limit, max_items) if max_items is not None and max_items > 0 else limit
+
+
+def _has_more(items: list[Item], page_size: int, yielded: int, max_items: int | None) -> bool:
+    # a short page is the last one, and there is no point in fetching items beyond max_items
+    return len(items) >= page_size and (max_items is None or yielded + len(items) < max_items)
+
+
+def paginate(
+    fetch_page: PageFetcher,
+    limit: int = DEFAULT_PAGE_SIZE,
+    max_items: int | None = None,
+    stop_when: Callable[[Item], bool] | None = None,
+    prefetch: bool = True,
+    executor: Executor | None = None,
+    first_page: Future[list[Item]] | None = None,
+) -> Generator[Item, None, None]:
+    """Iterate over the items of a paginated endpoint, page by page.
+
+    At most two pages are held in memory: the one being consumed and, with ``prefetch``, the next one, which is
+    fetched on ``executor`` while the current one is consumed.
+
+    Args:
+        fetch_page: Returns the items of the given page
+        limit: Number of items per page
+        max_items: Stop after this many items
+        stop_when: Stop before the first item this returns True for
+        prefetch: Fetch the next page in the background
+        executor: Where pages are prefetched. Defaults to the process-wide tool executor.
+        first_page: The first page, already requested by the caller with ``fetch_page``
+    """
+    page_size = _page_size(limit, max_items)
+    if max_items is not None and max_items <= 0:
+        return
+    if prefetch and executor is None:
+        executor = get_tool_executor()
+
+    yielded = 0
+    page = 0
+    # pages the executor has not started yet are fetched inline, the caller may be one of its busy threads
+    if first_page is not None:
+        items = result_or_run(first_page, fetch_page, page, page_size)
+    else:
+        items = fetch_page(page, page_size)
+    pending: Future[list[Item]] | None = None
+    try:
+        while True:
+            more = _has_more(items, page_size, yielded, max_items)
+            if more and executor is not None and prefetch:
+                pending = executor.submit(fetch_page, page + 1, page_size)
+            for item in items:
+                if stop_when is not None and stop_when(item):
+                    return
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+            if not more:
+                return
+            page += 1
+            if pending is not None:
+                items, pending = result_or_run(pending, fetch_page, page, page_size), None
+            else:
+                items = fetch_page(page, page_size)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def apaginate(
+    fetch_page: AsyncPageFetcher,
+    limit: int = DEFAULT_PAGE_SIZE,
+    max_items: int | None = None,
+    stop_when: Callable[[Item], bool] | None = None,
+    prefetch: bool = True,
+    first_page: Awaitable[list[Item]] | None = None,
+) -> AsyncGenerator[Item, None]:
+    """Asynchronously iterate over the items of a paginated endpoint, see :func:`paginate`.
+
+    The next page is fetched in a task on the running loop while the current one is consumed.
+    """
+    page_size = _page_size(limit, max_items)
+    if max_items is not None and max_items <= 0:
+        return
+
+    yielded = 0
+    page = 0
+    items = await (first_page if first_page is not None else fetch_page(page, page_size))
+    pending: asyncio.Task[list[Item]] | None = None
+    try:
+        while True:
+            more = _has_more(items, page_size, yielded, max_items)
+            if more and prefetch:
+                pending = asyncio.ensure_future(fetch_page(page + 1, page_size))
+            for item in items:
+                if stop_when is not None and stop_when(item):
+                    return
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+            if not more:
+                return
+            page += 1
+            if pending is not None:
+                items, pending = await pending, None
+            else:
+                items = await fetch_page(page, page_size)
+    finally:
+        if pending is not None:
+            pending.cancel()
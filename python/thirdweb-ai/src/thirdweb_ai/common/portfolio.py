@@ -0,0 +1,155 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any, Literal, NamedTuple
+
+from thirdweb_ai.common.pagination import Item
+
+TokenType = Literal["erc20", "erc721", "erc1155"]
+
+
+class BalanceRequest(NamedTuple):
+    """The balances of one wallet and token type on a group of chains, fetched with one paginated request."""
+
+    owner: str
+    chain_ids: list[int]
+    token_type: TokenType
+
+
+class BalanceUpdate(NamedTuple):
+    """The outcome of a :class:`BalanceRequest`, either its balances or the error it failed with."""
+
+    request: BalanceRequest
+    balances: list[Item]
+    error: str | None = None
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class Position:
+    """The holdings of one token, summed over all wallets of a portfolio."""
+
+    chain_id: int
+    token_address: str
+    token_type: TokenType
+    token_id: str | None = None
+    name: str | None = None
+    symbol: str | None = None
+    decimals: int | None = None
+    # in the smallest unit of the token
+    balance: int = 0
+    balances: dict[str, int] = field(default_factory=dict)
+    price_usd: float | None = None
+
+    @property
+    def amount(self) -> float:
+        return self.balance / 10 ** (self.decimals or 0)
+
+    @property
+    def value_usd(self) -> float | None:
+        return None if self.price_usd is None else self.amount * self.price_usd
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "chain_id": self.chain_id,
+            "token_address": self.token_address,
+            "token_type": self.token_type,
+            "token_id": self.token_id,
+            "name": self.name,
+            "symbol": self.symbol,
+            "balance": str(self.balance),
+            "amount": self.amount,
+            "price_usd": self.price_usd,
+            "value_usd": self.value_usd,
+            "wallets": {owner: str(balance) for owner, balance in self.balances.items()},
+        }
+
+
+@dataclass
+class Portfolio:
+    """Token holdings of several wallets on several chains, aggregated per token and valued in USD.
+
+    Positions are added as balance updates arrive and valued once prices are applied, so a partially built
+    portfolio can be inspected at any time.
+    """
+
+    positions: dict[tuple[int, str, str | None], Position] = field(default_factory=dict)
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add(self, update: BalanceUpdate) -> None:
+        owner, chain_ids, token_type = update.request
+        if update.error is not None:
+            self.errors.append(
+                {"owner": owner, "chain_ids": chain_ids, "token_type": token_type, "error": update.error}
+            )
+            return
+        for item in update.balances:
+            address = str(item.get("token_address") or item.get("tokenAddress") or "").lower()
+            token_id = item.get("token_id") or item.get("tokenId")
+            chain_id = int(item.get("chain_id") or item.get("chainId") or 0)
+            key = (chain_id, address, str(token_id) if token_id is not None else None)
+            position = self.positions.get(key)
+            if position is None:
+                decimals = item.get("decimals")
+                position = self.positions[key] = Position(
+                    chain_id=chain_id,
+                    token_address=address,
+                    token_type=token_type,
+                    token_id=key[2],
+                    name=item.get("name"),
+                    symbol=item.get("symbol"),
+                    decimals=int(decimals) if decimals is not None else None,
+                )
+            balance = _int(item.get("balance"))
+            position.balance += balance
+            position.balances[owner] = position.balances.get(owner, 0) + balance
+
+    def fungible_tokens(self) -> list[tuple[int, str]]:
+        """Return the (chain, token) of every fungible position, the tokens that can be priced."""
+        return list(
+            dict.fromkeys((p.chain_id, p.token_address) for p in self.positions.values() if p.token_type == "erc20")
+        )
+
+    def apply_prices(self, prices: Iterable[Item]) -> None:
+        by_token = {(int(price["chain_id"]), str(price["address"]).lower()): price for price in prices}
+        for position in self.positions.values():
+            price = by_token.get((position.chain_id, position.token_address))
+            if price is not None and position.token_type == "erc20":
+                position.price_usd = float(price["price_usd"])
+
+    @property
+    def total_value_usd(self) -> float:
+        return sum(position.value_usd or 0.0 for position in self.positions.values())
+
+    def value_by_chain(self) -> dict[int, float]:
+        values: dict[int, float] = {}
+        for position in self.positions.values():
+            values[position.chain_id] = values.get(position.chain_id, 0.0) + (position.value_usd or 0.0)
+        return values
+
+    def value_by_wallet(self) -> dict[str, float]:
+        values: dict[str, float] = {}
+        for position in self.positions.values():
+            value = position.value_usd
+            if value is None or not position.balance:
+                continue
+            for owner, balance in position.balances.items():
+                values[owner] = values.get(owner, 0.0) + value * balance / position.balance
+        return values
+
+    def to_dict(self, max_positions: int | None = None) -> dict[str, Any]:
+        """Summarize the portfolio, with its most valuable positions first."""
+        positions = sorted(self.positions.values(), key=lambda p: p.value_usd or 0.0, reverse=True)
+        return {
+            "total_value_usd": self.total_value_usd,
+            "value_by_chain": self.value_by_chain(),
+            "value_by_wallet": self.value_by_wallet(),
+            "positions": [position.to_dict() for position in positions[:max_positions]],
+            "position_count": len(positions),
+            "errors": self.errors,
+        }
@@ -0,0 +1,106 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Literal
+
+from thirdweb_ai.common.address import validate_address, validate_transaction_hash
+
+
+def _timestamp(value: int | datetime | None) -> int | None:
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return value
+
+
+@dataclass(frozen=True)
+class EventQuery:
+    """A typed query of the Insight ``/v1/events`` endpoint.
+
+    Filters and aggregations are applied by the API, so only the matching events, or only the aggregated values,
+    are returned. Queries are immutable, every builder method returns a new query.
+
+    Example:
+        >>> transfers_per_day = (
+        ...     EventQuery()
+        ...     .emitted_by("0x...")
+        ...     .with_topic(0, "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef")
+        ...     .between(datetime(2025, 1, 1), datetime(2025, 2, 1))
+        ...     .grouped_by("toStartOfDay(block_timestamp) AS day")
+        ...     .aggregated("count() AS transfers")
+        ... )
+        >>> insight.query_events(transfers_per_day)["aggregations"]
+    """
+
+    chain_ids: tuple[int, ...] = ()
+    address: str | None = None
+    transaction_hash: str | None = None
+    topics: tuple[str | None, str | None, str | None, str | None] = (None, None, None, None)
+    from_block: int | None = None
+    to_block: int | None = None
+    from_timestamp: int | None = None
+    to_timestamp: int | None = None
+    group_by: tuple[str, ...] = ()
+    aggregate: tuple[str, ...] = ()
+    sort_by: Literal["block_number", "block_timestamp"] = "block_number"
+    sort_order: Literal["asc", "desc"] = "desc"
+    decode: bool = True
+    page: int | None = None
+    limit: int | None = None
+
+    def on_chains(self, *chain_ids: int) -> "EventQuery":
+        return replace(self, chain_ids=chain_ids)
+
+    def emitted_by(self, address: str) -> "EventQuery":
+        return replace(self, address=validate_address(address))
+
+    def in_transaction(self, transaction_hash: str) -> "EventQuery":
+        return replace(self, transaction_hash=validate_transaction_hash(transaction_hash))
+
+    def with_topic(self, index: int, topic: str) -> "EventQuery":
+        """Only match events whose topic at ``index`` (0 is the event signature hash) equals ``topic``."""
+        if not 0 <= index <= 3:
+            raise ValueError(f"Invalid topic index: {index}")
+        topics = list(self.topics)
+        topics[index] = validate_transaction_hash(topic)
+        return replace(self, topics=(topics[0], topics[1], topics[2], topics[3]))
+
+    def blocks(self, from_block: int | None = None, to_block: int | None = None) -> "EventQuery":
+        """Only match events of the inclusive block range."""
+        return replace(self, from_block=from_block, to_block=to_block)
+
+    def between(self, from_time: int | datetime | None = None, to_time: int | datetime | None = None) -> "EventQuery":
+        """Only match events of blocks with timestamps in the inclusive range, in seconds or as datetimes."""
+        return replace(self, from_timestamp=_timestamp(from_time), to_timestamp=_timestamp(to_time))
+
+    def grouped_by(self, *fields: str) -> "EventQuery":
+        return replace(self, group_by=fields)
+
+    def aggregated(self, *expressions: str) -> "EventQuery":
+        return replace(self, aggregate=expressions)
+
+    def sorted(
+        self, by: Literal["block_number", "block_timestamp"], order: Literal["asc", "desc"] = "desc"
+    ) -> "EventQuery":
+        return replace(self, sort_by=by, sort_order=order)
+
+    def paged(self, page: int, limit: int | None = None) -> "EventQuery":
+        return replace(self, page=page, limit=limit)
+
+    def to_params(self) -> dict[str, Any]:
+        """Return the query parameters of the request."""
+        params: dict[str, Any] = {"sort_by": self.sort_by, "sort_order": self.sort_order, "decode": self.decode}
+        filters: dict[str, Any] = {
+            "chain": list(self.chain_ids) or None,
+            "filter_address": self.address,
+            "filter_transaction_hash": self.transaction_hash,
+            **{f"filter_topic_{i}": topic for i, topic in enumerate(self.topics)},
+            "filter_block_number_gte": self.from_block,
+            "filter_block_number_lte": self.to_block,
+            "filter_block_timestamp_gte": self.from_timestamp,
+            "filter_block_timestamp_lte": self.to_timestamp,
+            "group_by": list(self.group_by) or None,
+            "aggregate": list(self.aggregate) or None,
+            "page": self.page or None,
+            "limit": self.limit,
+        }
+        params.update({key: value for key, value in filters.items() if value is not None})
+        return params
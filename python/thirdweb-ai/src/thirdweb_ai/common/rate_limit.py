@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.utils import match_path
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Tokens are reserved in arrival order: a caller that finds the bucket empty takes a token from the future and
+    waits until it has been refilled, so waiting callers are served first come, first served.
+
+    Args:
+        rate: Tokens added per second
+        burst: Maximum number of tokens the bucket holds. Defaults to one second worth of tokens.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> float:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class AdaptiveConcurrencyLimit:
+    """Limits the number of requests in flight, adapting the limit with AIMD.
+
+    Every successful request raises the limit by ``1 / limit`` (about one per round trip of a full window), a rate
+    limited (429) or slow request multiplies it by ``backoff_ratio``. Decreases happen at most once per
+    ``cooldown`` seconds so that a burst of failures from the same window only counts once.
+
+    Threads and coroutines can share an instance; callers over the limit wait in arrival order.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 16,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        backoff_ratio: float = 0.5,
+        latency_threshold: float | None = None,
+        cooldown: float = 1.0,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self.cooldown = cooldown
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: deque[threading.Event | tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _try_acquire(self) -> bool:
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._try_acquire():
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        # the slot is handed over by release() before the event is set
+        event.wait()
+
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future: asyncio.Future[None] = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+                    raise
+            # the slot was already handed over to us, pass it on
+            self.release(None, 0.0)
+            raise
+
+    def release(self, status_code: int | None, latency: float) -> None:
+        """Return a slot and adapt the limit to the outcome of the request.
+
+        Args:
+            status_code: Response status, or None if no response was received
+            latency: Seconds the request took
+        """
+        with self._lock:
+            now = time.monotonic()
+            congested = status_code == 429 or (self.latency_threshold is not None and latency > self.latency_threshold)
+            if congested:
+                if now - self._last_decrease >= self.cooldown:
+                    self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+                    self._last_decrease = now
+            elif status_code is not None and status_code < 500:
+                self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+            self._in_flight -= 1
+            while self._waiters and self._in_flight < self.limit:
+                waiter = self._waiters.popleft()
+                self._in_flight += 1
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                else:
+                    waiter_loop, future = waiter
+                    waiter_loop.call_soon_threadsafe(_resolve, future)
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+@dataclass
+class Slot:
+    """A permission to send one request. Set ``status_code`` once the response is known."""
+
+    endpoint: str
+    started: float = 0.0
+    status_code: int | None = None
+
+
+class RateLimiter:
+    """Client-side rate and concurrency limits for the requests of one or more services.
+
+    Share a single instance between all services that use the same secret key to keep their combined request rate
+    under the key's quota, e.g. by registering it with :func:`set_rate_limiter`. Callers over a limit wait rather
+    than fail; wait times are recorded in ``metrics`` as ``ratelimit.wait_seconds``.
+
+    Args:
+        rate: Requests per second across all endpoints, or None for no overall limit
+        burst: Requests that may be sent at once before ``rate`` applies, also to every endpoint limit
+        endpoints: Glob patterns of request paths mapped to their own requests per second limit, e.g.
+            ``{"events*": 5}``, or to a ``(rate, burst)`` pair. The first matching pattern applies in addition to the
+            overall limit.
+        concurrency: An optional adaptive limit on the number of requests in flight
+
+    Example:
+        >>> limiter = RateLimiter(rate=50, endpoints={"tokens/price": 5}, concurrency=AdaptiveConcurrencyLimit())
+        >>> set_rate_limiter(secret_key, limiter)
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float | None = None,
+        endpoints: dict[str, float | tuple[float, float]] | None = None,
+        concurrency: AdaptiveConcurrencyLimit | None = None,
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.endpoints = dict(endpoints or {})
+        self.endpoint_buckets = {
+            pattern: TokenBucket(*limit) if isinstance(limit, tuple) else TokenBucket(limit, burst)
+            for pattern, limit in self.endpoints.items()
+        }
+        self.concurrency = concurrency
+
+    def _buckets(self, path: str) -> tuple[str, list[TokenBucket]]:
+        buckets = [self.bucket] if self.bucket else []
+        matched = match_path(path, self.endpoints)
+        if matched is None:
+            return "*", buckets
+        return matched[0], [*buckets, self.endpoint_buckets[matched[0]]]
+
+    def _record(self, service: str, endpoint: str, waited: float) -> None:
+        metrics.observe("ratelimit.wait_seconds", waited, service=service, endpoint=endpoint)
+
+    @contextmanager
+    def slot(self, path: str, service: str = "") -> Generator[Slot, None, None]:
+        started = time.monotonic()
+        endpoint, buckets = self._buckets(path)
+        for bucket in buckets:
+            bucket.acquire()
+        if self.concurrency:
+            self.concurrency.acquire()
+        slot = Slot(endpoint, time.monotonic())
+        self._record(service, endpoint, slot.started - started)
+        try:
+            yield slot
+        finally:
+            if self.concurrency:
+                self.concurrency.release(slot.status_code, time.monotonic() - slot.started)
+
+    @asynccontextmanager
+    async def aslot(self, path: str, service: str = "") -> AsyncGenerator[Slot, None]:
+        started = time.monotonic()
+        endpoint, buckets = self._buckets(path)
+        for bucket in buckets:
+            await bucket.acquire_async()
+        if self.concurrency:
+            await self.concurrency.acquire_async()
+        slot = Slot(endpoint, time.monotonic())
+        self._record(service, endpoint, slot.started - started)
+        try:
+            yield slot
+        finally:
+            if self.concurrency:
+                self.concurrency.release(slot.status_code, time.monotonic() - slot.started)
+
+
+# limiters of the services using a secret key, keyed by a digest of the key so that it is not kept in memory twice
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _key_digest(secret_key: str) -> str:
+    return hashlib.sha256(secret_key.encode()).hexdigest()
+
+
+def get_rate_limiter(secret_key: str) -> RateLimiter | None:
+    """Return the limiter registered for a secret key, None if there is none."""
+    with _rate_limiters_lock:
+        return _rate_limiters.get(_key_digest(secret_key))
+
+
+def set_rate_limiter(secret_key: str, limiter: RateLimiter | None) -> None:
+    """Limit the requests of every service using a secret key with one shared limiter, or stop limiting them.
+
+    Services use the limiter registered for their key unless one was assigned to them, including services created
+    before it was registered.
+    """
+    with _rate_limiters_lock:
+        if limiter is None:
+            _rate_limiters.pop(_key_digest(secret_key), None)
+        else:
+            _rate_limiters[_key_digest(secret_key)] = limiter
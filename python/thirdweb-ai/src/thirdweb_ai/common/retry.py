@@ -0,0 +1,95 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def parse_retry_after(response: httpx.Response) -> float | None:
+    """Parse the ``Retry-After`` header of a response into seconds, if present."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Only idempotent requests are retried. Non-idempotent requests (e.g. Engine writes) are sent exactly once unless
+    the caller explicitly marks them as idempotent.
+
+    Attributes:
+        max_retries: Maximum number of retries per call
+        max_wait: Total number of seconds a single call may spend waiting between retries
+        backoff_base: Base delay in seconds of the exponential backoff
+        backoff_max: Maximum delay in seconds of a single backoff
+        max_retry_after: Longest ``Retry-After`` in seconds that is honored. Longer waits fail immediately.
+        status_codes: Response status codes that are retried
+        idempotent_methods: HTTP methods that are considered safe to retry
+    """
+
+    max_retries: int = 3
+    max_wait: float = 60.0
+    backoff_base: float = 0.5
+    backoff_max: float = 20.0
+    max_retry_after: float = 60.0
+    status_codes: frozenset[int] = RETRYABLE_STATUS_CODES
+    idempotent_methods: frozenset[str] = IDEMPOTENT_METHODS
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def start(self) -> "RetryBudget":
+        return RetryBudget(self)
+
+
+@dataclass
+class RetryBudget:
+    """Retry state of a single call."""
+
+    policy: RetryPolicy
+    attempt: int = 0
+    waited: float = field(default=0.0)
+
+    def next_delay(self, response: httpx.Response | None = None) -> float | None:
+        """Return how long to wait before retrying, or None if the call must not be retried.
+
+        Args:
+            response: The failed response, or None if the request failed without a response
+        """
+        if self.attempt >= self.policy.max_retries:
+            return None
+        if response is not None and response.status_code not in self.policy.status_codes:
+            return None
+
+        delay = self.policy.backoff(self.attempt)
+        retry_after = parse_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            if retry_after > self.policy.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+        if self.waited + delay > self.policy.max_wait:
+            return None
+
+        self.attempt += 1
+        self.waited += delay
+        return delay
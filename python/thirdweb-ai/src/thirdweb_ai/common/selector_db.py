@@ -0,0 +1,154 @@
+import mmap
+import struct
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from eth_utils.crypto import keccak
+
+# a database file is the magic, the number of entries, the sorted hashes, the offsets of the signatures and the
+# signatures, all offsets relative to the start of the signatures
+MAGIC = b"TWSEL\x01"
+HASH_SIZE = 32
+
+_HEADER = struct.Struct(f"<{len(MAGIC)}sI")
+_OFFSET = struct.Struct("<I")
+
+BUNDLED_SIGNATURES = Path(__file__).with_name("signatures.txt")
+
+
+def signature_hash(signature: str) -> bytes:
+    """Return the Keccak-256 hash of a text signature, the topic of an event and the prefix of a selector."""
+    return keccak(text=signature.replace(" ", ""))
+
+
+def encode_database(signatures: Iterable[str]) -> bytes:
+    """Encode text signatures as a selector database, see :class:`SelectorDatabase`."""
+    entries = sorted({(signature_hash(s), s.replace(" ", "")) for s in signatures if s.strip()})
+    blobs = [signature.encode() for _, signature in entries]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return b"".join(
+        [
+            _HEADER.pack(MAGIC, len(entries)),
+            *(digest for digest, _ in entries),
+            *(_OFFSET.pack(offset) for offset in offsets),
+            *blobs,
+        ]
+    )
+
+
+def read_signatures(path: str | Path) -> list[str]:
+    """Read text signatures from a file with one signature per line, skipping blank lines and # comments."""
+    lines = Path(path).expanduser().read_text().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+class SelectorDatabase:
+    """A local index of function selectors and event topics to their text signatures.
+
+    Entries are kept sorted by the hash of their signature in one compact buffer, memory-mapped when read from a
+    file, so a lookup is a binary search that neither parses nor loads the whole database. The buffer is only
+    loaded on the first lookup. A 4-byte selector matches every signature whose hash starts with it, so selector
+    collisions return several signatures; a 32-byte topic matches exactly.
+
+    Args:
+        load: Returns the encoded database, called on the first lookup
+
+    Example:
+        >>> SelectorDatabase.build("~/.cache/thirdweb/selectors.db", read_signatures("4byte_signatures.txt"))
+        >>> database = SelectorDatabase.open("~/.cache/thirdweb/selectors.db")
+        >>> database.lookup("0xa9059cbb")
+        ['transfer(address,uint256)']
+    """
+
+    def __init__(self, load: Callable[[], bytes | mmap.mmap]):
+        self._load = load
+        self._lock = threading.Lock()
+        self._buffer: memoryview | None = None
+        self._count = 0
+
+    @classmethod
+    def open(cls, path: str | Path) -> "SelectorDatabase":
+        """Memory-map a database file written by :meth:`build`."""
+        path = Path(path).expanduser()
+
+        def load() -> mmap.mmap:
+            with path.open("rb") as file:
+                return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(load)
+
+    @classmethod
+    def build(cls, path: str | Path, signatures: Iterable[str]) -> "SelectorDatabase":
+        """Write the signatures to a database file and open it."""
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(encode_database(signatures))
+        tmp.replace(path)
+        return cls.open(path)
+
+    @classmethod
+    def from_signatures(cls, signatures: Iterable[str]) -> "SelectorDatabase":
+        """Index text signatures in memory, hashing them on the first lookup."""
+        return cls(lambda: encode_database(signatures))
+
+    @classmethod
+    def bundled(cls) -> "SelectorDatabase":
+        """The signatures of common standards (ERC-20, ERC-721, ERC-1155, Uniswap, ...) shipped with the package."""
+        return cls(lambda: encode_database(read_signatures(BUNDLED_SIGNATURES)))
+
+    def _view(self) -> memoryview:
+        if self._buffer is None:
+            with self._lock:
+                if self._buffer is None:
+                    buffer = memoryview(self._load())
+                    magic, self._count = _HEADER.unpack_from(buffer)
+                    if magic != MAGIC:
+                        raise ValueError("Not a selector database")
+                    self._buffer = buffer
+        return self._buffer
+
+    def __len__(self) -> int:
+        self._view()
+        return self._count
+
+    def _hash(self, buffer: memoryview, index: int) -> bytes:
+        start = _HEADER.size + index * HASH_SIZE
+        return bytes(buffer[start : start + HASH_SIZE])
+
+    def _signature(self, buffer: memoryview, index: int) -> str:
+        offsets = _HEADER.size + self._count * HASH_SIZE
+        (start,) = _OFFSET.unpack_from(buffer, offsets + index * _OFFSET.size)
+        (end,) = _OFFSET.unpack_from(buffer, offsets + (index + 1) * _OFFSET.size)
+        blobs = offsets + (self._count + 1) * _OFFSET.size
+        return str(buffer[blobs + start : blobs + end], "utf-8")
+
+    def lookup(self, selector: str) -> list[str]:
+        """Return the signatures of a 4-byte function selector or a 32-byte event topic, given as hex."""
+        prefix = bytes.fromhex(selector.removeprefix("0x"))
+        if len(prefix) not in (4, HASH_SIZE):
+            raise ValueError(f"Invalid selector or topic: {selector}")
+        buffer = self._view()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._hash(buffer, middle)[: len(prefix)] < prefix:
+                low = middle + 1
+            else:
+                high = middle
+        signatures: list[str] = []
+        while low < self._count and self._hash(buffer, low)[: len(prefix)] == prefix:
+            signatures.append(self._signature(buffer, low))
+            low += 1
+        return signatures
+
+    def lookup_many(self, selectors: Iterable[str]) -> dict[str, list[str]]:
+        """Look up many selectors and topics at once, returning the signatures of each of them."""
+        return {selector: self.lookup(selector) for selector in dict.fromkeys(selectors)}
+
+
+# shared by all services, so the bundled signatures are hashed at most once per process
+default_selectors = SelectorDatabase.bundled()
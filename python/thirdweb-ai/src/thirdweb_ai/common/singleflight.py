@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import weakref
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, Generic, TypeVar
+
+from thirdweb_ai.common.cache import headers_digest, make_cache_key
+
+T = TypeVar("T")
+
+
+def make_request_key(
+    method: str, url: str, params: Mapping[str, Any] | None = None, headers: Mapping[str, Any] | None = None
+) -> str:
+    """Build a key identifying a request by its method, URL, query parameters and headers.
+
+    Headers are part of the key (as a digest) so that requests made with different credentials are never shared.
+    """
+    return f"{make_cache_key(method, url, dict(params or {}))} {headers_digest(headers)}"
+
+
+class _Call(Generic[T]):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicates concurrent calls with the same key across threads.
+
+    The first caller of a key runs the function, every caller that arrives while it is running waits for and
+    receives the same result, or the same exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call[T]] = {}
+
+    def do(self, key: str, func: Callable[[], T]) -> tuple[T, bool]:
+        """Run ``func`` unless an identical call is already in flight.
+
+        Returns:
+            The result and whether it was shared with another caller's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class AsyncSingleFlight(Generic[T]):
+    """Deduplicates concurrent calls with the same key on an event loop.
+
+    Calls are tracked per running loop, so a single instance can be shared by several loops.
+    """
+
+    def __init__(self):
+        self._calls: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future[T]]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Await ``func`` unless an identical call is already in flight.
+
+        Returns:
+            The result and whether it was shared with another caller's call
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        while (future := calls.get(key)) is not None:
+            # unlike awaiting the future, a waiter being cancelled does not cancel the call the others wait for
+            await asyncio.wait([future])
+            if not future.cancelled():
+                return future.result(), True
+            # the caller running the call was cancelled, not this one: make the call again
+
+        future = calls[key] = loop.create_future()
+        # mark the outcome as retrieved, nobody may be waiting for it
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del calls[key]
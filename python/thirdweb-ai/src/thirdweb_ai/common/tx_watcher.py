@@ -0,0 +1,203 @@
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
+from typing import Any
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.tools.executor import map_concurrently
+
+# returns the status of a transaction given its queue ID, like Engine's transaction/status result
+StatusFetcher = Callable[[str], dict[str, Any]]
+StatusCallback = Callable[[dict[str, Any]], None]
+
+FINAL_STATUSES = frozenset({"mined", "errored", "cancelled"})
+
+# seconds between blocks, transactions are polled about once per block while they are being mined
+BLOCK_TIMES: dict[int, float] = {
+    1: 12.0,
+    10: 2.0,
+    56: 3.0,
+    100: 5.0,
+    137: 2.0,
+    324: 1.0,
+    8453: 2.0,
+    42161: 0.25,
+    43114: 2.0,
+    59144: 2.0,
+    81457: 2.0,
+    11155111: 12.0,
+}
+DEFAULT_BLOCK_TIME = 2.0
+
+
+class _Watched:
+    def __init__(self, queue_id: str, chain_id: int | None, interval: float):
+        self.queue_id = queue_id
+        self.chain_id = chain_id
+        self.future: Future[dict[str, Any]] = Future()
+        self.interval = interval
+        self.next_poll = time.monotonic() + interval
+        self.status: dict[str, Any] | None = None
+
+
+class TransactionWatcher:
+    """Tracks many submitted transactions with one shared poller until they are mined, errored or cancelled.
+
+    Each transaction is first polled about one block time after it is watched. While it stays queued its polling
+    interval grows by ``backoff`` up to ``max_interval``, and once it is sent it is polled about once per block
+    again, so a busy queue costs few requests and a mined transaction is noticed quickly. The polls that are due
+    are sent together, concurrently, from one background thread.
+
+    Args:
+        fetch_status: Returns the status of a transaction given its queue ID
+        min_interval: Shortest time in seconds between two polls of a transaction
+        max_interval: Longest time in seconds between two polls of a transaction
+        backoff: Growth of the polling interval while a transaction does not progress
+        max_concurrency: Status requests in flight at a time
+
+    Example:
+        >>> future = engine.transaction_watcher.watch(queue_id, chain_id=137, callback=print)
+        >>> statuses = engine.transaction_watcher.wait(queue_ids, timeout=120)
+    """
+
+    def __init__(
+        self,
+        fetch_status: StatusFetcher,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        max_concurrency: int = 8,
+    ):
+        self.fetch_status = fetch_status
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self._watched: dict[str, _Watched] = {}
+        self._cond = threading.Condition()
+        self._poller: threading.Thread | None = None
+        self._closed = False
+
+    def _block_interval(self, chain_id: int | None) -> float:
+        block_time = BLOCK_TIMES.get(chain_id, DEFAULT_BLOCK_TIME) if chain_id is not None else DEFAULT_BLOCK_TIME
+        return min(max(block_time, self.min_interval), self.max_interval)
+
+    def watch(
+        self, queue_id: str, chain_id: int | None = None, callback: StatusCallback | None = None
+    ) -> Future[dict[str, Any]]:
+        """Track a transaction and return a future of its final status.
+
+        Watching a transaction that is already tracked returns the same future. ``callback`` is called with the
+        final status on the poller thread.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("TransactionWatcher is closed")
+            watched = self._watched.get(queue_id)
+            if watched is None:
+                watched = self._watched[queue_id] = _Watched(queue_id, chain_id, self._block_interval(chain_id))
+                metrics.increment("tx_watcher.watched")
+                if self._poller is None:
+                    self._poller = threading.Thread(target=self._run, name="tx-watcher", daemon=True)
+                    self._poller.start()
+                self._cond.notify()
+        if callback is not None:
+            watched.future.add_done_callback(lambda future: future.cancelled() or callback(future.result()))
+        return watched.future
+
+    def wait(
+        self, queue_ids: Iterable[str], timeout: float | None = None, chain_id: int | None = None
+    ) -> dict[str, dict[str, Any] | None]:
+        """Watch transactions and wait until all of them are final or ``timeout`` seconds passed.
+
+        Returns:
+            The status of every transaction, the last one seen (or None) for those that are not final yet
+        """
+        futures = self.watch_all(queue_ids, chain_id)
+        wait_futures(futures.values(), timeout=timeout)
+        return self.results(futures)
+
+    def watch_all(self, queue_ids: Iterable[str], chain_id: int | None = None) -> dict[str, Future[dict[str, Any]]]:
+        """Track transactions and return the future of every distinct one, to wait for them another way."""
+        return {queue_id: self.watch(queue_id, chain_id) for queue_id in dict.fromkeys(queue_ids)}
+
+    def results(self, futures: dict[str, Future[dict[str, Any]]]) -> dict[str, dict[str, Any] | None]:
+        """Return the final status of every transaction, the last one seen (or None) for those that are not final."""
+        return {
+            queue_id: future.result() if future.done() and not future.cancelled() else self.status(queue_id)
+            for queue_id, future in futures.items()
+        }
+
+    def update(self, status: dict[str, Any]) -> None:
+        """Apply a status pushed by Engine, e.g. from a webhook, to the transaction it belongs to if it is watched."""
+        with self._cond:
+            watched = self._watched.get(str(status.get("queueId")))
+        if watched is not None:
+            metrics.increment("tx_watcher.pushed")
+            self._apply(watched, status)
+
+    def status(self, queue_id: str) -> dict[str, Any] | None:
+        """Return the last status seen of a tracked transaction."""
+        with self._cond:
+            watched = self._watched.get(queue_id)
+            return watched.status if watched is not None else None
+
+    @property
+    def pending(self) -> list[str]:
+        with self._cond:
+            return list(self._watched)
+
+    def close(self) -> None:
+        """Stop polling and cancel the futures of the transactions that are not final yet."""
+        with self._cond:
+            self._closed = True
+            watched, self._watched = list(self._watched.values()), {}
+            self._cond.notify()
+        for item in watched:
+            item.future.cancel()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                due = [watched for watched in self._watched.values() if watched.next_poll <= now]
+                if not due:
+                    next_poll = min((watched.next_poll for watched in self._watched.values()), default=None)
+                    self._cond.wait(next_poll - now if next_poll is not None else None)
+                    continue
+            metrics.observe("tx_watcher.poll_size", len(due))
+            map_concurrently(self._poll, due, max_concurrency=self.max_concurrency)
+
+    def _poll(self, watched: _Watched) -> None:
+        try:
+            status = self.fetch_status(watched.queue_id)
+        except Exception:
+            metrics.increment("tx_watcher.errors")
+            status = None
+        metrics.increment("tx_watcher.polls")
+        self._apply(watched, status)
+
+    def _apply(self, watched: _Watched, status: dict[str, Any] | None) -> None:
+        previous = watched.status
+        if status is not None:
+            watched.status = status
+            if watched.chain_id is None and status.get("chainId"):
+                watched.chain_id = int(status["chainId"])
+        state = status.get("status") if status is not None else None
+        if status is not None and state in FINAL_STATUSES:
+            with self._cond:
+                # close() may have cancelled the future, or another update resolved it, in the meantime
+                owned = self._watched.pop(watched.queue_id, None) is watched
+            if owned:
+                watched.future.set_result(status)
+            return
+        if state == "sent" and (previous is None or previous.get("status") != "sent"):
+            # about to be mined, look again in a block
+            watched.interval = self._block_interval(watched.chain_id)
+        else:
+            watched.interval = min(watched.interval * self.backoff, self.max_interval)
+        watched.next_poll = time.monotonic() + watched.interval
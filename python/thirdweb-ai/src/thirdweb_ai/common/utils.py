@@ -1,5 +1,9 @@
 import re
-from typing import Any
+from collections.abc import Mapping, Sequence
+from fnmatch import fnmatchcase
+from typing import Any, TypeVar
+
+V = TypeVar("V")
 
 TRANSACTION_KEYS_TO_KEEP = [
     "hash",
@@ -41,6 +45,15 @@ def extract_digits(value: int | str) -> int:
     return int(extracted_digits)
 
 
+def normalize_chain_id(chain_id: int | str | Sequence[int | str] | None) -> int | list[int] | None:
+    """Normalize chain IDs given as integers or strings (e.g. "137", "polygon-137") to integers."""
+    if chain_id is None:
+        return None
+    if isinstance(chain_id, int | str):
+        return extract_digits(chain_id)
+    return [extract_digits(c) for c in chain_id]
+
+
 def is_encoded(encoded_data: str) -> bool:
     """Check if a string is a valid hexadecimal value."""
     encoded_data = encoded_data.removeprefix("0x")
@@ -72,8 +85,17 @@ def filter_response_keys(items: list[dict[str, Any]], keys_to_keep: list[str] |
     if not keys_to_keep:
         return items
 
+    keep = set(keys_to_keep)
     for item in items:
-        keys_to_remove = [key for key in item if key not in keys_to_keep]
-        for key in keys_to_remove:
-            item.pop(key, None)
+        for key in item.keys() - keep:
+            del item[key]
     return items
+
+
+def match_path(path: str, patterns: Mapping[str, V]) -> tuple[str, V] | None:
+    """Return the first ``(pattern, value)`` whose glob pattern matches a request path, like a cache TTL or a limit."""
+    path = path.strip("/")
+    for pattern, value in patterns.items():
+        if fnmatchcase(path, pattern):
+            return pattern, value
+    return None
@@ -0,0 +1,190 @@
+import contextlib
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Awaitable, Callable, MutableMapping
+from typing import Any, Literal
+
+from thirdweb_ai.common.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "x-engine-signature"
+TIMESTAMP_HEADER = "x-engine-timestamp"
+
+# what a notification is about: a transaction status update or an event log or receipt of a contract subscription
+NotificationKind = Literal["transaction", "event-log", "transaction-receipt", "other"]
+Listener = Callable[[dict[str, Any]], None]
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+# largest accepted request body in bytes
+MAX_BODY_SIZE = 1 << 20
+
+
+def sign_webhook(body: bytes, timestamp: int | str, secret: str) -> str:
+    """Return the signature Engine sends with a webhook: the HMAC-SHA256 of ``"{timestamp}.{body}"``, in hex."""
+    message = f"{timestamp}.".encode() + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_webhook(
+    body: bytes,
+    timestamp: str | None,
+    signature: str | None,
+    secret: str,
+    tolerance: float = 300,
+    now: float | None = None,
+) -> bool:
+    """Check that a webhook was signed with ``secret`` at most ``tolerance`` seconds ago."""
+    if not timestamp or not signature:
+        return False
+    try:
+        age = (time.time() if now is None else now) - int(timestamp)
+    except ValueError:
+        return False
+    if abs(age) > tolerance:
+        return False
+    return hmac.compare_digest(sign_webhook(body, timestamp, secret), signature)
+
+
+def notification_kind(payload: dict[str, Any]) -> NotificationKind:
+    if "queueId" in payload and "status" in payload:
+        return "transaction"
+    if payload.get("type") in ("event-log", "transaction-receipt"):
+        return payload["type"]
+    return "other"
+
+
+class WebhookReceiver:
+    """An ASGI app that receives Engine webhooks and hands the notifications to in-process consumers.
+
+    Requests are accepted if they are signed with the secret of one of the registered webhooks. Every notification
+    is passed to the listeners of its kind, on the thread serving the app, and put on the queues returned by
+    :meth:`subscribe`, from which tools and worker threads consume them. A listener that raises is logged and
+    counted as ``webhooks.listener_errors`` without keeping the notification from the others. A consumer that falls
+    behind loses the oldest notifications of its queue instead of blocking the receiver.
+
+    Serve it with any ASGI server and register it with :meth:`Engine.register_webhook_receiver`.
+
+    Args:
+        secrets: Secrets of the webhooks whose notifications are accepted
+        tolerance: Largest accepted age in seconds of a notification, against replayed requests
+        max_queue_size: Notifications each subscribed queue holds at most
+
+    Example:
+        >>> receiver = WebhookReceiver()
+        >>> engine.register_webhook_receiver(receiver, "https://agents.example.com/engine-webhooks")
+        >>> uvicorn.run(receiver, port=8000)
+    """
+
+    def __init__(self, secrets: list[str] | None = None, tolerance: float = 300, max_queue_size: int = 10_000):
+        self.secrets: list[str] = list(secrets or [])
+        self.tolerance = tolerance
+        self.max_queue_size = max_queue_size
+        self._listeners: dict[NotificationKind, list[Listener]] = {}
+        self._queues: dict[NotificationKind, list[queue.Queue[dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def add_secret(self, secret: str) -> None:
+        with self._lock:
+            if secret not in self.secrets:
+                self.secrets.append(secret)
+
+    def add_listener(self, kind: NotificationKind, listener: Listener) -> None:
+        """Call ``listener`` with every notification of ``kind``."""
+        with self._lock:
+            self._listeners.setdefault(kind, []).append(listener)
+
+    def subscribe(self, kind: NotificationKind) -> "queue.Queue[dict[str, Any]]":
+        """Return a new queue that receives every notification of ``kind`` from now on."""
+        notifications: queue.Queue[dict[str, Any]] = queue.Queue(self.max_queue_size)
+        with self._lock:
+            self._queues.setdefault(kind, []).append(notifications)
+        return notifications
+
+    def verify(self, body: bytes, timestamp: str | None, signature: str | None) -> bool:
+        with self._lock:
+            secrets = list(self.secrets)
+        return any(verify_webhook(body, timestamp, signature, secret, self.tolerance) for secret in secrets)
+
+    def dispatch(self, payload: dict[str, Any]) -> NotificationKind:
+        """Hand a verified notification to the listeners and queues of its kind."""
+        kind = notification_kind(payload)
+        metrics.increment("webhooks.received", kind=kind)
+        with self._lock:
+            listeners = list(self._listeners.get(kind, []))
+            queues = list(self._queues.get(kind, []))
+        for listener in listeners:
+            self._notify(listener, payload, kind)
+        for notifications in queues:
+            while True:
+                try:
+                    notifications.put_nowait(payload)
+                    break
+                except queue.Full:
+                    metrics.increment("webhooks.dropped", kind=kind)
+                    with contextlib.suppress(queue.Empty):
+                        notifications.get_nowait()
+        return kind
+
+    @staticmethod
+    def _notify(listener: Listener, payload: dict[str, Any], kind: NotificationKind) -> None:
+        try:
+            listener(payload)
+        except Exception:
+            metrics.increment("webhooks.listener_errors", kind=kind)
+            logger.exception("Webhook listener %r failed", listener)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            while (message := await receive())["type"] != "lifespan.shutdown":
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+        if scope["type"] != "http":
+            return
+        if scope["method"] != "POST":
+            await self._respond(send, 405, {"error": "Method not allowed"})
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_SIZE:
+                await self._respond(send, 413, {"error": "Payload too large"})
+                return
+            if not message.get("more_body"):
+                break
+
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        if not self.verify(body, headers.get(TIMESTAMP_HEADER), headers.get(SIGNATURE_HEADER)):
+            metrics.increment("webhooks.rejected")
+            await self._respond(send, 401, {"error": "Invalid signature"})
+            return
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            await self._respond(send, 400, {"error": "Invalid JSON"})
+            return
+        if not isinstance(payload, dict):
+            await self._respond(send, 400, {"error": "Expected a JSON object"})
+            return
+        kind = self.dispatch(payload)
+        await self._respond(send, 200, {"received": kind})
+
+    @staticmethod
+    async def _respond(send: Send, status: int, body: dict[str, Any]) -> None:
+        content = json.dumps(body).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(content)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": content})
@@ -1,8 +1,21 @@
-from thirdweb_ai.services.engine import Engine
-from thirdweb_ai.services.engine_cloud import EngineCloud
-from thirdweb_ai.services.insight import Insight
-from thirdweb_ai.services.nebula import Nebula
-from thirdweb_ai.services.service import Service
-from thirdweb_ai.services.storage import Storage
+from thirdweb_ai.services.engine import AsyncEngine, Engine
+from thirdweb_ai.services.engine_cloud import AsyncEngineCloud, EngineCloud
+from thirdweb_ai.services.insight import AsyncInsight, Insight
+from thirdweb_ai.services.nebula import AsyncNebula, Nebula
+from thirdweb_ai.services.service import AsyncService, Service
+from thirdweb_ai.services.storage import AsyncStorage, Storage
 
-__all__ = ["Engine", "EngineCloud", "Insight", "Nebula", "Service", "Storage"]
+__all__ = [
+    "AsyncEngine",
+    "AsyncEngineCloud",
+    "AsyncInsight",
+    "AsyncNebula",
+    "AsyncService",
+    "AsyncStorage",
+    "Engine",
+    "EngineCloud",
+    "Insight",
+    "Nebula",
+    "Service",
+    "Storage",
+]
@@ -1,9 +1,70 @@
-from typing import Annotated, Any, Literal
+from collections.abc import Iterable, Sequence
+from typing import Annotated, Any, Literal, NamedTuple
 
+from thirdweb_ai.common.batcher import DEFAULT_READ_BATCH_SIZE, Batcher, contract_call_key, map_batched
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.nonces import NonceManager
+from thirdweb_ai.common.tx_watcher import FINAL_STATUSES, TransactionWatcher
 from thirdweb_ai.common.utils import extract_digits
-from thirdweb_ai.services.service import Service
+from thirdweb_ai.common.webhooks import WebhookReceiver
+from thirdweb_ai.services.service import AsyncService, Service
 from thirdweb_ai.tools.tool import tool
 
+# transactions per send-transaction-batch request
+DEFAULT_TRANSACTION_BATCH_SIZE = 50
+# seconds a transaction waits for others to be sent with it
+DEFAULT_TRANSACTION_BATCH_DELAY = 0.05
+
+TransactionBatcher = Batcher[tuple[int, str | None], dict[str, Any], str]
+
+WebhookEventType = Literal[
+    "queued_transaction",
+    "sent_transaction",
+    "mined_transaction",
+    "errored_transaction",
+    "cancelled_transaction",
+    "all_transactions",
+    "backend_wallet_balance",
+    "auth",
+    "contract_subscription",
+    "wallet_subscription",
+]
+
+# fields of a transaction status returned by wait_for_transactions
+TRANSACTION_STATUS_KEYS = [
+    "queueId",
+    "status",
+    "chainId",
+    "transactionHash",
+    "blockNumber",
+    "minedAt",
+    "errorMessage",
+    "onchainStatus",
+    "deployedContractAddress",
+]
+
+
+class ContractCall(NamedTuple):
+    """A read-only contract function call for :meth:`Engine.read_contracts`."""
+
+    contract_address: str
+    function_name: str
+    args: Sequence[Any] = ()
+
+
+def _read_call(call: ContractCall | tuple[Any, ...] | dict[str, Any]) -> dict[str, Any]:
+    if isinstance(call, dict):
+        payload = {
+            "contractAddress": call.get("contractAddress") or call.get("contract_address"),
+            "functionName": call.get("functionName") or call.get("function_name"),
+            "args": list(call.get("args") or []),
+        }
+        if call.get("functionAbi"):
+            payload["functionAbi"] = call["functionAbi"]
+        return payload
+    contract_address, function_name, *args = call
+    return {"contractAddress": contract_address, "functionName": function_name, "args": list(args[0] if args else [])}
+
 
 class Engine(Service):
     def __init__(
@@ -19,6 +80,12 @@ class Engine(Service):
         self.engine_auth_jwt = engine_auth_jwt
         self.backend_wallet_address = backend_wallet_address
         self.chain_id = chain_id
+        # coalesces send_transaction calls into batch requests, see enable_transaction_batching
+        self.transaction_batcher: TransactionBatcher | None = None
+        # polls the status of submitted transactions until they are final, shared by all callers
+        self.transaction_watcher = TransactionWatcher(self._fetch_transaction_status)
+        # spreads send_transaction calls over a pool of backend wallets, see enable_wallet_pool
+        self.nonce_manager: NonceManager | None = None
 
     def _make_headers(self):
         headers = super()._make_headers()
@@ -135,13 +202,206 @@ class Engine(Service):
         elif chain_id is None:
             raise ValueError("chain_id is required")
 
-        backend_wallet_address = backend_wallet_address or self.backend_wallet_address
+        if self.nonce_manager is not None and backend_wallet_address is None and self._can_wait():
+            queue_id = self.nonce_manager.submit(
+                chain_id, lambda wallet: self._send_transaction(payload, chain_id, wallet)["result"]["queueId"]
+            )
+            return {"result": {"queueId": queue_id}}
+        return self._send_transaction(payload, chain_id, backend_wallet_address or self.backend_wallet_address)
+
+    def _send_transaction(
+        self, payload: dict[str, Any], chain_id: int, backend_wallet_address: str | None
+    ) -> dict[str, Any]:
+        if self.transaction_batcher is not None and self._can_wait():
+            # the batch endpoints take the value in decimal
+            future = self.transaction_batcher.submit(
+                (chain_id, backend_wallet_address), {**payload, "value": str(int(payload["value"], 16))}
+            )
+            return {"result": {"queueId": future.result()}}
         return self._post(
             f"backend-wallet/{chain_id}/send-transaction",
             payload,
             headers={"X-Backend-Wallet-Address": backend_wallet_address},
         )
 
+    @tool(
+        description="Send many on-chain transactions from the same backend wallet at once, e.g. for airdrops or payouts. Returns one queue ID per transaction, in order. With atomic, all transactions are executed in order in a single user operation and either all succeed or all fail; this requires a smart backend wallet."
+    )
+    def send_transaction_batch(
+        self,
+        transactions: Annotated[
+            list[dict[str, str]],
+            "The transactions to send, each with 'toAddress', 'value' in wei (e.g. '1000000000000000000' for 1 ETH, '0' for contract calls) and 'data' (the hexadecimal calldata, '0x' for transfers).",
+        ],
+        chain_id: Annotated[
+            int | None,
+            "The numeric blockchain network ID to send the transactions on (e.g., '1' for Ethereum mainnet, '137' for Polygon). If not provided, uses the default chain ID configured in the Engine instance.",
+        ] = None,
+        backend_wallet_address: Annotated[
+            str | None,
+            "The sender wallet address to use (must be a wallet created through Engine). If not provided, uses the default backend wallet configured in the Engine instance.",
+        ] = None,
+        atomic: Annotated[
+            bool, "Execute all transactions in one user operation, all or nothing. Requires a smart backend wallet."
+        ] = False,
+    ) -> dict[str, Any]:
+        payloads = [
+            {
+                "toAddress": transaction.get("toAddress") or transaction.get("to_address"),
+                "value": str(extract_digits(transaction.get("value") or 0)),
+                "data": transaction.get("data") or "0x",
+            }
+            for transaction in transactions
+        ]
+        queue_ids = self.send_transactions(payloads, chain_id, backend_wallet_address, atomic=atomic)
+        return {"result": {"queueIds": queue_ids}}
+
+    def send_transactions(
+        self,
+        transactions: list[dict[str, Any]],
+        chain_id: int | None = None,
+        backend_wallet_address: str | None = None,
+        atomic: bool = False,
+        max_batch_size: int = DEFAULT_TRANSACTION_BATCH_SIZE,
+    ) -> list[str]:
+        """Send transactions from one backend wallet with batch requests and return their queue IDs in order.
+
+        Args:
+            transactions: Payloads with ``toAddress``, ``value`` in wei as a decimal string and ``data``
+            atomic: Send all transactions in one user operation, which share one queue ID. Requires a smart wallet.
+            max_batch_size: Transactions per request, the requests of a non-atomic send are sent concurrently
+        """
+        if self.chain_id is not None and chain_id is None:
+            chain_id = self.chain_id
+        elif chain_id is None:
+            raise ValueError("chain_id is required")
+        if not transactions:
+            return []
+
+        headers = {"X-Backend-Wallet-Address": backend_wallet_address or self.backend_wallet_address}
+        metrics.increment("engine.transactions_sent", len(transactions), atomic=atomic)
+        if atomic:
+            out = self._post(
+                f"backend-wallet/{chain_id}/send-transaction-batch-atomic", {"transactions": transactions}, headers
+            )
+            return [out["result"]["queueId"]] * len(transactions)
+
+        def send(chunk: list[dict[str, Any]]) -> list[str]:
+            return self._post(f"backend-wallet/{chain_id}/send-transaction-batch", chunk, headers)["result"]["queueIds"]
+
+        chunks = [transactions[i : i + max_batch_size] for i in range(0, len(transactions), max_batch_size)]
+        return [queue_id for queue_ids in self._map(send, chunks) for queue_id in queue_ids]
+
+    def enable_transaction_batching(
+        self,
+        max_batch_size: int = DEFAULT_TRANSACTION_BATCH_SIZE,
+        max_delay: float = DEFAULT_TRANSACTION_BATCH_DELAY,
+        atomic: bool = False,
+    ) -> TransactionBatcher:
+        """Coalesce concurrent ``send_transaction`` calls into batch requests.
+
+        Calls for the same chain and backend wallet made within ``max_delay`` seconds of each other are sent
+        together, up to ``max_batch_size`` at a time, and every caller still gets the queue ID of its own
+        transaction. With ``atomic`` a batch is executed as one user operation: its callers share one queue ID and
+        one caller's failing transaction fails the others. Call ``close()`` on the returned batcher to stop it.
+
+        Example:
+            >>> engine.enable_transaction_batching(max_batch_size=100)
+            >>> list(executor.map(lambda to: engine.send_transaction(to, 10**16, "0x", 137), recipients))
+        """
+        if self.transaction_batcher is not None:
+            self.transaction_batcher.close()
+        self.transaction_batcher = Batcher(
+            lambda key, transactions: self.send_transactions(
+                transactions, *key, atomic=atomic, max_batch_size=max_batch_size
+            ),
+            max_batch_size=max_batch_size,
+            max_delay=max_delay,
+            name="engine.transaction_batcher",
+        )
+        return self.transaction_batcher
+
+    def enable_wallet_pool(
+        self,
+        wallets: Iterable[str],
+        max_in_flight: int | None = None,
+        stuck_after: float = 300,
+    ) -> NonceManager:
+        """Send ``send_transaction`` calls without a backend wallet from the least loaded wallet of a pool.
+
+        The transactions in flight of every wallet are tracked until they are final, so that a busy wallet doesn't
+        delay the others, and ``repair_stalled()`` on the returned manager cancels the nonces of wallets that are
+        stuck. With ``max_in_flight`` a call waits for a wallet with fewer transactions in flight.
+
+        Example:
+            >>> manager = engine.enable_wallet_pool(wallets, max_in_flight=20)
+            >>> list(executor.map(lambda to: engine.send_transaction(to, 10**16, "0x", 137), recipients))
+            >>> manager.repair_stalled(chain_id=137)
+        """
+        self.nonce_manager = NonceManager(
+            self, self.transaction_watcher, wallets, max_in_flight=max_in_flight, stuck_after=stuck_after
+        )
+        return self.nonce_manager
+
+    def get_nonce(self, chain_id: int | None = None, backend_wallet_address: str | None = None) -> int:
+        """Return the last nonce Engine used for a backend wallet."""
+        if self.chain_id is not None and chain_id is None:
+            chain_id = self.chain_id
+        elif chain_id is None:
+            raise ValueError("chain_id is required")
+        wallet = backend_wallet_address or self.backend_wallet_address
+        return int(self._get(f"backend-wallet/{chain_id}/{wallet}/get-nonce")["result"]["nonce"])
+
+    def get_transactions_by_nonce(
+        self,
+        from_nonce: int,
+        to_nonce: int | None = None,
+        chain_id: int | None = None,
+        backend_wallet_address: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return the transactions of a backend wallet by nonce, as ``nonce`` and ``transaction`` (or None) pairs."""
+        if self.chain_id is not None and chain_id is None:
+            chain_id = self.chain_id
+        elif chain_id is None:
+            raise ValueError("chain_id is required")
+        wallet = backend_wallet_address or self.backend_wallet_address
+        params: dict[str, Any] = {"fromNonce": from_nonce}
+        if to_nonce is not None:
+            params["toNonce"] = to_nonce
+        return self._get(f"backend-wallet/{chain_id}/{wallet}/get-transactions-by-nonce", params)["result"]
+
+    def cancel_nonces(
+        self, to_nonce: int, chain_id: int | None = None, backend_wallet_address: str | None = None
+    ) -> list[int]:
+        """Cancel the unmined nonces of a backend wallet up to ``to_nonce`` and return the cancelled ones."""
+        if self.chain_id is not None and chain_id is None:
+            chain_id = self.chain_id
+        elif chain_id is None:
+            raise ValueError("chain_id is required")
+        out = self._post(
+            f"backend-wallet/{chain_id}/cancel-nonces",
+            {"toNonce": to_nonce},
+            headers={"X-Backend-Wallet-Address": backend_wallet_address or self.backend_wallet_address},
+        )
+        return out["result"]["cancelledNonces"]
+
+    def reset_nonces(
+        self, chain_id: int | None = None, backend_wallet_address: str | None = None, sync_onchain: bool = True
+    ) -> dict[str, Any]:
+        """Reset the nonces Engine tracks for a backend wallet, or for all wallets if none is given or configured.
+
+        Args:
+            sync_onchain: Resync the nonce from the chain instead of only clearing it
+        """
+        chain_id = chain_id if chain_id is not None else self.chain_id
+        wallet = backend_wallet_address or self.backend_wallet_address
+        payload: dict[str, Any] = {"syncOnchainNonces": sync_onchain}
+        if chain_id is not None:
+            payload["chainId"] = chain_id
+        if wallet:
+            payload["walletAddress"] = wallet
+        return self._post("backend-wallet/reset-nonces", payload)["result"]
+
     @tool(
         description="Track the current status of a previously submitted transaction. This helps monitor if your transaction is pending, has been successfully mined and confirmed, or has failed. Essential for implementing reliable transaction flows with proper error handling."
     )
@@ -155,6 +415,39 @@ class Engine(Service):
         """Get the status of a transaction by queue ID."""
         return self._get(f"transaction/status/{queue_id}")
 
+    def _fetch_transaction_status(self, queue_id: str) -> dict[str, Any]:
+        return self._get(f"transaction/status/{queue_id}")["result"]
+
+    @tool(
+        description="Wait until transactions submitted through Engine are final (mined, errored or cancelled), or until the timeout passes, and return their statuses. Use this after sending transactions instead of calling get_transaction_status repeatedly."
+    )
+    def wait_for_transactions(
+        self,
+        queue_ids: Annotated[list[str], "The queue IDs returned when the transactions were submitted."],
+        timeout_seconds: Annotated[
+            float,
+            "How long to wait at most, in seconds. Transactions that are not final by then are listed as pending.",
+        ] = 60,
+        chain_id: Annotated[
+            int | None,
+            "The numeric blockchain network ID the transactions were sent on, used to poll about once per block. If not provided, uses the default chain ID configured in the Engine instance.",
+        ] = None,
+    ) -> dict[str, Any]:
+        watcher = self.transaction_watcher
+        # awaited on the event loop when the tool runs asynchronously
+        futures = self._wait(lambda: watcher.watch_all(queue_ids, chain_id or self.chain_id), timeout_seconds)
+        statuses = watcher.results(futures)
+        result = {
+            queue_id: {key: status.get(key) for key in TRANSACTION_STATUS_KEYS} if status else None
+            for queue_id, status in statuses.items()
+        }
+        pending = [
+            queue_id
+            for queue_id, status in statuses.items()
+            if not status or status.get("status") not in FINAL_STATUSES
+        ]
+        return {"result": result, "pending": pending}
+
     @tool(
         description="Call a read-only function on a smart contract to query its current state without modifying the blockchain or spending gas. Perfect for retrieving information like token balances, contract configuration, or any view/pure functions from Solidity contracts."
     )
@@ -189,6 +482,61 @@ class Engine(Service):
 
         return self._get(f"contract/{chain_id}/{contract_address}/read", payload)
 
+    @tool(
+        description="Call many read-only contract functions at once, e.g. all the balances, prices or settings shown on a dashboard. Much faster than calling read_contract repeatedly. Results are returned in the order of the calls, each with 'success' and 'result'."
+    )
+    def read_contract_batch(
+        self,
+        calls: Annotated[
+            list[dict[str, Any]],
+            "The calls to make, each with 'contractAddress', 'functionName' (e.g. 'balanceOf') and 'args' (the ordered list of arguments, empty for functions without parameters).",
+        ],
+        chain_id: Annotated[
+            int | None,
+            "The numeric blockchain network ID where the contracts are deployed (e.g., '1' for Ethereum mainnet, '137' for Polygon). If not provided, uses the default chain ID configured in the Engine instance.",
+        ] = None,
+    ) -> dict[str, Any]:
+        return {"results": self.read_contracts(calls, chain_id)}
+
+    def read_contracts(
+        self,
+        calls: Iterable[ContractCall | tuple[Any, ...] | dict[str, Any]],
+        chain_id: int | None = None,
+        batch_size: int = DEFAULT_READ_BATCH_SIZE,
+        max_concurrency: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Call read-only contract functions with read-batch requests and return their results in order.
+
+        Identical calls are made once. The distinct calls are sent ``batch_size`` at a time, concurrently.
+
+        Args:
+            calls: :class:`ContractCall` tuples of contract address, function name and arguments, or read-batch
+                call payloads
+            max_concurrency: Requests in flight at a time, the tool executor decides if not given
+
+        Returns:
+            One ``{"success": ..., "result": ...}`` per call
+
+        Example:
+            >>> engine.read_contracts([(usdc, "balanceOf", [wallet]) for wallet in wallets], chain_id=1)
+        """
+        if self.chain_id is not None and chain_id is None:
+            chain_id = self.chain_id
+        elif chain_id is None:
+            raise ValueError("chain_id is required")
+
+        def send(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            out = self._post(f"contract/{chain_id}/read-batch", {"calls": batch}, idempotent=True)
+            return out["results"]
+
+        return map_batched(
+            send,
+            [_read_call(call) for call in calls],
+            contract_call_key,
+            batch_size,
+            lambda func, batches: self._map(func, batches, max_concurrency),
+        )
+
     @tool(
         description="Execute a state-changing function on a smart contract by sending a transaction. This allows you to modify on-chain data, such as transferring tokens, minting NFTs, or updating contract configuration. The transaction is automatically signed by your backend wallet and submitted to the blockchain."
     )
@@ -234,3 +582,75 @@ class Engine(Service):
             payload,
             headers={"X-Backend-Wallet-Address": self.backend_wallet_address},
         )
+
+    def create_webhook(self, url: str, event_type: WebhookEventType, name: str | None = None) -> dict[str, Any]:
+        """Create a webhook and return it, including the ``secret`` its notifications are signed with."""
+        payload = {"url": url, "eventType": event_type}
+        if name:
+            payload["name"] = name
+        return self._post("webhooks/create", payload)["result"]
+
+    def revoke_webhook(self, webhook_id: int) -> dict[str, Any]:
+        """Revoke a webhook created with :meth:`create_webhook`, Engine stops sending it notifications."""
+        return self._post("webhooks/revoke", {"id": webhook_id})
+
+    def add_contract_subscription(
+        self,
+        contract_address: str,
+        webhook_id: int,
+        chain_id: int | None = None,
+        filter_events: list[str] | None = None,
+        process_transaction_receipts: bool = False,
+        filter_functions: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """Have Engine notify a webhook of the event logs, and optionally the transaction receipts, of a contract."""
+        if self.chain_id is not None and chain_id is None:
+            chain_id = self.chain_id
+        elif chain_id is None:
+            raise ValueError("chain_id is required")
+        payload: dict[str, Any] = {
+            "chain": str(chain_id),
+            "contractAddress": contract_address,
+            "webhookId": webhook_id,
+            "processEventLogs": True,
+            "processTransactionReceipts": process_transaction_receipts,
+        }
+        if filter_events:
+            payload["filterEvents"] = filter_events
+        if filter_functions:
+            payload["filterFunctions"] = filter_functions
+        return self._post("contract-subscriptions/add", payload)["result"]
+
+    def register_webhook_receiver(
+        self,
+        receiver: WebhookReceiver,
+        url: str,
+        event_type: WebhookEventType = "all_transactions",
+        contracts: Iterable[tuple[int, str]] = (),
+        filter_events: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Register a webhook receiver, served at the public ``url``, with Engine.
+
+        Creates a webhook for transaction notifications of ``event_type`` and, if ``contracts`` are given, one for
+        the event logs of these (chain, address) contracts. The receiver accepts notifications signed with the
+        secrets of the new webhooks, and transaction notifications resolve ``transaction_watcher`` right away
+        instead of at its next poll.
+
+        Returns:
+            The created webhooks
+        """
+        webhooks = [self.create_webhook(url, event_type, name="thirdweb-ai transactions")]
+        contracts = list(contracts)
+        if contracts:
+            webhook = self.create_webhook(url, "contract_subscription", name="thirdweb-ai contract events")
+            webhooks.append(webhook)
+            for chain_id, contract_address in contracts:
+                self.add_contract_subscription(contract_address, webhook["id"], chain_id, filter_events)
+        for webhook in webhooks:
+            receiver.add_secret(webhook["secret"])
+        receiver.add_listener("transaction", self.transaction_watcher.update)
+        return webhooks
+
+
+class AsyncEngine(Engine, AsyncService):
+    """Engine service whose tools can run natively on the event loop."""
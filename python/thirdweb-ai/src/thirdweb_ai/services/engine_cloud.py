@@ -1,7 +1,9 @@
 # At the top of the file, add:
+from collections.abc import Iterable
 from typing import Annotated, Any, Literal, TypedDict
 
-from thirdweb_ai.services.service import Service
+from thirdweb_ai.common.batcher import DEFAULT_READ_BATCH_SIZE, contract_call_key, map_batched
+from thirdweb_ai.services.service import AsyncService, Service
 from thirdweb_ai.tools.tool import tool
 
 
@@ -161,7 +163,59 @@ class EngineCloud(Service):
             ],
         }
 
-        return self._post("read/contract", payload)
+        return self._post("read/contract", payload, idempotent=True)
+
+    @tool(
+        description="Call many read-only contract functions at once, e.g. all the balances, prices or settings shown on a dashboard. Much faster than calling read_contract repeatedly. Results are returned in the order of the calls, each with 'success' and 'result'."
+    )
+    def read_contract_batch(
+        self,
+        calls: Annotated[
+            list[dict[str, Any]],
+            "The calls to make, each with 'contractAddress', 'method' (e.g. 'balanceOf'), 'params' (the ordered list of arguments, empty for functions without parameters) and 'abi' (the ABI of the contract).",
+        ],
+        chain_id: Annotated[
+            int,
+            "The numeric blockchain network ID where the contracts are deployed (e.g., '1' for Ethereum mainnet, '137' for Polygon).",
+        ],
+        from_address: Annotated[str | None, "EVM address in hex format to call the functions from."] = None,
+    ) -> dict[str, Any]:
+        return {"results": self.read_contracts(calls, chain_id, from_address)}
+
+    def read_contracts(
+        self,
+        calls: Iterable[dict[str, Any]],
+        chain_id: int,
+        from_address: str | None = None,
+        multicall_address: str | None = None,
+        batch_size: int = DEFAULT_READ_BATCH_SIZE,
+        max_concurrency: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Call many read-only contract functions and return their results in order.
+
+        Identical calls are made once. The distinct calls are sent ``batch_size`` at a time as the ``params`` of
+        concurrent read requests.
+
+        Args:
+            calls: Read parameters with ``contractAddress``, ``method``, ``params`` and ``abi``
+
+        Returns:
+            One ``{"success": ..., "result": ...}`` per call
+        """
+        read_options = {"multicallAddress": multicall_address, "chainId": chain_id, "from": from_address}
+
+        def send(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+            return self._post("read/contract", {"readOptions": read_options, "params": batch}, idempotent=True)[
+                "result"
+            ]
+
+        return map_batched(
+            send,
+            list(calls),
+            contract_call_key,
+            batch_size,
+            lambda func, batches: self._map(func, batches, max_concurrency),
+        )
 
     @tool(
         description="Fetch the native cryptocurrency balance (e.g., ETH, MATIC) for a given address on a specific blockchain."
@@ -179,7 +233,7 @@ class EngineCloud(Service):
             "address": address,
         }
 
-        return self._post("read/balance", payload)
+        return self._post("read/balance", payload, idempotent=True)
 
     @tool(
         description="Search for transactions with flexible filtering options. Retrieve transaction history with customizable filters for addresses, chains, statuses, and more."
@@ -217,7 +271,7 @@ class EngineCloud(Service):
             "sortDirection": sort_direction,
         }
 
-        return self._post("transactions/search", payload)
+        return self._post("transactions/search", payload, idempotent=True)
 
     @tool(
         description="List all engine server wallets for the current project. Returns an array of EOA addresses with their corresponding predicted smart account addresses."
@@ -229,3 +283,7 @@ class EngineCloud(Service):
             dict containing list of account objects with address and smartAccountAddress
         """
         return self._get("accounts")
+
+
+class AsyncEngineCloud(EngineCloud, AsyncService):
+    """EngineCloud service whose tools can run natively on the event loop."""
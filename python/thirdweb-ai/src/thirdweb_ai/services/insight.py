@@ -1,29 +1,160 @@
-from typing import Annotated, Any, Literal
+import heapq
+import itertools
+import json
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Sequence
+from concurrent.futures import as_completed
+from typing import Annotated, Any, ClassVar, Literal
 
+import httpx
+
+from thirdweb_ai.common.abi import DEFAULT_BATCH_SIZE, AbiRegistry, DecodeKind
 from thirdweb_ai.common.address import (
     validate_address,
     validate_block_identifier,
     validate_signature,
     validate_transaction_hash,
 )
-from thirdweb_ai.common.utils import EVENT_KEYS_TO_KEEP, TRANSACTION_KEYS_TO_KEEP, clean_resolve, filter_response_keys
-from thirdweb_ai.services.service import Service
+from thirdweb_ai.common.backfill import (
+    DEFAULT_SHARD_SIZE,
+    Backfill,
+    BackfillCheckpoint,
+    Shard,
+    ShardFetcher,
+    make_job_id,
+)
+from thirdweb_ai.common.block_index import BlockIndex, parse_time
+from thirdweb_ai.common.cache import CacheEntry, headers_digest
+from thirdweb_ai.common.event_store import ALL_TOPICS, EventStore
+from thirdweb_ai.common.fanout import MAX_CHAINS_PER_REQUEST, afan_out, chain_groups, fan_out, sort_value
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.pagination import DEFAULT_PAGE_SIZE, Item, apaginate, paginate
+from thirdweb_ai.common.portfolio import BalanceRequest, BalanceUpdate, Portfolio, TokenType
+from thirdweb_ai.common.query import EventQuery
+from thirdweb_ai.common.selector_db import SelectorDatabase, default_selectors
+from thirdweb_ai.common.utils import (
+    EVENT_KEYS_TO_KEEP,
+    TRANSACTION_KEYS_TO_KEEP,
+    clean_resolve,
+    filter_response_keys,
+    normalize_chain_id,
+)
+from thirdweb_ai.services.service import AsyncService, Service
+from thirdweb_ai.tools.executor import get_tool_executor
 from thirdweb_ai.tools.tool import tool
 
+SortField = Literal["block_number", "block_timestamp"]
+
+# resolve requests in flight at a time for a bulk lookup
+DEFAULT_RESOLVE_CONCURRENCY = 8
+
+# items per page of the paginated tools, the API default
+TOOL_PAGE_SIZE = 20
+
+# token addresses per price request, keeps the query string well below common URL length limits
+MAX_TOKENS_PER_PRICE_REQUEST = 50
+
+
+def _resolved_signatures(out: dict[str, Any]) -> list[str]:
+    """Return the signatures of the decoded transactions and events of a resolve response."""
+    data = out.get("data") or {}
+    items = [*(data.get("transactions") or []), *(data.get("events") or [])]
+    decoded = (item.get("decoded") or item.get("decodedData") or {} for item in items)
+    return list(dict.fromkeys(d["signature"] for d in decoded if d.get("signature")))
+
+
+# resolves transaction hashes, block hashes and event topics, which are only final once they are found on chain
+_RESOLVE_HASH = "resolve/0x" + "?" * 64
+
+
+def _is_final(endpoint: str, body: Any) -> bool:
+    """Whether a response can't change anymore, so that it may be kept in the persistent cache."""
+    data = body.get("data") if isinstance(body, dict) else body
+    if not data:
+        # not found, or not indexed yet
+        return False
+    if endpoint != _RESOLVE_HASH:
+        return True
+    if not isinstance(data, dict):
+        return False
+    transactions = data.get("transactions") or []
+    mined = any(transaction.get("block_number") is not None for transaction in transactions)
+    return mined or bool(data.get("blocks")) or bool(_resolved_signatures(body))
+
+
+def _validate_identifier(identifier: str) -> str:
+    """Validate and normalize an identifier the resolve endpoint accepts."""
+    identifier = identifier.strip()
+    if identifier.startswith("0x") and len(identifier) == 42:
+        return validate_address(identifier)
+    if identifier.startswith("0x") and len(identifier) == 66:
+        return validate_transaction_hash(identifier).lower()
+    if identifier.isdigit():
+        return identifier
+    if "." in identifier and not identifier.startswith(".") and " " not in identifier:
+        return identifier.lower()
+    raise ValueError(f"Invalid transaction hash, block, address or ENS name: {identifier}")
+
+
+def _price_cache_key(key: tuple[int, str], timestamp: int | None, scope: str) -> str:
+    chain_id, address = key
+    return f"price {chain_id} {address} {timestamp or 'latest'} {scope}"
+
 
 class Insight(Service):
+    cache_ttls: ClassVar[dict[str, float]] = {
+        "contracts/abi/*": 3600,
+        "contracts/metadata/*": 3600,
+        # function selectors and event topics always resolve to the same signature
+        "resolve/0x????????": 86400,
+        _RESOLVE_HASH: 300,
+        "tokens/price": 15,
+    }
+    # how long the price of a token is kept, prices at a timestamp never change
+    price_ttl: ClassVar[float] = 15
+    historical_price_ttl: ClassVar[float] = 86400
+    persistent_cache_ttls: ClassVar[dict[str, float]] = {
+        "contracts/abi/*": 7 * 86400,
+        "contracts/metadata/*": 7 * 86400,
+        "resolve/0x????????": 30 * 86400,
+        # only responses that can't change anymore, see _cache_set
+        _RESOLVE_HASH: 30 * 86400,
+    }
+
     def __init__(self, secret_key: str, chain_id: int | list[int] | None = None):
         super().__init__(base_url="https://insight.thirdweb.com/v1", secret_key=secret_key)
-        self.chain_ids = [chain_id or 1]
+        chain_ids = normalize_chain_id(chain_id) or 1
+        self.chain_ids: list[int] = chain_ids if isinstance(chain_ids, list) else [chain_ids]
+        # contract events synced with sync_events are answered from this store while they are fresh
+        self.event_store: EventStore | None = None
+        self.event_store_max_age = 30.0
+        # ABIs fetched to decode events and transactions locally, set processes to decode large batches in parallel
+        self.abi_registry = AbiRegistry(lambda chain, address: self.get_abi(address, chain))
+        # selectors and topics found here are decoded without a request, set to None to always ask the API
+        self.selector_database: SelectorDatabase | None = default_selectors
+        # block timestamps seen so far, to translate since/until windows into block ranges
+        self.block_index = BlockIndex(self._fetch_blocks)
+
+    def _cache_set(self, entries: list[CacheEntry], response: httpx.Response) -> None:
+        persistent = [entry for entry in entries if entry.tier == "persistent"]
+        if persistent:
+            try:
+                final = all(_is_final(entry.endpoint, response.json()) for entry in persistent)
+            except ValueError:
+                final = False
+            if not final:
+                # e.g. a transaction that is not indexed yet, it is only kept in memory and looked up again later
+                entries = [entry for entry in entries if entry.tier != "persistent"]
+        super()._cache_set(entries, response)
 
     @tool(
-        description="Retrieve blockchain events with flexible filtering options. Use this to search for specific events or to analyze event patterns across multiple blocks. Do not use this tool to simply look up a single transaction."
+        description="Retrieve blockchain events with flexible filtering options. Use this to search for specific events or to analyze event patterns across multiple blocks. Filters and aggregations are applied by the API: to answer questions like 'how many transfers per day', use group_by and aggregate instead of fetching pages of events. Do not use this tool to simply look up a single transaction."
     )
     def get_events(
         self,
         chain_id: Annotated[
             list[int] | int | None,
-            "Chain ID(s) to query (e.g., 1 for Ethereum Mainnet, 137 for Polygon). Specify multiple IDs as a list [1, 137] for cross-chain queries (max 5).",
+            "Chain ID(s) to query (e.g., 1 for Ethereum Mainnet, 137 for Polygon). Specify multiple IDs as a list [1, 137] for cross-chain queries, aggregations cover at most 5 chains.",
         ] = None,
         contract_address: Annotated[
             str | None,
@@ -33,26 +164,65 @@ class Insight(Service):
             str | None,
             "Specific transaction hash to filter events by (e.g., '0xabc123...'). Useful for examining events in a particular transaction.",
         ] = None,
+        topics: Annotated[
+            list[str | None] | None,
+            "Topic filters by position, up to 4. The first topic is the event signature hash (e.g., '0xddf252ad...' for Transfer), the others are indexed parameters padded to 32 bytes. Use null to skip a position.",
+        ] = None,
+        from_block: Annotated[int | None, "Only return events from this block number on (inclusive)."] = None,
+        to_block: Annotated[int | None, "Only return events up to this block number (inclusive)."] = None,
+        from_timestamp: Annotated[
+            int | None, "Only return events of blocks from this Unix timestamp in seconds on (inclusive)."
+        ] = None,
+        to_timestamp: Annotated[
+            int | None, "Only return events of blocks up to this Unix timestamp in seconds (inclusive)."
+        ] = None,
+        group_by: Annotated[
+            list[str] | None,
+            "Fields or expressions to group events by before aggregating, e.g. ['toStartOfDay(block_timestamp) AS day'] or ['address'].",
+        ] = None,
+        aggregate: Annotated[
+            list[str] | None,
+            "Aggregations computed by the API over the matching events, e.g. ['count() AS count']. Only the aggregations are returned, not the events.",
+        ] = None,
+        since: Annotated[
+            str | None,
+            "Only return events from this time on (inclusive): an ISO 8601 date/time, a Unix timestamp, or a duration ago such as '24h' or '7d'.",
+        ] = None,
+        until: Annotated[
+            str | None,
+            "Only return events up to this time (inclusive): an ISO 8601 date/time, a Unix timestamp, or a duration ago such as '1h'.",
+        ] = None,
         page: Annotated[
             int | None,
             "Page number for paginated results, starting from 0. 20 results are returned per page.",
         ] = None,
     ) -> dict[str, Any]:
-        params: dict[str, Any] = {
-            "sort_by": "block_number",
-            "sort_order": "desc",
-            "decode": True,
-        }
-        chain_ids = chain_id if chain_id is not None else self.chain_ids
-        if chain_ids:
-            params["chain"] = chain_ids
-        if contract_address:
-            params["filter_address"] = validate_address(contract_address)
-        if transaction_hash:
-            params["filter_transaction_hash"] = validate_transaction_hash(transaction_hash)
-        if page:
-            params["page"] = page
-        out = self._get("events", params)
+        base = self._event_query(chain_id, contract_address, transaction_hash)
+        query = base
+        for index, topic in enumerate((topics or [])[:4]):
+            if topic:
+                query = query.with_topic(index, topic)
+        window = self._time_window_params(chain_id, since, until, from_block, to_block)
+        query = (
+            query.blocks(window.get("filter_block_number_gte"), window.get("filter_block_number_lte"))
+            .between(
+                window.get("filter_block_timestamp_gte", from_timestamp),
+                window.get("filter_block_timestamp_lte", to_timestamp),
+            )
+            .grouped_by(*(group_by or []))
+            .aggregated(*(aggregate or []))
+        )
+        aggregated = bool(query.group_by or query.aggregate)
+        if aggregated and len(set(query.chain_ids)) > MAX_CHAINS_PER_REQUEST:
+            raise ValueError(f"Aggregations cover at most {MAX_CHAINS_PER_REQUEST} chains")
+        # the event store only answers queries without further filters
+        out = self._events_from_store(chain_id, contract_address, transaction_hash, page) if query == base else None
+        if out is None:
+            out = self._get_page("events", query.to_params(), page)
+        if aggregated:
+            # the aggregations are the answer, the raw events would only fill the context
+            out.pop("data", None)
+            return out
         out["data"] = filter_response_keys(out["data"], EVENT_KEYS_TO_KEEP)
         return out
 
@@ -67,26 +237,29 @@ class Insight(Service):
         ],
         chain_id: Annotated[
             list[int] | int | None,
-            "Chain ID(s) to query (e.g., 1 for Ethereum Mainnet, 137 for Polygon). Specify multiple IDs as a list for cross-chain queries (max 5).",
+            "Chain ID(s) to query (e.g., 1 for Ethereum Mainnet, 137 for Polygon). Specify multiple IDs as a list for cross-chain queries.",
+        ] = None,
+        since: Annotated[
+            str | None,
+            "Only return events from this time on (inclusive): an ISO 8601 date/time, a Unix timestamp, or a duration ago such as '24h' or '7d'.",
+        ] = None,
+        until: Annotated[
+            str | None,
+            "Only return events up to this time (inclusive): an ISO 8601 date/time, a Unix timestamp, or a duration ago such as '1h'.",
         ] = None,
         page: Annotated[
             int | None,
             "Page number for paginated results, starting from 0. 20 results are returned per page.",
         ] = None,
     ) -> dict[str, Any]:
-        params: dict[str, Any] = {
-            "sort_by": "block_number",
-            "sort_order": "desc",
-            "decode": True,
-        }
-        chain_ids = chain_id if chain_id is not None else self.chain_ids
-        if chain_ids:
-            params["chain"] = chain_ids
-        if page:
-            params["page"] = page
-
-        contract_address = validate_address(contract_address)
-        return self._get(f"events/{contract_address}", params)
+        # the event store only answers queries without further filters
+        windowed = since is not None or until is not None
+        out = None if windowed else self._events_from_store(chain_id, contract_address, page=page)
+        if out is not None:
+            return out
+        path, params = self._contract_events_query(contract_address, chain_id)
+        params.update(self._time_window_params(chain_id, since, until))
+        return self._get_page(path, params, page)
 
     @tool(
         description="Retrieve blockchain transactions with flexible filtering options. Use this to find transactions from or to an address, or between two addresses."
@@ -105,26 +278,22 @@ class Insight(Service):
             str | None,
             "Filter transactions sent to this address (e.g., '0x1234...'). Useful for tracking incoming transactions to a contract or wallet.",
         ] = None,
+        since: Annotated[
+            str | None,
+            "Only return transactions from this time on (inclusive): an ISO 8601 date/time, a Unix timestamp, or a duration ago such as '24h' or '7d'.",
+        ] = None,
+        until: Annotated[
+            str | None,
+            "Only return transactions up to this time (inclusive): an ISO 8601 date/time, a Unix timestamp, or a duration ago such as '1h'.",
+        ] = None,
         page: Annotated[
             int | None,
             "Page number for paginated results, starting from 0. 20 results are returned per page.",
         ] = None,
     ) -> dict[str, Any]:
-        params: dict[str, Any] = {
-            "sort_by": "block_number",
-            "decode": True,
-        }
-        chain_ids = chain_id if chain_id is not None else self.chain_ids
-        if chain_ids:
-            params["chain"] = chain_ids
-        if from_address:
-            params["filter_from_address"] = validate_address(from_address)
-        if to_address:
-            params["filter_to_address"] = validate_address(to_address)
-        if page:
-            params["page"] = page
-
-        out = self._get("transactions", params)
+        path, params = self._transactions_query(chain_id, from_address, to_address)
+        params.update(self._time_window_params(chain_id, since, until))
+        out = self._get_page(path, params, page)
         out["data"] = filter_response_keys(out["data"], TRANSACTION_KEYS_TO_KEEP)
         return out
 
@@ -153,6 +322,31 @@ class Insight(Service):
         owner_address = validate_address(owner_address)
         return self._get(f"tokens/{token_type.lower()}/{owner_address}", params)
 
+    @tool(
+        description="Get the aggregated, USD-valued token holdings of several wallets across several chains in one call. Use this instead of calling get_address_tokens for every wallet and chain, e.g. for treasury or portfolio questions."
+    )
+    def get_portfolio(
+        self,
+        owner_addresses: Annotated[
+            list[str],
+            "The wallet addresses whose holdings are combined (e.g., ['0x1234...', '0x5678...']).",
+        ],
+        chain_id: Annotated[
+            list[int] | int | None,
+            "Chain ID(s) to include (e.g., [1, 137, 8453]). Any number of chains can be given.",
+        ] = None,
+        token_types: Annotated[
+            list[Literal["erc20", "erc721", "erc1155"]] | None,
+            "Token types to include, erc20 by default. Only erc20 tokens are valued.",
+        ] = None,
+        max_positions: Annotated[
+            int | None,
+            "Only list this many of the most valuable positions. Totals always cover all positions.",
+        ] = 50,
+    ) -> dict[str, Any]:
+        portfolio = self.build_portfolio(owner_addresses, chain_id, token_types or ["erc20"])
+        return portfolio.to_dict(max_positions)
+
     @tool(
         description="Get current market prices for native and ERC20 tokens. Useful for valuation, tracking portfolio value, or monitoring price changes."
     )
@@ -166,13 +360,83 @@ class Insight(Service):
             list[int] | int | None,
             "Chain ID(s) where the tokens exist (e.g., 1 for Ethereum, 137 for Polygon). Must match the token network.",
         ] = None,
+        timestamp: Annotated[
+            int | None,
+            "Unix timestamp (in seconds) to get historical prices at. Omit for current prices.",
+        ] = None,
     ) -> dict[str, Any]:
-        token_addresses = [validate_address(addr) for addr in token_addresses]
-        params: dict[str, Any] = {"address": token_addresses}
-        chain_ids = chain_id if chain_id is not None else self.chain_ids
-        if chain_ids:
-            params["chain"] = chain_ids
-        return self._get("tokens/price", params)
+        return {"data": self.get_prices(token_addresses, chain_id, timestamp)}
+
+    def get_prices(
+        self, token_addresses: Iterable[str], chain_id: list[int] | int | None = None, timestamp: int | None = None
+    ) -> list[Item]:
+        """Get the prices of any number of tokens on any number of chains.
+
+        Addresses are deduplicated and the price of every (chain, token) is cached for :attr:`price_ttl` seconds,
+        or :attr:`historical_price_ttl` seconds for prices at a ``timestamp``. The remaining tokens are requested in
+        chunks of :data:`MAX_TOKENS_PER_PRICE_REQUEST`, concurrently.
+
+        Args:
+            token_addresses: Token addresses, ``0xeeee...eeee`` for native tokens
+            chain_id: Chain ID(s) of the tokens, defaults to the chains of the service
+            timestamp: Unix timestamp in seconds to get historical prices at, current prices if None
+
+        Returns:
+            The prices found, ordered like the tokens and then the chains
+        """
+        addresses = list(dict.fromkeys(validate_address(address) for address in dict.fromkeys(token_addresses)))
+        chains = self._chain_params(chain_id).get("chain", [])
+        chain_ids: list[int] = [chains] if isinstance(chains, int) else list(chains)
+        return self.get_prices_for([(chain, address) for address in addresses for chain in chain_ids], timestamp)
+
+    def get_prices_for(self, tokens: Iterable[tuple[int, str]], timestamp: int | None = None) -> list[Item]:
+        """Get the prices of (chain ID, token address) pairs, like :meth:`get_prices`.
+
+        Unlike :meth:`get_prices`, every token is only looked up on its own chain.
+        """
+        addresses: dict[str, str] = {}
+        keys: list[tuple[int, str]] = []
+        for chain, address in tokens:
+            if address not in addresses:
+                addresses[address] = validate_address(address)
+            keys.append((chain, addresses[address].lower()))
+        keys = list(dict.fromkeys(keys))
+        checksummed = {address.lower(): address for address in addresses.values()}
+
+        cache = self._memo_cache()
+        # like cached responses, prices are kept apart per secret key
+        scope = headers_digest(self._make_headers())
+        prices: dict[tuple[int, str], list[Item]] = {}
+        for key in keys:
+            if cache is not None and (body := cache.get(_price_cache_key(key, timestamp, scope))) is not None:
+                prices[key] = json.loads(body)
+        missing = [key for key in keys if key not in prices]
+        metrics.increment("prices.cached", len(keys) - len(missing))
+
+        requests: list[tuple[list[int], list[str]]] = []
+        for group in chain_groups([chain for chain, _ in missing]):
+            group_addresses = [checksummed[address] for address in dict.fromkeys(a for c, a in missing if c in group)]
+            chunk = MAX_TOKENS_PER_PRICE_REQUEST
+            requests.extend((group, group_addresses[i : i + chunk]) for i in range(0, len(group_addresses), chunk))
+
+        def fetch(request: tuple[list[int], list[str]]) -> list[Item]:
+            params: dict[str, Any] = {"chain": request[0], "address": request[1]}
+            if timestamp is not None:
+                params["timestamp"] = timestamp
+            return self._get("tokens/price", params)["data"]
+
+        fetched: dict[tuple[int, str], list[Item]] = {key: [] for key in missing}
+        for items in self._map(fetch, requests):
+            for item in items:
+                key = (int(item["chain_id"]), str(item["address"]).lower())
+                if key in fetched:
+                    fetched[key].append(item)
+        if cache is not None:
+            ttl = self.price_ttl if timestamp is None else self.historical_price_ttl
+            for key, items in fetched.items():
+                cache.set(_price_cache_key(key, timestamp, scope), json.dumps(items).encode(), ttl)
+        prices.update(fetched)
+        return [item for key in keys for item in prices.get(key, [])]
 
     @tool(
         description="Get metadata about a smart contract, including name, symbol, decimals, and other contract-specific information. Also returns the contract ABI which details how to interact with the contract. Use this when asked about a contract's functions, interface, or capabilities. This tool specifically retrieves details about deployed smart contracts (NOT regular wallet addresses or transaction hashes)."
@@ -246,17 +510,8 @@ class Insight(Service):
             "Page number for paginated results, starting from 0. 20 results are returned per page.",
         ] = None,
     ) -> dict[str, Any]:
-        params = {}
-        chain_ids = chain_id if chain_id is not None else self.chain_ids
-        if chain_ids:
-            params["chain"] = chain_ids
-        if page:
-            params["page"] = page
-
-        contract_address = validate_address(contract_address)
-        if token_id:
-            return self._get(f"nfts/owners/{contract_address}/{token_id}", params)
-        return self._get(f"nfts/owners/{contract_address}", params)
+        path, params = self._nft_query("owners", contract_address, token_id, chain_id)
+        return self._get_page(path, params, page)
 
     @tool(
         description="Track NFT transfers for a collection, specific token, or transaction. Useful for monitoring NFT trading activity or verifying transfers."
@@ -284,19 +539,10 @@ class Insight(Service):
             "Page number for paginated results, starting from 0. Use with limit parameter for browsing transfer history.",
         ] = None,
     ) -> dict[str, Any]:
-        params = {}
-        chain_ids = chain_id if chain_id is not None else self.chain_ids
-        if chain_ids:
-            params["chain"] = chain_ids
+        path, params = self._nft_query("transfers", contract_address, token_id, chain_id)
         if limit:
             params["limit"] = limit
-        if page:
-            params["page"] = page
-
-        contract_address = validate_address(contract_address)
-        if token_id:
-            return self._get(f"nfts/transfers/{contract_address}/{token_id}", params)
-        return self._get(f"nfts/transfers/{contract_address}", params)
+        return self._get_page(path, params, page)
 
     @tool(
         description="Get detailed information about a specific block by its number or hash. Use this when asked about blockchain blocks (e.g., 'What's in block 12345678?' or 'Tell me about this block: 0xabc123...'). This tool is specifically for block data, NOT transactions, addresses, or contracts."
@@ -387,6 +633,66 @@ class Insight(Service):
         out = self._get(f"resolve/{transaction_hash}", params)
         return clean_resolve(out)
 
+    @tool(
+        description="Look up many transaction hashes, block numbers or hashes, addresses and ENS names in one call. Use this instead of calling get_transaction_details, get_block_details, get_address_transactions or get_ens_transactions repeatedly, e.g. for all transactions of a report. Results are returned in the order of the inputs, inputs that cannot be resolved get an error instead."
+    )
+    def resolve_many(
+        self,
+        identifiers: Annotated[
+            list[str],
+            "Transaction hashes, block numbers, block hashes, addresses or ENS names to look up, in any mix (e.g., ['0x5407ea41...', 'vitalik.eth', '19000000']).",
+        ],
+        chain_id: Annotated[
+            list[int] | int | None,
+            "Chain ID(s) to query (e.g., 1 for Ethereum).",
+        ] = None,
+    ) -> dict[str, Any]:
+        return {"data": self.resolve_identifiers(identifiers, chain_id)}
+
+    def resolve_identifiers(
+        self,
+        identifiers: Iterable[str],
+        chain_id: list[int] | int | None = None,
+        max_concurrency: int = DEFAULT_RESOLVE_CONCURRENCY,
+    ) -> list[dict[str, Any]]:
+        """Resolve many identifiers concurrently, like the single-identifier lookup tools.
+
+        Identifiers are validated and deduplicated, each distinct one is resolved once with at most
+        ``max_concurrency`` requests in flight, and cached responses are used without a request.
+
+        Returns:
+            One result per identifier, in input order: ``{"input": ..., "data": ...}`` or, if the identifier is
+            invalid or could not be resolved, ``{"input": ..., "error": ...}``
+        """
+        identifiers = list(identifiers)
+        normalized: dict[str, str | ValueError] = {}
+        for identifier in identifiers:
+            if identifier not in normalized:
+                try:
+                    normalized[identifier] = _validate_identifier(identifier)
+                except ValueError as e:
+                    normalized[identifier] = e
+        params = self._chain_params(chain_id)
+
+        def resolve(identifier: str) -> dict[str, Any]:
+            try:
+                return clean_resolve(self._get(f"resolve/{identifier}", params))
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                # also malformed responses, one bad item must not fail the others
+                return {"error": f"{type(e).__name__}: {e}"}
+
+        unique = list(dict.fromkeys(value for value in normalized.values() if isinstance(value, str)))
+        resolved = dict(zip(unique, self._map(resolve, unique, max_concurrency), strict=True))
+        metrics.increment("resolve.identifiers", len(identifiers))
+        metrics.increment("resolve.deduplicated", len(identifiers) - len(unique))
+
+        results: list[dict[str, Any]] = []
+        for identifier in identifiers:
+            value = normalized[identifier]
+            outcome = {"error": str(value)} if isinstance(value, ValueError) else resolved[value]
+            results.append({"input": identifier, **outcome})
+        return results
+
     @tool(
         description="Decode a function or event signature. Use this when you need to understand what a specific function selector or event signature does and what parameters it accepts."
     )
@@ -407,5 +713,734 @@ class Insight(Service):
             params["chain"] = chain_ids
 
         signature = validate_signature(signature)
+        if signatures := self._local_signatures(signature):
+            # shaped like the resolve response, which keeps the decoded data of each match
+            function = len(signature) == 10
+            matches = [{"decodedData": {"name": s.split("(", 1)[0], "signature": s}} for s in signatures]
+            data: dict[str, Any] = {"type": "function_signature" if function else "event_signature"}
+            data["transactions" if function else "events"] = matches
+            return {"data": data, "meta": {"source": "selector_database"}}
         out = self._get(f"resolve/{signature}", params)
         return clean_resolve(out)
+
+    def _local_signatures(self, signature: str) -> list[str]:
+        if self.selector_database is None or not signature.startswith("0x"):
+            return []
+        signatures = self.selector_database.lookup(signature)
+        metrics.increment("selectors.lookups", hit=bool(signatures))
+        return signatures
+
+    def decode_signatures(self, signatures: Iterable[str], chain_id: int | None = None) -> dict[str, list[str]]:
+        """Decode many function selectors and event topics at once.
+
+        Selectors and topics of :attr:`selector_database` are decoded locally, the others are resolved by the API
+        concurrently.
+
+        Returns:
+            The text signatures of every selector and topic, an empty list for those that could not be decoded
+
+        Example:
+            >>> insight.decode_signatures(["0xa9059cbb", "0x095ea7b3"])
+            {'0xa9059cbb': ['transfer(address,uint256)'], '0x095ea7b3': ['approve(address,uint256)']}
+        """
+        selectors = [validate_signature(signature) for signature in dict.fromkeys(signatures)]
+        decoded = {selector: self._local_signatures(selector) for selector in selectors}
+        missing = [selector for selector, found in decoded.items() if not found]
+        params = self._chain_params(chain_id)
+
+        def resolve(selector: str) -> list[str]:
+            return _resolved_signatures(self._get(f"resolve/{selector}", params))
+
+        decoded.update(zip(missing, self._map(resolve, missing), strict=True))
+        return decoded
+
+    def _chain_params(self, chain_id: list[int] | int | None) -> dict[str, Any]:
+        chain_ids = chain_id if chain_id is not None else self.chain_ids
+        return {"chain": chain_ids} if chain_ids else {}
+
+    @staticmethod
+    def _block_range_params(from_block: int | None, to_block: int | None) -> dict[str, Any]:
+        params: dict[str, Any] = {}
+        if from_block is not None:
+            params["filter_block_number_gte"] = from_block
+        if to_block is not None:
+            params["filter_block_number_lte"] = to_block
+        return params
+
+    def _fetch_blocks(self, chain_id: int, params: dict[str, Any]) -> list[Item]:
+        return self._get("blocks", {"chain": chain_id, **params})["data"]
+
+    def _time_window_params(
+        self,
+        chain_id: list[int] | int | None,
+        since: str | None,
+        until: str | None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+    ) -> dict[str, Any]:
+        """Translate a time window into block number filters, narrowed further by ``from_block`` and ``to_block``.
+
+        The blocks of a single chain are looked up in ``block_index``. Block numbers differ per chain, so a window
+        over several chains, or a side of the window no block falls into yet, is filtered by block timestamp.
+        """
+        params = self._block_range_params(from_block, to_block)
+        if since is None and until is None:
+            return params
+        now = time.time()
+        start = parse_time(since, now) if since is not None else None
+        end = parse_time(until, now) if until is not None else None
+        chain_ids = self._chain_params(chain_id).get("chain")
+        if isinstance(chain_ids, list) and len(chain_ids) == 1:
+            chain_ids = chain_ids[0]
+        first = last = None
+        if isinstance(chain_ids, int):
+            first, last = self.block_index.block_range(chain_ids, start, end, local=self._memoize())
+        if first is not None:
+            params["filter_block_number_gte"] = max(first, from_block or 0)
+        elif start is not None:
+            params["filter_block_timestamp_gte"] = start
+        if last is not None:
+            params["filter_block_number_lte"] = last if to_block is None else min(last, to_block)
+        elif end is not None:
+            params["filter_block_timestamp_lte"] = end
+        return params
+
+    def _event_query(
+        self,
+        chain_id: list[int] | int | None = None,
+        contract_address: str | None = None,
+        transaction_hash: str | None = None,
+    ) -> EventQuery:
+        chain_ids = self._chain_params(chain_id).get("chain", [])
+        query = EventQuery(chain_ids=tuple(chain_ids) if isinstance(chain_ids, list) else (chain_ids,))
+        if contract_address:
+            query = query.emitted_by(contract_address)
+        if transaction_hash:
+            query = query.in_transaction(transaction_hash)
+        return query
+
+    def _events_query(
+        self,
+        chain_id: list[int] | int | None = None,
+        contract_address: str | None = None,
+        transaction_hash: str | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        sort_by: SortField = "block_number",
+    ) -> tuple[str, dict[str, Any]]:
+        query = self._event_query(chain_id, contract_address, transaction_hash).sorted(sort_by, sort_order)
+        return "events", query.to_params()
+
+    def _contract_events_query(
+        self,
+        contract_address: str,
+        chain_id: list[int] | int | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        sort_by: SortField = "block_number",
+    ) -> tuple[str, dict[str, Any]]:
+        params: dict[str, Any] = {
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "decode": True,
+            **self._chain_params(chain_id),
+        }
+        return f"events/{validate_address(contract_address)}", params
+
+    def _transactions_query(
+        self,
+        chain_id: list[int] | int | None = None,
+        from_address: str | None = None,
+        to_address: str | None = None,
+        sort_order: Literal["asc", "desc"] | None = None,
+        sort_by: SortField = "block_number",
+    ) -> tuple[str, dict[str, Any]]:
+        params: dict[str, Any] = {
+            "sort_by": sort_by,
+            "decode": True,
+            **self._chain_params(chain_id),
+        }
+        if sort_order:
+            params["sort_order"] = sort_order
+        if from_address:
+            params["filter_from_address"] = validate_address(from_address)
+        if to_address:
+            params["filter_to_address"] = validate_address(to_address)
+        return "transactions", params
+
+    def _nft_query(
+        self,
+        kind: Literal["owners", "transfers"],
+        contract_address: str,
+        token_id: str | None = None,
+        chain_id: list[int] | int | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        path = f"nfts/{kind}/{validate_address(contract_address)}"
+        if token_id:
+            path = f"{path}/{token_id}"
+        return path, self._chain_params(chain_id)
+
+    @staticmethod
+    def _fan_out_chains(params: dict[str, Any]) -> list[int] | None:
+        """Return the chains of a query that has to be split over several requests, if any."""
+        chains = params.get("chain")
+        if isinstance(chains, list) and len(set(chains)) > MAX_CHAINS_PER_REQUEST:
+            return chains
+        return None
+
+    def _get_page(self, path: str, params: dict[str, Any], page: int | None = None) -> dict[str, Any]:
+        """Fetch a page of a paginated tool, merged from one request per group of chains if one can't cover them all."""
+        if (chains := self._fan_out_chains(params)) is None:
+            return self._get(path, {**params, "page": page} if page else params)
+        page_size = params.get("limit") or TOOL_PAGE_SIZE
+        offset = (page or 0) * page_size
+
+        def fetch(group: list[int]) -> list[Item]:
+            # the page is within the first offset + page_size items of every group
+            return self._get(path, {**params, "chain": group, "limit": offset + page_size})["data"]
+
+        groups = self._map(fetch, chain_groups(chains))
+        if (sort_by := params.get("sort_by")) is None:
+            merged = itertools.chain.from_iterable(groups)
+        else:
+            descending = params.get("sort_order", "desc") == "desc"
+            merged = heapq.merge(*groups, key=lambda item: sort_value(item, sort_by), reverse=descending)
+        data = list(itertools.islice(merged, offset, offset + page_size))
+        return {"data": data, "meta": {"page": page or 0, "limit": page_size, "chain_ids": chains}}
+
+    def _iter_pages(self, path: str, params: dict[str, Any], prefetch: bool = True, **kwargs: Any) -> Iterator[Item]:
+        if (chains := self._fan_out_chains(params)) is not None:
+
+            def fetch_group(chain_ids: list[int], page: int, limit: int) -> list[Item]:
+                return self._get(path, {**params, "chain": chain_ids, "page": page, "limit": limit})["data"]
+
+            descending = params.get("sort_order", "desc") == "desc"
+            return fan_out(fetch_group, chains, sort_by=params.get("sort_by"), descending=descending, **kwargs)
+
+        def fetch_page(page: int, limit: int) -> list[Item]:
+            return self._get(path, {**params, "page": page, "limit": limit})["data"]
+
+        return paginate(fetch_page, prefetch=prefetch, **kwargs)
+
+    def _iter_decoded(
+        self, kind: DecodeKind, path: str, params: dict[str, Any], decode_locally: bool, **kwargs: Any
+    ) -> Iterator[Item]:
+        if not decode_locally:
+            return self._iter_pages(path, params, **kwargs)
+        items = self._iter_pages(path, {**params, "decode": False}, **kwargs)
+        return self.abi_registry.decode_stream(items, kind, batch_size=kwargs.get("limit", DEFAULT_PAGE_SIZE))
+
+    def iter_events(
+        self,
+        chain_id: list[int] | int | None = None,
+        contract_address: str | None = None,
+        transaction_hash: str | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        sort_by: SortField = "block_number",
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+        decode_locally: bool = False,
+    ) -> Iterator[Item]:
+        """Iterate over all decoded events matching the filters, across as many pages as needed.
+
+        Only the current and the next page are held in memory, the next page is fetched while the current one is
+        consumed.
+
+        Args:
+            chain_id: Chain ID(s) to query, defaults to the chains of the service
+            contract_address: Only return events emitted by this contract
+            transaction_hash: Only return events emitted in this transaction
+            from_block: Only return events from this block on (inclusive)
+            to_block: Only return events up to this block (inclusive)
+            sort_order: Order of the events
+            sort_by: Field the events are ordered by. Use block_timestamp to interleave events of several chains
+                chronologically.
+            limit: Number of events fetched per request
+            max_items: Stop after this many events
+            stop_when: Stop before the first event this returns True for
+            prefetch: Fetch the next page in the background
+            decode_locally: Fetch the events undecoded and decode them with :attr:`abi_registry`, which fetches the
+                ABI of every contract once. Responses are smaller and decoding runs on local cores.
+
+        Example:
+            >>> for event in insight.iter_events(contract_address="0x...", from_block=19_000_000, max_items=100_000):
+            ...     process(event)
+        """
+        path, params = self._events_query(chain_id, contract_address, transaction_hash, sort_order, sort_by)
+        params.update(self._block_range_params(from_block, to_block))
+        return self._iter_decoded(
+            "logs",
+            path,
+            params,
+            decode_locally,
+            limit=limit,
+            max_items=max_items,
+            stop_when=stop_when,
+            prefetch=prefetch,
+        )
+
+    def iter_contract_events(
+        self,
+        contract_address: str,
+        chain_id: list[int] | int | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        sort_by: SortField = "block_number",
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+        decode_locally: bool = False,
+    ) -> Iterator[Item]:
+        """Iterate over all decoded events of a contract, see :meth:`iter_events`."""
+        path, params = self._contract_events_query(contract_address, chain_id, sort_order, sort_by)
+        params.update(self._block_range_params(from_block, to_block))
+        return self._iter_decoded(
+            "logs",
+            path,
+            params,
+            decode_locally,
+            limit=limit,
+            max_items=max_items,
+            stop_when=stop_when,
+            prefetch=prefetch,
+        )
+
+    def iter_transactions(
+        self,
+        chain_id: list[int] | int | None = None,
+        from_address: str | None = None,
+        to_address: str | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] | None = None,
+        sort_by: SortField = "block_number",
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+        decode_locally: bool = False,
+    ) -> Iterator[Item]:
+        """Iterate over all transactions matching the filters, see :meth:`iter_events`."""
+        path, params = self._transactions_query(chain_id, from_address, to_address, sort_order, sort_by)
+        params.update(self._block_range_params(from_block, to_block))
+        return self._iter_decoded(
+            "inputs",
+            path,
+            params,
+            decode_locally,
+            limit=limit,
+            max_items=max_items,
+            stop_when=stop_when,
+            prefetch=prefetch,
+        )
+
+    def iter_nft_owners(
+        self,
+        contract_address: str,
+        token_id: str | None = None,
+        chain_id: list[int] | int | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> Iterator[Item]:
+        """Iterate over all owners of a collection or of one of its tokens, see :meth:`iter_events`."""
+        path, params = self._nft_query("owners", contract_address, token_id, chain_id)
+        return self._iter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
+
+    def iter_nft_transfers(
+        self,
+        contract_address: str,
+        token_id: str | None = None,
+        chain_id: list[int] | int | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> Iterator[Item]:
+        """Iterate over all transfers of a collection or of one of its tokens, see :meth:`iter_events`.
+
+        Transfers are returned newest first, use e.g. ``stop_when=lambda t: t["block_number"] < 19_000_000`` to
+        stop at a block.
+        """
+        path, params = self._nft_query("transfers", contract_address, token_id, chain_id)
+        return self._iter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
+
+    def _balance_requests(
+        self, owners: Iterable[str], chain_id: list[int] | int | None, token_types: Sequence[TokenType]
+    ) -> list[BalanceRequest]:
+        chains = self._chain_params(chain_id).get("chain", [])
+        groups = chain_groups([chains] if isinstance(chains, int) else chains)
+        owners = list(dict.fromkeys(validate_address(owner) for owner in owners))
+        return [BalanceRequest(o, group, t) for o in owners for group in groups for t in dict.fromkeys(token_types)]
+
+    def _fetch_balances(self, request: BalanceRequest, limit: int = DEFAULT_PAGE_SIZE) -> BalanceUpdate:
+        owner, chain_ids, token_type = request
+        params: dict[str, Any] = {"chain": chain_ids, "metadata": True}
+        if token_type == "erc20":
+            params["include_spam"] = False
+
+        def fetch_page(page: int, limit: int) -> list[Item]:
+            return self._get(f"tokens/{token_type}/{owner}", {**params, "page": page, "limit": limit})["data"]
+
+        try:
+            return BalanceUpdate(request, list(paginate(fetch_page, limit=limit, prefetch=False)))
+        except httpx.HTTPError as e:
+            # one failing wallet or chain must not lose the balances of all others
+            metrics.increment("portfolio.errors", token_type=token_type)
+            return BalanceUpdate(request, [], f"{type(e).__name__}: {e}")
+
+    def iter_balances(
+        self,
+        owners: Iterable[str],
+        chain_id: list[int] | int | None = None,
+        token_types: Sequence[TokenType] = ("erc20",),
+    ) -> Iterator[BalanceUpdate]:
+        """Fetch the balances of many wallets on many chains concurrently, yielding them as they arrive.
+
+        One request is made per wallet, token type and group of up to five chains, all of them at once on the
+        tool executor. Failed requests are yielded with their error instead of raising.
+
+        Example:
+            >>> portfolio = Portfolio()
+            >>> for update in insight.iter_balances(wallets, chain_id=[1, 10, 137, 8453]):
+            ...     portfolio.add(update)
+            ...     print(f"{len(portfolio.positions)} positions so far")
+        """
+        requests = self._balance_requests(owners, chain_id, token_types)
+        executor = get_tool_executor()
+        futures = [executor.submit(self._fetch_balances, request) for request in requests]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def build_portfolio(
+        self,
+        owners: Iterable[str],
+        chain_id: list[int] | int | None = None,
+        token_types: Sequence[TokenType] = ("erc20",),
+        on_update: Callable[[BalanceUpdate], None] | None = None,
+    ) -> Portfolio:
+        """Aggregate the holdings of many wallets on many chains into one portfolio valued in USD.
+
+        Balances are fetched concurrently, see :meth:`iter_balances`, then all fungible tokens are priced with one
+        batched :meth:`get_prices` lookup.
+
+        Args:
+            owners: The wallet addresses
+            chain_id: Chain ID(s) to include, any number of them. Defaults to the chains of the service.
+            token_types: Token types to include
+            on_update: Called with every balance update as soon as it arrives, possibly from a worker thread
+        """
+
+        def fetch(request: BalanceRequest) -> BalanceUpdate:
+            update = self._fetch_balances(request)
+            if on_update is not None:
+                on_update(update)
+            return update
+
+        portfolio = Portfolio()
+        for update in self._map(fetch, self._balance_requests(owners, chain_id, token_types)):
+            portfolio.add(update)
+        if tokens := portfolio.fungible_tokens():
+            portfolio.apply_prices(self.get_prices_for(tokens))
+        metrics.increment("portfolio.positions", len(portfolio.positions))
+        return portfolio
+
+    def get_abi(self, contract_address: str, chain_id: int | None = None) -> list[dict[str, Any]]:
+        """Return the ABI of a contract, on the first chain of the service unless ``chain_id`` is set."""
+        contract_address = validate_address(contract_address)
+        response: Any = self._get(f"contracts/abi/{contract_address}", {"chain": chain_id or self.chain_ids[0]})
+        return response["data"] if isinstance(response, dict) else response
+
+    def decode_events(self, events: Iterable[Item], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Item]:
+        """Decode events fetched with ``decode=False`` locally, in batches, setting ``decoded`` on each of them.
+
+        ABIs are fetched once per contract through :attr:`abi_registry`. Events of contracts without a verified
+        ABI are returned unchanged.
+
+        Example:
+            >>> insight.abi_registry.processes = 8
+            >>> for event in insight.decode_events(insight.backfill_events(19_000_000, 19_500_000, decode=False)):
+            ...     write(event)
+        """
+        return self.abi_registry.decode_stream(events, "logs", batch_size)
+
+    def decode_transactions(self, transactions: Iterable[Item], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Item]:
+        """Decode the input of transactions fetched with ``decode=False`` locally, see :meth:`decode_events`."""
+        return self.abi_registry.decode_stream(transactions, "inputs", batch_size)
+
+    def query_events(self, query: EventQuery) -> dict[str, Any]:
+        """Run an event query, on the chains of the service unless the query names its chains.
+
+        Returns:
+            The API response, with the matching events in ``data`` and the results of the aggregations, if any,
+            in ``aggregations``
+        """
+        if not query.chain_ids:
+            query = query.on_chains(*self.chain_ids)
+        return self._get("events", query.to_params())
+
+    def sync_events(
+        self,
+        contract_address: str,
+        chain_id: int | None = None,
+        topic_0: str | None = None,
+        from_block: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> int:
+        """Fetch the events of a contract emitted since its last sync into ``event_store``.
+
+        The first sync fetches all events from ``from_block`` on, later syncs only the events of blocks after the
+        last one synced. Once synced, the events of the contract are answered from the store by the event tools
+        as long as the last sync is at most ``event_store_max_age`` seconds old, older syncs are refreshed first.
+
+        Args:
+            contract_address: The contract to sync
+            chain_id: The chain to sync, defaults to the first chain of the service
+            topic_0: Only sync events with this signature hash
+            from_block: Where the first sync starts
+            limit: Number of events fetched per request
+
+        Returns:
+            The number of new events stored
+        """
+        if self.event_store is None:
+            raise ValueError("sync_events requires an event_store")
+        chain = chain_id if chain_id is not None else self.chain_ids[0]
+        contract_address = validate_address(contract_address)
+        topic = topic_0 or ALL_TOPICS
+        state = self.event_store.sync_state(chain, contract_address, topic)
+
+        path, params = self._contract_events_query(contract_address, chain, sort_order="asc")
+        if state is not None:
+            params["filter_block_number_gt"] = state.last_block
+        elif from_block:
+            params["filter_block_number_gte"] = from_block
+        if topic_0:
+            params["filter_topic_0"] = topic_0
+
+        last_block = state.last_block if state is not None else from_block - 1
+        added = 0
+        batch: list[Item] = []
+        # no prefetching so that async tools can replay the sync on the event loop
+        for event in self._iter_pages(path, params, limit=limit, prefetch=False):
+            batch.append(event)
+            last_block = max(last_block, int(event["block_number"]))
+            if len(batch) >= limit:
+                added += self.event_store.add_events(batch)
+                batch.clear()
+        added += self.event_store.add_events(batch)
+        self.event_store.mark_synced(chain, contract_address, last_block, from_block=from_block, topic=topic)
+        metrics.increment("event_store.synced", added, chain=chain)
+        return added
+
+    def _events_from_store(
+        self,
+        chain_id: list[int] | int | None,
+        contract_address: str | None,
+        transaction_hash: str | None = None,
+        page: int | None = None,
+        page_size: int = 20,
+    ) -> dict[str, Any] | None:
+        """Answer an event query from ``event_store`` if all its chains are synced for the contract."""
+        if self.event_store is None or not contract_address:
+            return None
+        normalized = normalize_chain_id(chain_id if chain_id is not None else self.chain_ids)
+        chain_ids = normalized if isinstance(normalized, list) else [normalized or 1]
+        contract_address = validate_address(contract_address)
+        states = [self.event_store.sync_state(chain, contract_address) for chain in chain_ids]
+        synced = [state for state in states if state is not None]
+        if not chain_ids or len(synced) < len(states):
+            return None
+        for chain, state in zip(chain_ids, synced, strict=True):
+            if time.time() - state.synced_at > self.event_store_max_age:
+                if not self._memoize():
+                    # syncing writes to the store, which a replayed async body would repeat on every replay
+                    return None
+                self.sync_events(contract_address, chain)
+
+        data = self.event_store.query(
+            chain_ids,
+            contract_address,
+            transaction_hash=validate_transaction_hash(transaction_hash) if transaction_hash else None,
+            limit=page_size,
+            offset=(page or 0) * page_size,
+        )
+        if len(data) < page_size and any(state.from_block > 0 for state in synced):
+            # the page reaches back before the first synced block
+            return None
+        metrics.increment("event_store.hits", service=type(self).__name__)
+        return {"data": data, "meta": {"page": page or 0, "limit": page_size, "source": "event_store"}}
+
+    def backfill_events(
+        self,
+        from_block: int,
+        to_block: int,
+        chain_id: list[int] | int | None = None,
+        contract_address: str | None = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        workers: int = 8,
+        processes: bool = False,
+        checkpoint: BackfillCheckpoint | None = None,
+        job_id: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        decode: bool = True,
+    ) -> Backfill:
+        """Fetch all decoded events of a block range, split into shards fetched on a pool of workers.
+
+        Iterating over the returned :class:`~thirdweb_ai.common.backfill.Backfill` yields the events in ascending
+        block order. With a ``checkpoint`` an interrupted backfill resumes at the first shard not consumed yet.
+
+        Args:
+            from_block: First block of the range (inclusive)
+            to_block: Last block of the range (inclusive)
+            chain_id: Chain ID(s) to query, defaults to the chains of the service
+            contract_address: Only return events emitted by this contract
+            shard_size: Number of blocks per shard
+            workers: Number of shards fetched concurrently
+            processes: Fetch shards in worker processes. Each process uses its own service without this
+                service's rate limiter, retry policy and caches.
+            checkpoint: Where completed shards are recorded
+            job_id: Identifies the backfill in the checkpoint, derived from the query by default
+            limit: Number of events fetched per request
+            decode: Have the API decode the events. Pass an undecoded backfill to :meth:`decode_events` to decode
+                it on local cores instead.
+        """
+        path, params = self._events_query(chain_id, contract_address, sort_order="asc")
+        params["decode"] = decode
+        job_id = job_id or make_job_id(path, params, from_block, to_block, shard_size)
+        if processes:
+            fetch_shard = ShardFetcher(self.base_url, self.secret_key, path, params, limit)
+        else:
+
+            def fetch_shard(shard: Shard) -> list[Item]:
+                shard_params = {**params, **self._block_range_params(shard.from_block, shard.to_block)}
+                return list(self._iter_pages(path, shard_params, limit=limit, prefetch=False))
+
+        return Backfill(
+            fetch_shard,
+            from_block,
+            to_block,
+            job_id=job_id,
+            shard_size=shard_size,
+            workers=workers,
+            processes=processes,
+            checkpoint=checkpoint,
+        )
+
+
+class AsyncInsight(Insight, AsyncService):
+    """Insight service whose tools can run natively on the event loop."""
+
+    def _aiter_pages(
+        self, path: str, params: dict[str, Any], prefetch: bool = True, **kwargs: Any
+    ) -> AsyncIterator[Item]:
+        if (chains := self._fan_out_chains(params)) is not None:
+
+            async def fetch_group(chain_ids: list[int], page: int, limit: int) -> list[Item]:
+                return (await self._aget(path, {**params, "chain": chain_ids, "page": page, "limit": limit}))["data"]
+
+            descending = params.get("sort_order", "desc") == "desc"
+            return afan_out(fetch_group, chains, sort_by=params.get("sort_by"), descending=descending, **kwargs)
+
+        async def fetch_page(page: int, limit: int) -> list[Item]:
+            return (await self._aget(path, {**params, "page": page, "limit": limit}))["data"]
+
+        return apaginate(fetch_page, prefetch=prefetch, **kwargs)
+
+    def aiter_events(
+        self,
+        chain_id: list[int] | int | None = None,
+        contract_address: str | None = None,
+        transaction_hash: str | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        sort_by: SortField = "block_number",
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Item]:
+        """Asynchronously iterate over all decoded events matching the filters, see :meth:`Insight.iter_events`.
+
+        Example:
+            >>> async for event in insight.aiter_events(contract_address="0x...", max_items=100_000):
+            ...     process(event)
+        """
+        path, params = self._events_query(chain_id, contract_address, transaction_hash, sort_order, sort_by)
+        params.update(self._block_range_params(from_block, to_block))
+        return self._aiter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
+
+    def aiter_contract_events(
+        self,
+        contract_address: str,
+        chain_id: list[int] | int | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] = "desc",
+        sort_by: SortField = "block_number",
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Item]:
+        """Asynchronously iterate over all decoded events of a contract, see :meth:`Insight.iter_events`."""
+        path, params = self._contract_events_query(contract_address, chain_id, sort_order, sort_by)
+        params.update(self._block_range_params(from_block, to_block))
+        return self._aiter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
+
+    def aiter_transactions(
+        self,
+        chain_id: list[int] | int | None = None,
+        from_address: str | None = None,
+        to_address: str | None = None,
+        from_block: int | None = None,
+        to_block: int | None = None,
+        sort_order: Literal["asc", "desc"] | None = None,
+        sort_by: SortField = "block_number",
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Item]:
+        """Asynchronously iterate over all transactions matching the filters, see :meth:`Insight.iter_events`."""
+        path, params = self._transactions_query(chain_id, from_address, to_address, sort_order, sort_by)
+        params.update(self._block_range_params(from_block, to_block))
+        return self._aiter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
+
+    def aiter_nft_owners(
+        self,
+        contract_address: str,
+        token_id: str | None = None,
+        chain_id: list[int] | int | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Item]:
+        """Asynchronously iterate over all owners of a collection or token, see :meth:`Insight.iter_events`."""
+        path, params = self._nft_query("owners", contract_address, token_id, chain_id)
+        return self._aiter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
+
+    def aiter_nft_transfers(
+        self,
+        contract_address: str,
+        token_id: str | None = None,
+        chain_id: list[int] | int | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        max_items: int | None = None,
+        stop_when: Callable[[Item], bool] | None = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Item]:
+        """Asynchronously iterate over all transfers of a collection or token, see :meth:`Insight.iter_nft_transfers`."""
+        path, params = self._nft_query("transfers", contract_address, token_id, chain_id)
+        return self._aiter_pages(path, params, limit=limit, max_items=max_items, stop_when=stop_when, prefetch=prefetch)
@@ -1,6 +1,6 @@
 from typing import Annotated, Any
 
-from thirdweb_ai.services.service import Service
+from thirdweb_ai.services.service import AsyncService, Service
 from thirdweb_ai.tools.tool import tool
 
 
@@ -42,3 +42,7 @@ class Nebula(Service):
     def create_session(self) -> dict[str, Any]:
         data = {}
         return self._post("/session", data)
+
+
+class AsyncNebula(Nebula, AsyncService):
+    """Nebula service whose tools can run natively on the event loop."""
@@ -1,17 +1,71 @@
+import asyncio
+import contextvars
 import inspect
-from collections.abc import Callable
-from typing import Any
+import json
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
+from typing import Any, ClassVar, TypeVar
 
 import httpx
 
+from thirdweb_ai.common.cache import CacheEntry, ResponseCache, default_cache
+from thirdweb_ai.common.http_client import get_async_http_client, get_http_client
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.rate_limit import RateLimiter, get_rate_limiter
+from thirdweb_ai.common.retry import RetryBudget, RetryPolicy
+from thirdweb_ai.common.singleflight import AsyncSingleFlight, SingleFlight, make_request_key
+from thirdweb_ai.common.utils import match_path
+from thirdweb_ai.tools.executor import map_concurrently
 from thirdweb_ai.tools.tool import TOOL_FUNCTION_ATTR_KEY, Tool
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# times a replayed async tool body may issue different requests than before until it fails
+MAX_REPLAY_MISMATCHES = 3
+
+# identical GET requests in flight at the same time are sent only once, across all service instances
+_request_group: SingleFlight[httpx.Response] = SingleFlight()
+_async_request_group: AsyncSingleFlight[httpx.Response] = AsyncSingleFlight()
+
 
 class Service:
+    # glob patterns of GET paths (relative to base_url) mapped to how long their responses are cached, in seconds
+    cache_ttls: ClassVar[dict[str, float]] = {}
+    # same for responses that never change, these are also kept in persistent_cache when one is configured
+    persistent_cache_ttls: ClassVar[dict[str, float]] = {}
+
     def __init__(self, base_url: str, secret_key: str, httpx_client: httpx.Client | None = None):
         self.base_url = base_url
         self.secret_key = secret_key
-        self.client = httpx_client or httpx.Client(timeout=120.0, transport=httpx.HTTPTransport(retries=5))
+        self._client = httpx_client
+        self.retry_policy = RetryPolicy()
+        self.cache: ResponseCache | None = default_cache
+        self.persistent_cache: ResponseCache | None = None
+        self.coalesce_requests = True
+        self._rate_limiter: RateLimiter | None = None
+
+    @property
+    def client(self) -> httpx.Client:
+        """The HTTP client used by this service, the process-wide shared client unless one was provided."""
+        return self._client or get_http_client()
+
+    @client.setter
+    def client(self, client: httpx.Client | None) -> None:
+        self._client = client
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """The limiter of this service's requests, the one registered for its secret key unless one was assigned."""
+        if self._rate_limiter is not None:
+            return self._rate_limiter
+        return get_rate_limiter(self.secret_key) if self.secret_key else None
+
+    @rate_limiter.setter
+    def rate_limiter(self, limiter: RateLimiter | None) -> None:
+        self._rate_limiter = limiter
 
     def _make_headers(self):
         kwargs = {"Content-Type": "application/json"}
@@ -19,30 +73,552 @@ class Service:
             kwargs["X-Secret-Key"] = self.secret_key
         return kwargs
 
+    def _start_retries(self, method: str, idempotent: bool | None) -> RetryBudget | None:
+        if idempotent is None:
+            idempotent = self.retry_policy.is_idempotent(method)
+        return self.retry_policy.start() if idempotent else None
+
+    def _retry_delay(
+        self,
+        budget: RetryBudget | None,
+        url: str,
+        response: httpx.Response | None = None,
+        error: httpx.TransportError | None = None,
+    ) -> float | None:
+        delay = budget.next_delay(response) if budget else None
+        if delay is not None:
+            reason = response.status_code if response is not None else type(error).__name__
+            metrics.increment("http.retries", service=type(self).__name__, host=httpx.URL(url).host, reason=reason)
+        return delay
+
+    def _endpoint(self, url: str) -> str:
+        base_url = self.base_url.rstrip("/")
+        return url[len(base_url) :] if url.startswith(base_url) else httpx.URL(url).path
+
+    def _send_limited(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if (limiter := self.rate_limiter) is None:
+            return self.client.request(method, url, **kwargs)
+        with limiter.slot(self._endpoint(url), service=type(self).__name__) as slot:
+            response = self.client.request(method, url, **kwargs)
+            slot.status_code = response.status_code
+            return response
+
+    def _coalesce_key(self, method: str, url: str, kwargs: dict[str, Any]) -> str | None:
+        """Return the key concurrent identical requests are coalesced on, or None if the request must be sent."""
+        if not self.coalesce_requests or method.upper() != "GET" or set(kwargs) - {"params", "headers"}:
+            return None
+        return make_request_key(method, url, kwargs.get("params"), kwargs.get("headers"))
+
+    def _request(self, method: str, url: str, *, idempotent: bool | None = None, **kwargs: Any) -> httpx.Response:
+        """Send a request, sharing the response with identical GET requests that are already in flight."""
+        key = self._coalesce_key(method, url, kwargs)
+        if key is None:
+            return self._send(method, url, idempotent=idempotent, **kwargs)
+        response, shared = _request_group.do(key, lambda: self._send(method, url, idempotent=idempotent, **kwargs))
+        if shared:
+            metrics.increment("http.coalesced", service=type(self).__name__, host=httpx.URL(url).host)
+        return response
+
+    def _send(self, method: str, url: str, *, idempotent: bool | None = None, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying transient failures of idempotent requests according to ``retry_policy``."""
+        budget = self._start_retries(method, idempotent)
+        while True:
+            try:
+                response = self._send_limited(method, url, **kwargs)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(budget, url, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(budget, url, response) if response.is_error else None
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+                response.close()
+            time.sleep(delay)
+
+    def _cache_entries(
+        self, path: str, url: str, params: dict[str, Any] | None, headers: dict[str, Any]
+    ) -> list[CacheEntry]:
+        """Return the caches a GET request is looked up in, fastest first.
+
+        The key includes the headers, so that a response fetched with one secret key is never served to another.
+        """
+        entries: list[CacheEntry] = []
+        tiers = (
+            ("memory", self.cache, self.cache_ttls),
+            ("persistent", self.persistent_cache, self.persistent_cache_ttls),
+        )
+        for tier, cache, ttls in tiers:
+            matched = match_path(path, ttls) if cache is not None else None
+            if cache is None or matched is None or matched[1] <= 0:
+                continue
+            entries.append(CacheEntry(cache, tier, make_request_key("GET", url, params, headers), *matched))
+        return entries
+
+    def _cache_get(self, entries: list[CacheEntry]) -> Any | None:
+        body = self._cached_body(entries)
+        # cached bodies are decoded on every hit, tool bodies modify the responses they get in place
+        return json.loads(body) if body is not None else None
+
+    def _cached_body(self, entries: list[CacheEntry]) -> bytes | None:
+        for i, entry in enumerate(entries):
+            body = entry.cache.get(entry.key)
+            metrics.increment(
+                "cache.hits" if body is not None else "cache.misses",
+                service=type(self).__name__,
+                endpoint=entry.endpoint,
+                tier=entry.tier,
+            )
+            if body is not None:
+                for faster in entries[:i]:
+                    faster.cache.set(faster.key, body, faster.ttl)
+                return body
+        return None
+
+    def _cache_set(self, entries: list[CacheEntry], response: httpx.Response) -> None:
+        for entry in entries:
+            entry.cache.set(entry.key, response.content, entry.ttl)
+
+    def _memoize(self) -> bool:
+        """Whether values derived from earlier responses may be used to skip requests."""
+        return True
+
+    def _can_wait(self) -> bool:
+        """Whether a tool body may block on work done outside of it, like a batched request sent by another thread."""
+        return True
+
+    def _wait(self, start: Callable[[], dict[T, Future[R]]], timeout: float | None = None) -> dict[T, Future[R]]:
+        """Start work done outside of the tool body, like watching transactions until they are mined, and wait.
+
+        Args:
+            start: Starts the work and returns its futures
+            timeout: Longest time in seconds to wait for all futures to be done
+
+        Returns:
+            The futures returned by ``start``
+        """
+        futures = start()
+        wait_futures(futures.values(), timeout=timeout)
+        return futures
+
+    def _memo_cache(self) -> ResponseCache | None:
+        """Return the cache of values derived from responses, like the price of a single token."""
+        return self.cache if self._memoize() else None
+
+    def _map(self, func: Callable[[T], R], items: Iterable[T], max_concurrency: int | None = None) -> list[R]:
+        """Apply ``func``, which sends requests, to every item concurrently and return the results in order."""
+        return map_concurrently(func, items, max_concurrency=max_concurrency)
+
     def _get(self, path: str, params: dict[str, Any] | None = None, headers: dict[str, Any] | None = None):
         base_url = self.base_url.rstrip("/")
         path = path.lstrip("/")
         _headers = self._make_headers()
         if headers:
             _headers.update(headers)
-        response = self.client.get(f"{base_url}/{path}", params=params, headers=_headers)
-        response.raise_for_status()
+        url = f"{base_url}/{path}"
+        cache_entries = self._cache_entries(path, url, params, _headers)
+        if cache_entries and (cached := self._cache_get(cache_entries)) is not None:
+            return cached
+        response = self._request("GET", url, params=params, headers=_headers)
+        self._cache_set(cache_entries, response)
         return response.json()
 
-    def _post(self, path: str, data: dict[str, Any] | None = None, headers: dict[str, Any] | None = None):
+    def _post(
+        self,
+        path: str,
+        data: dict[str, Any] | list[Any] | None = None,
+        headers: dict[str, Any] | None = None,
+        idempotent: bool = False,
+    ):
         base_url = self.base_url.rstrip("/")
         path = path.lstrip("/")
         _headers = self._make_headers()
         if headers:
             _headers.update(headers)
-        response = self.client.post(f"{base_url}/{path}", json=data, headers=_headers)
-        response.raise_for_status()
+        response = self._request("POST", f"{base_url}/{path}", json=data, headers=_headers, idempotent=idempotent)
         return response.json()
 
     def get_tools(self) -> list[Tool]:
         tools: list[Tool] = []
-        for _, method in inspect.getmembers(self, predicate=inspect.ismethod):
+        # look the tools up on the class so that properties (e.g. the lazily created clients) are not evaluated
+        for _, method in inspect.getmembers(type(self), predicate=inspect.isfunction):
             _tool = getattr(method, TOOL_FUNCTION_ATTR_KEY, None)
             if _tool and isinstance(_tool, Callable):
                 tools.append(_tool(self))
         return tools
+
+
+class _CacheHit:
+    """A cached body a replayed tool body got instead of sending its request."""
+
+    def __init__(self, key: str, body: bytes):
+        self.key = key
+        self.body = body
+
+
+class _Waited:
+    """A wait of a replayed tool body for futures, which was awaited on the event loop."""
+
+    def __init__(self, futures: dict[Any, Future[Any]]):
+        self.futures = futures
+
+
+class _Outcome:
+    """The response of a request of a replayed tool body, or the exception it raised."""
+
+    def __init__(self, key: str, result: httpx.Response | Exception):
+        self.key = key
+        self.result = result
+
+
+def _replay_key(method: str, url: str, kwargs: dict[str, Any]) -> str:
+    """Identify a request of a tool body, for GET requests like the cache entries of its response."""
+    key = make_request_key(method, url, kwargs.get("params"), kwargs.get("headers"))
+    return f"{key} {json.dumps(kwargs['json'], sort_keys=True, default=str)}" if "json" in kwargs else key
+
+
+class _ReplayLog:
+    """Outcomes of the requests of an async tool call, in the order its body issues them.
+
+    An outcome is a response, the exception the request raised or a cache hit, recorded with the request it belongs
+    to. A ``_map`` call is a single entry holding one log per item, so that the pending requests of all items can be
+    awaited together. If a replayed body issues a different request than before, e.g. because a time window moved
+    on, the outcomes from there on are dropped and fetched again instead of being handed to the wrong request.
+    """
+
+    def __init__(self):
+        self.entries: list[_Outcome | _CacheHit | _Waited | list[_ReplayLog]] = []
+        self.cursor = 0
+        self.mismatched = False
+
+    def rewind(self) -> None:
+        self.cursor = 0
+        self.mismatched = False
+        for entry in self.entries:
+            if isinstance(entry, list):
+                for log in entry:
+                    log.rewind()
+
+    def _drop_rest(self) -> None:
+        del self.entries[self.cursor :]
+        self.mismatched = True
+        metrics.increment("http.replay_mismatches")
+
+    def _matching(self, key: str) -> "_Outcome | _CacheHit | None":
+        """Return the next entry if it was recorded for the request ``key``."""
+        if self.cursor >= len(self.entries):
+            return None
+        entry = self.entries[self.cursor]
+        if isinstance(entry, _Outcome | _CacheHit) and entry.key == key:
+            return entry
+        self._drop_rest()
+        return None
+
+    def next_cache_hit(self, key: str) -> _CacheHit | None:
+        """Consume the next entry if it is a cache hit of the request ``key``."""
+        entry = self._matching(key)
+        if not isinstance(entry, _CacheHit):
+            return None
+        self.cursor += 1
+        return entry
+
+    def has_outcome(self, key: str) -> bool:
+        """Whether the request ``key`` was sent already, after its cache lookup missed."""
+        return isinstance(self._matching(key), _Outcome)
+
+    def add_cache_hit(self, key: str, body: bytes) -> None:
+        self.entries.append(_CacheHit(key, body))
+        self.cursor += 1
+
+    def next_response(self, key: str) -> httpx.Response | None:
+        """Return the response of the request ``key`` or raise its exception, None if it was not sent yet."""
+        entry = self._matching(key)
+        if not isinstance(entry, _Outcome):
+            if entry is not None:
+                # a cache hit before, a miss now
+                self._drop_rest()
+            return None
+        self.cursor += 1
+        if isinstance(entry.result, Exception):
+            raise entry.result
+        return entry.result
+
+    def next_wait(self) -> _Waited | None:
+        """Consume the next entry if it is a wait, which is over then."""
+        entry = self.entries[self.cursor] if self.cursor < len(self.entries) else None
+        if not isinstance(entry, _Waited):
+            if entry is not None:
+                self._drop_rest()
+            return None
+        self.cursor += 1
+        return entry
+
+    def next_group(self, size: int) -> "list[_ReplayLog]":
+        """Return the logs of the items of the next ``_map`` call."""
+        entry = self.entries[self.cursor] if self.cursor < len(self.entries) else None
+        if not isinstance(entry, list) or len(entry) != size:
+            if entry is not None:
+                self._drop_rest()
+            entry = [_ReplayLog() for _ in range(size)]
+            self.entries.append(entry)
+        self.cursor += 1
+        return entry
+
+
+class _PendingRequest(BaseException):
+    """Raised from inside a tool body to hand a request over to the event loop.
+
+    Derives from BaseException so that ``except Exception`` blocks in tool bodies cannot swallow it.
+    """
+
+    def __init__(self, log: _ReplayLog, key: str, method: str, url: str, kwargs: dict[str, Any]):
+        super().__init__(method, url)
+        self.log = log
+        self.key = key
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+
+
+class _PendingRequests(BaseException):
+    """Raised by ``_map`` in a tool body with the pending requests of all of its items, to await them together."""
+
+    def __init__(self, requests: list[_PendingRequest], max_concurrency: int | None):
+        super().__init__(len(requests))
+        self.requests = requests
+        self.max_concurrency = max_concurrency
+
+
+class _PendingWait(BaseException):
+    """Raised from inside a tool body to await futures on the event loop instead of blocking it."""
+
+    def __init__(self, log: _ReplayLog, futures: dict[Any, Future[Any]], timeout: float | None):
+        super().__init__(len(futures))
+        self.log = log
+        self.futures = futures
+        self.timeout = timeout
+
+    async def wait(self) -> None:
+        if self.futures:
+            # a timed out wait does not cancel the wrapped futures, they may be shared
+            wrapped = [asyncio.wrap_future(future) for future in self.futures.values()]
+            await asyncio.wait(wrapped, timeout=self.timeout)
+        # replays get the same futures instead of starting the work again
+        self.log.entries.append(_Waited(self.futures))
+
+
+_replay_log: contextvars.ContextVar[_ReplayLog | None] = contextvars.ContextVar("_replay_log", default=None)
+
+
+class AsyncService(Service):
+    """A service whose tools perform their HTTP requests on the running event loop.
+
+    Tool bodies are shared with the synchronous services. When a tool runs asynchronously its body is executed
+    until it issues a request, the request is awaited on ``httpx.AsyncClient`` and the body is replayed with the
+    responses fetched so far. Tool bodies only do validation and response shaping around their requests, so
+    replaying them is cheap and no thread is held while a request is in flight. The items of a ``_map`` call each
+    run until they need a request, and the requests of all items are awaited together. Every replayed request is
+    checked against the one its response was fetched for, and fetched again if the body issued a different one.
+    Waits for futures, like transactions being mined, are awaited on the loop the same way.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        secret_key: str,
+        httpx_client: httpx.Client | None = None,
+        httpx_async_client: httpx.AsyncClient | None = None,
+    ):
+        super().__init__(base_url=base_url, secret_key=secret_key, httpx_client=httpx_client)
+        self._async_client = httpx_async_client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The async HTTP client used by this service, the shared client of the running loop unless one was provided."""
+        return self._async_client or get_async_http_client()
+
+    @async_client.setter
+    def async_client(self, client: httpx.AsyncClient | None) -> None:
+        self._async_client = client
+
+    def _request(self, method: str, url: str, *, idempotent: bool | None = None, **kwargs: Any) -> httpx.Response:
+        replay_log = _replay_log.get()
+        if replay_log is None:
+            return super()._request(method, url, idempotent=idempotent, **kwargs)
+        key = _replay_key(method, url, kwargs)
+        response = replay_log.next_response(key)
+        if response is None:
+            raise _PendingRequest(replay_log, key, method, url, {"idempotent": idempotent, **kwargs})
+        return response
+
+    def _cached_body(self, entries: list[CacheEntry]) -> bytes | None:
+        replay_log = _replay_log.get()
+        if replay_log is None:
+            return super()._cached_body(entries)
+        key = entries[0].key
+        if (hit := replay_log.next_cache_hit(key)) is not None:
+            return hit.body
+        if replay_log.has_outcome(key):
+            # the lookup already missed before the response was fetched, don't count it twice
+            return None
+        # entries may expire between replays, the body must get the same answer every time
+        body = super()._cached_body(entries)
+        if body is not None:
+            replay_log.add_cache_hit(key, body)
+        return body
+
+    def _memoize(self) -> bool:
+        # derived values may change between replays of a tool body, which would change the requests the body sends
+        return _replay_log.get() is None
+
+    def _can_wait(self) -> bool:
+        # replayed bodies run on the event loop, and their requests must go through the replay log
+        return _replay_log.get() is None
+
+    def _wait(self, start: Callable[[], dict[T, Future[R]]], timeout: float | None = None) -> dict[T, Future[R]]:
+        replay_log = _replay_log.get()
+        if replay_log is None:
+            return super()._wait(start, timeout)
+        if (waited := replay_log.next_wait()) is not None:
+            return waited.futures
+        raise _PendingWait(replay_log, start(), timeout)
+
+    def _map(self, func: Callable[[T], R], items: Iterable[T], max_concurrency: int | None = None) -> list[R]:
+        replay_log = _replay_log.get()
+        if replay_log is None:
+            return super()._map(func, items, max_concurrency)
+        # every item runs until it needs a request, then the requests of all items are awaited together
+        items = list(items)
+        results: list[R] = []
+        pending: list[_PendingRequest] = []
+        for item, log in zip(items, replay_log.next_group(len(items)), strict=True):
+            token = _replay_log.set(log)
+            try:
+                results.append(func(item))
+            except _PendingRequest as request:
+                pending.append(request)
+            except _PendingRequests as requests:
+                pending.extend(requests.requests)
+            finally:
+                _replay_log.reset(token)
+        if pending:
+            raise _PendingRequests(pending, max_concurrency)
+        return results
+
+    async def _asend_limited(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if (limiter := self.rate_limiter) is None:
+            return await self.async_client.request(method, url, **kwargs)
+        async with limiter.aslot(self._endpoint(url), service=type(self).__name__) as slot:
+            response = await self.async_client.request(method, url, **kwargs)
+            slot.status_code = response.status_code
+            return response
+
+    async def _arequest(
+        self, method: str, url: str, *, idempotent: bool | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        key = self._coalesce_key(method, url, kwargs)
+        if key is None:
+            return await self._asend(method, url, idempotent=idempotent, **kwargs)
+        response, shared = await _async_request_group.do(
+            key, lambda: self._asend(method, url, idempotent=idempotent, **kwargs)
+        )
+        if shared:
+            metrics.increment("http.coalesced", service=type(self).__name__, host=httpx.URL(url).host)
+        return response
+
+    async def _asend(self, method: str, url: str, *, idempotent: bool | None = None, **kwargs: Any) -> httpx.Response:
+        budget = self._start_retries(method, idempotent)
+        while True:
+            try:
+                response = await self._asend_limited(method, url, **kwargs)
+            except httpx.TransportError as e:
+                delay = self._retry_delay(budget, url, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(budget, url, response) if response.is_error else None
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def _aget(self, path: str, params: dict[str, Any] | None = None, headers: dict[str, Any] | None = None):
+        base_url = self.base_url.rstrip("/")
+        path = path.lstrip("/")
+        _headers = self._make_headers()
+        if headers:
+            _headers.update(headers)
+        url = f"{base_url}/{path}"
+        cache_entries = self._cache_entries(path, url, params, _headers)
+        if cache_entries and (cached := self._cache_get(cache_entries)) is not None:
+            return cached
+        response = await self._arequest("GET", url, params=params, headers=_headers)
+        self._cache_set(cache_entries, response)
+        return response.json()
+
+    async def _apost(
+        self,
+        path: str,
+        data: dict[str, Any] | list[Any] | None = None,
+        headers: dict[str, Any] | None = None,
+        idempotent: bool = False,
+    ):
+        base_url = self.base_url.rstrip("/")
+        path = path.lstrip("/")
+        _headers = self._make_headers()
+        if headers:
+            _headers.update(headers)
+        response = await self._arequest(
+            "POST", f"{base_url}/{path}", json=data, headers=_headers, idempotent=idempotent
+        )
+        return response.json()
+
+    async def run_tool_async(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a tool body with its HTTP requests awaited on the event loop."""
+        replay_log = _ReplayLog()
+        mismatches = 0
+        while True:
+            replay_log.rewind()
+            token = _replay_log.set(replay_log)
+            waiting: _PendingWait | None = None
+            try:
+                return func(self, *args, **kwargs)
+            except _PendingRequest as request:
+                pending, max_concurrency = [request], None
+            except _PendingRequests as requests:
+                pending, max_concurrency = requests.requests, requests.max_concurrency
+            except _PendingWait as wait:
+                pending, max_concurrency, waiting = [], None, wait
+            finally:
+                _replay_log.reset(token)
+            logs = [request.log for request in pending] if waiting is None else [waiting.log]
+            if any(log.mismatched for log in logs):
+                mismatches += 1
+                if mismatches > MAX_REPLAY_MISMATCHES:
+                    raise RuntimeError(
+                        f"{getattr(func, '__name__', 'The tool')} issues different requests every time it runs, "
+                        "it can't be run asynchronously"
+                    )
+            if waiting is not None:
+                await waiting.wait()
+            else:
+                await self._afetch(pending, max_concurrency)
+
+    async def _afetch(self, pending: list[_PendingRequest], max_concurrency: int | None) -> None:
+        """Send pending requests concurrently and log their outcomes, errors are raised in the replayed body."""
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def fetch(request: _PendingRequest) -> httpx.Response | Exception:
+            try:
+                if semaphore is None:
+                    return await self._arequest(request.method, request.url, **request.kwargs)
+                async with semaphore:
+                    return await self._arequest(request.method, request.url, **request.kwargs)
+            except Exception as e:
+                return e
+
+        outcomes = await asyncio.gather(*(fetch(request) for request in pending))
+        for request, outcome in zip(pending, outcomes, strict=True):
+            request.log.entries.append(_Outcome(request.key, outcome))
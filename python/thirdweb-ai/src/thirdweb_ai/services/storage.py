@@ -9,7 +9,7 @@ from typing import Annotated, Any
 
 from pydantic import BaseModel
 
-from thirdweb_ai.services.service import Service
+from thirdweb_ai.services.service import AsyncService, Service
 from thirdweb_ai.tools.tool import tool
 
 
@@ -48,8 +48,7 @@ class Storage(Service):
         _headers = self._make_headers()
         if headers:
             _headers.update(headers)
-        response = self.client.get(path, params=params, headers=_headers)
-        response.raise_for_status()
+        response = self._request("GET", path, params=params, headers=_headers)
 
         content_type = response.headers.get("Content-Type", "")
 
@@ -76,8 +75,7 @@ class Storage(Service):
         headers = self._make_headers()
         headers.pop("Content-Type", None)
 
-        response = self.client.post(url, files=files, headers=headers)
-        response.raise_for_status()
+        response = self._request("POST", url, files=files, headers=headers)
         return response.json()
 
     def _is_json_serializable(self, data: Any) -> bool:
@@ -199,3 +197,7 @@ class Storage(Service):
             raise TypeError(
                 f"Unsupported data type: {type(data)}. Must be a valid file/directory path, dict, dataclass, or BaseModel."
             ) from e
+
+
+class AsyncStorage(Storage, AsyncService):
+    """Storage service whose tools can run natively on the event loop."""
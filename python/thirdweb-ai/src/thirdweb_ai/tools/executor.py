@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from thirdweb_ai.tools.tool import Tool
+
+DEFAULT_MAX_WORKERS = 32
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: Executor | None = None
+_executor_owned = False
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> Executor:
+    """Return the process-wide executor used to run synchronous tools from async code."""
+    global _executor, _executor_owned  # noqa: PLW0603
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="thirdweb-tool")
+            _executor_owned = True
+        return _executor
+
+
+def set_tool_executor(executor: Executor | None = None, max_workers: int | None = None) -> Executor:
+    """Replace the process-wide tool executor.
+
+    Args:
+        executor: The executor to use. If not provided, a new bounded thread pool is created.
+        max_workers: The size of the thread pool to create when no executor is provided.
+
+    Returns:
+        The executor now in use
+    """
+    global _executor, _executor_owned
+    owned = executor is None
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers or DEFAULT_MAX_WORKERS, thread_name_prefix="thirdweb-tool"
+        )
+    with _executor_lock:
+        previous, previous_owned = _executor, _executor_owned
+        _executor, _executor_owned = executor, owned
+    # only shut down pools we created ourselves, a user supplied executor is theirs to manage
+    if previous is not None and previous_owned:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def result_or_run(future: Future[R], func: Callable[..., R], *args: Any) -> R:
+    """Return the result of ``future``, the call of ``func`` with ``args`` submitted to an executor.
+
+    If the executor has not started the call yet, it is cancelled and run on the calling thread instead, so that a
+    thread of a busy executor waiting for work queued on the same executor cannot deadlock it.
+    """
+    return func(*args) if future.cancel() else future.result()
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    executor: Executor | None = None,
+    max_concurrency: int | None = None,
+) -> list[R]:
+    """Apply ``func`` to every item concurrently on the tool executor, returning the results in order.
+
+    At most ``max_concurrency`` items are in flight at a time. The calling thread takes part: it runs any item the
+    executor has not started by the time its result is needed, see :func:`result_or_run`.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_concurrency == 1:
+        return [func(item) for item in items]
+    executor = executor or get_tool_executor()
+    remaining = iter(items)
+    pending: deque[tuple[T, Future[R]]] = deque()
+
+    def submit_next() -> None:
+        for item in remaining:
+            pending.append((item, executor.submit(func, item)))
+            return
+
+    try:
+        for _ in range(max_concurrency or len(items)):
+            submit_next()
+        results: list[R] = []
+        while pending:
+            item, future = pending.popleft()
+            results.append(result_or_run(future, func, item))
+            submit_next()
+        return results
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+async def run_in_tool_executor(func: Any, *args: Any, executor: Executor | None = None) -> Any:
+    """Run a blocking callable on the tool executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or get_tool_executor(), functools.partial(func, *args))
+
+
+async def run_tool_json_async(tool: "Tool", args: Mapping[str, Any], executor: Executor | None = None) -> Any:
+    """Run a tool from async code.
+
+    Tools that can run natively on the event loop are awaited directly, all other tools are run on a bounded
+    thread pool so that a slow request does not stall other coroutines.
+
+    Args:
+        tool: The tool to run
+        args: The tool arguments
+        executor: The executor to run synchronous tools on. Defaults to the process-wide tool executor.
+
+    Returns:
+        The result of running the tool
+    """
+    if tool.is_async:
+        return await tool.run_json_async(args)
+    return await run_in_tool_executor(tool.run_json, args, executor=executor)
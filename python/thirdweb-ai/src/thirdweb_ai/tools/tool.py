@@ -4,7 +4,7 @@ import functools
 import inspect
 import typing
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from typing import (
     Annotated,
     Any,
@@ -23,6 +23,8 @@ import jsonref
 from pydantic import BaseModel, Field, create_model
 from pydantic_core import PydanticUndefined
 
+from thirdweb_ai.tools.executor import run_in_tool_executor
+
 TOOL_FUNCTION_ATTR_KEY = "__TOOL_FUNCTION"
 
 
@@ -115,6 +117,9 @@ class Tool(Protocol):
     @property
     def strict(self) -> bool: ...
 
+    @property
+    def is_async(self) -> bool: ...
+
     def args_type(self) -> type[BaseModel]: ...
 
     def return_type(self) -> type[Any]: ...
@@ -123,6 +128,15 @@ class Tool(Protocol):
 
     def run_json(self, args: Mapping[str, Any]) -> Any: ...
 
+    async def run_json_async(self, args: Mapping[str, Any]) -> Any: ...
+
+
+@runtime_checkable
+class AsyncToolRunner(Protocol):
+    """Implemented by services that can run tool bodies natively on the event loop."""
+
+    def run_tool_async(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Awaitable[Any]: ...
+
 
 ArgsT = TypeVar("ArgsT", bound=BaseModel, contravariant=True)
 ReturnT = TypeVar("ReturnT", bound=BaseModel, covariant=True)
@@ -189,6 +203,11 @@ class BaseTool(ABC, Tool, Generic[ArgsT, ReturnT]):
     def strict(self) -> bool:
         return self._strict
 
+    @property
+    def is_async(self) -> bool:
+        """Whether the tool can run natively on the event loop without blocking it."""
+        return False
+
     def args_type(self) -> type[BaseModel]:
         return self._args_type
 
@@ -204,6 +223,12 @@ class BaseTool(ABC, Tool, Generic[ArgsT, ReturnT]):
     def run_json(self, args: Mapping[str, Any]) -> Any:
         return self.run(self._args_type.model_validate(args))
 
+    async def run_async(self, args: ArgsT | None = None) -> ReturnT:
+        return await run_in_tool_executor(self.run, args)
+
+    async def run_json_async(self, args: Mapping[str, Any]) -> Any:
+        return await self.run_async(self._args_type.model_validate(args))
+
 
 class FunctionTool(BaseTool[BaseModel, BaseModel]):
     def __init__(
@@ -213,10 +238,12 @@ class FunctionTool(BaseTool[BaseModel, BaseModel]):
         description: str,
         name: str | None = None,
         strict: bool = False,
+        func_execute_async: Callable[..., Awaitable[Any]] | None = None,
     ) -> None:
         self._func_definition = func_definition
         self._signature = get_typed_signature(func_definition)
         self._executor = func_execute
+        self._async_executor = func_execute_async
         func_name = (
             name or func_definition.func.__name__
             if isinstance(func_definition, functools.partial)
@@ -226,7 +253,11 @@ class FunctionTool(BaseTool[BaseModel, BaseModel]):
         return_type = self._signature.return_annotation
         super().__init__(args_model, return_type, func_name, description, strict)
 
-    def run(self, args: BaseModel | None = None) -> Any:
+    @property
+    def is_async(self) -> bool:
+        return self._async_executor is not None
+
+    def _get_kwargs(self, args: BaseModel | None) -> dict[str, Any]:
         kwargs = {}
 
         if args:
@@ -234,7 +265,15 @@ class FunctionTool(BaseTool[BaseModel, BaseModel]):
                 if hasattr(args, name):
                     kwargs[name] = getattr(args, name)
 
-        return self._executor(**kwargs)
+        return kwargs
+
+    def run(self, args: BaseModel | None = None) -> Any:
+        return self._executor(**self._get_kwargs(args))
+
+    async def run_async(self, args: BaseModel | None = None) -> Any:
+        if self._async_executor is None:
+            return await super().run_async(args)
+        return await self._async_executor(**self._get_kwargs(args))
 
 
 def tool(description: str | None = None, name: str | None = None, strict: bool = False) -> Callable[..., Any]:
@@ -246,12 +285,18 @@ def tool(description: str | None = None, name: str | None = None, strict: bool =
 
         @functools.wraps(func)
         def wrapper(cls: Any, description: str | None = None, name: str | None = None):
+            func_execute_async = (
+                (lambda _cls=cls, *args, **kwargs: _cls.run_tool_async(func, *args, **kwargs))
+                if isinstance(cls, AsyncToolRunner)
+                else None
+            )
             return FunctionTool(
                 func_definition=func,
                 func_execute=lambda _cls=cls, *args, **kwargs: func(_cls, *args, **kwargs),
                 description=description or func_description,
                 name=name or func_name,
                 strict=strict,
+                func_execute_async=func_execute_async,
             )
 
         setattr(wrapper, TOOL_FUNCTION_ATTR_KEY, wrapper)
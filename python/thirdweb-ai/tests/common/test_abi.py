@@ -0,0 +1,136 @@
+import httpx
+import pytest
+from eth_abi.abi import encode
+
+from thirdweb_ai.common.abi import AbiDecoder, AbiRegistry
+
+TOKEN = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+SENDER = "0xd8da6bf26964af9d7eed9e03e53415d37aa96045"
+RECIPIENT = "0x000000000000000000000000000000000000dead"
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+ERC20_ABI = [
+    {
+        "type": "event",
+        "name": "Transfer",
+        "anonymous": False,
+        "inputs": [
+            {"name": "from", "type": "address", "indexed": True},
+            {"name": "to", "type": "address", "indexed": True},
+            {"name": "value", "type": "uint256", "indexed": False},
+        ],
+    },
+    {
+        "type": "function",
+        "name": "transfer",
+        "stateMutability": "nonpayable",
+        "inputs": [{"name": "to", "type": "address"}, {"name": "amount", "type": "uint256"}],
+        "outputs": [{"name": "", "type": "bool"}],
+    },
+]
+
+
+def _topic(address: str) -> str:
+    return "0x" + encode(["address"], [address]).hex()
+
+
+def transfer_log(value: int, chain_id: int = 1, address: str = TOKEN) -> dict:
+    return {
+        "chain_id": chain_id,
+        "address": address,
+        "topics": [TRANSFER_TOPIC, _topic(SENDER), _topic(RECIPIENT)],
+        "data": "0x" + encode(["uint256"], [value]).hex(),
+    }
+
+
+class TestAbiDecoder:
+    def test_decode_log(self):
+        decoded = AbiDecoder(ERC20_ABI).decode_log(transfer_log(10**30))
+
+        assert decoded == {
+            "name": "Transfer",
+            "signature": "Transfer(address,address,uint256)",
+            "indexed_params": {"from": SENDER, "to": RECIPIENT},
+            "non_indexed_params": {"value": 10**30},
+        }
+
+    def test_decode_input(self):
+        data = "0xa9059cbb" + encode(["address", "uint256"], [RECIPIENT, 5]).hex()
+
+        decoded = AbiDecoder(ERC20_ABI).decode_input(data)
+
+        assert decoded == {
+            "name": "transfer",
+            "signature": "transfer(address,uint256)",
+            "inputs": {"to": RECIPIENT, "amount": 5},
+        }
+
+    def test_unknown_or_malformed_logs_are_not_decoded(self):
+        decoder = AbiDecoder(ERC20_ABI)
+
+        assert decoder.decode_log({"topics": ["0x" + "00" * 32], "data": "0x"}) is None
+        assert decoder.decode_log({"topics": [], "data": "0x"}) is None
+        assert decoder.decode_log({**transfer_log(1), "data": "0x01"}) is None
+        assert decoder.decode_input("0x12345678") is None
+
+
+class TestAbiRegistry:
+    def test_fetches_each_abi_once(self):
+        fetched: list[tuple[int, str]] = []
+
+        def fetch_abi(chain_id: int, address: str) -> list[dict]:
+            fetched.append((chain_id, address))
+            return ERC20_ABI
+
+        registry = AbiRegistry(fetch_abi)
+
+        decoded = registry.decode_logs([transfer_log(1), transfer_log(2, chain_id=137), transfer_log(3)])
+        registry.decode_logs([transfer_log(4)])
+
+        assert [d["non_indexed_params"]["value"] for d in decoded if d] == [1, 2, 3]
+        assert fetched == [(1, TOKEN.lower()), (137, TOKEN.lower())]
+
+    def test_contracts_without_abi_are_left_undecoded(self):
+        def fetch_abi(chain_id: int, address: str) -> list[dict]:
+            if address == TOKEN.lower():
+                return ERC20_ABI
+            raise ValueError("Contract not verified")
+
+        registry = AbiRegistry(fetch_abi)
+        logs = [transfer_log(1, address=SENDER), transfer_log(2)]
+
+        decoded = list(registry.decode_stream(logs, batch_size=1))
+
+        assert "decoded" not in decoded[0]
+        assert decoded[1]["decoded"]["non_indexed_params"] == {"value": 2}
+
+    def test_only_missing_abis_are_remembered(self):
+        fetched: list[str] = []
+
+        def fetch_abi(chain_id: int, address: str) -> list[dict]:
+            fetched.append(address)
+            request = httpx.Request("GET", f"https://insight.test/v1/contracts/abi/{address}")
+            if address == SENDER:
+                raise httpx.HTTPStatusError("not verified", request=request, response=httpx.Response(404))
+            if fetched.count(address) == 1:
+                raise httpx.HTTPStatusError("rate limited", request=request, response=httpx.Response(429))
+            return ERC20_ABI
+
+        registry = AbiRegistry(fetch_abi)
+        logs = [transfer_log(1, address=SENDER), transfer_log(2)]
+
+        assert registry.decode_logs(logs) == [None, None]
+        decoded = registry.decode_logs(logs)
+
+        assert [d and d["non_indexed_params"] for d in decoded] == [None, {"value": 2}]
+        assert fetched == [SENDER, TOKEN.lower(), TOKEN.lower()]
+
+    @pytest.mark.parametrize("processes", [None, 2])
+    def test_large_batches(self, processes):
+        registry = AbiRegistry(lambda chain_id, address: ERC20_ABI, processes=processes)
+        try:
+            decoded = registry.decode_logs(transfer_log(i, chain_id=1 + i % 3) for i in range(3000))
+        finally:
+            registry.close()
+
+        assert [d["non_indexed_params"]["value"] for d in decoded if d] == list(range(3000))
@@ -0,0 +1,72 @@
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from thirdweb_ai.common.backfill import Backfill, BackfillCheckpoint, Shard, make_job_id, shard_range
+
+
+def _fetch_shard(shard: Shard) -> list[dict]:
+    # finish in random order to check that items are still returned in block order
+    time.sleep(random.random() / 100)
+    return [{"block_number": block} for block in range(shard.from_block, shard.to_block + 1, 3)]
+
+
+def test_shard_range():
+    assert shard_range(10, 34, 10) == [Shard(0, 10, 19), Shard(1, 20, 29), Shard(2, 30, 34)]
+    assert shard_range(5, 5, 10) == [Shard(0, 5, 5)]
+    with pytest.raises(ValueError, match="to_block"):
+        shard_range(10, 9)
+
+
+def test_make_job_id_is_stable():
+    assert make_job_id("events", {"a": 1, "b": 2}) == make_job_id("events", {"b": 2, "a": 1})
+    assert make_job_id("events", {"a": 1}) != make_job_id("events", {"a": 2})
+
+
+class TestBackfill:
+    def test_items_are_returned_in_order(self):
+        backfill = Backfill(_fetch_shard, 0, 999, job_id="job", shard_size=50, workers=8)
+
+        blocks = [item["block_number"] for item in backfill]
+
+        assert blocks == sorted(blocks)
+        assert len(blocks) == sum(len(_fetch_shard(shard)) for shard in shard_range(0, 999, 50))
+
+    def test_resumes_from_checkpoint(self, tmp_path: Path):
+        checkpoint = BackfillCheckpoint(tmp_path / "backfill.db")
+        backfill = Backfill(_fetch_shard, 0, 99, job_id="job", shard_size=10, workers=4, checkpoint=checkpoint)
+
+        consumed = []
+        for item in backfill:
+            consumed.append(item["block_number"])
+            if item["block_number"] >= 45:
+                break
+
+        # shards 0-3 were fully consumed, shard 4 was interrupted
+        assert checkpoint.completed("job") == {0, 1, 2, 3}
+        resumed = Backfill(
+            _fetch_shard, 0, 99, job_id="job", shard_size=10, workers=4, checkpoint=BackfillCheckpoint(checkpoint.path)
+        )
+        assert [shard.number for shard in resumed.remaining()] == list(range(4, 10))
+        assert next(iter(resumed))["block_number"] == 40
+        assert checkpoint.completed("other") == set()
+
+    def test_shard_failure_propagates(self):
+        def fetch_shard(shard: Shard) -> list[dict]:
+            if shard.number == 2:
+                raise RuntimeError("boom")
+            return [{"block_number": shard.from_block}]
+
+        backfill = Backfill(fetch_shard, 0, 99, job_id="job", shard_size=10, workers=2)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            list(backfill)
+
+    def test_processes(self):
+        backfill = Backfill(_fetch_shard, 0, 199, job_id="job", shard_size=50, workers=2, processes=True)
+
+        blocks = [item["block_number"] for item in backfill]
+
+        assert blocks == [block for start in range(0, 200, 50) for block in range(start, start + 50, 3)]
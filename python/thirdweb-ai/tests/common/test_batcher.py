@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from thirdweb_ai.common.batcher import Batcher, map_batched
+
+
+class _Sender:
+    def __init__(self):
+        self.batches: list[tuple[str, list[int]]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, key: str, items: list[int]) -> list[str]:
+        with self.lock:
+            self.batches.append((key, items))
+        return [f"{key}-{item}" for item in items]
+
+
+class TestBatcher:
+    def test_full_batches_are_sent_at_once(self):
+        sender = _Sender()
+        batcher = Batcher(sender, max_batch_size=3, max_delay=60)
+
+        futures = [batcher.submit("a", i) for i in range(6)]
+
+        assert [future.result(timeout=1) for future in futures] == [f"a-{i}" for i in range(6)]
+        assert sender.batches == [("a", [0, 1, 2]), ("a", [3, 4, 5])]
+        batcher.close()
+
+    def test_batches_per_key_after_delay(self):
+        sender = _Sender()
+        batcher = Batcher(sender, max_batch_size=100, max_delay=0.05)
+
+        with ThreadPoolExecutor(4) as executor:
+            futures = list(executor.map(lambda i: batcher.submit("ab"[i % 2], i), range(20)))
+
+        assert [future.result(timeout=5) for future in futures] == [f"{'ab'[i % 2]}-{i}" for i in range(20)]
+        assert sorted((key, sorted(items)) for key, items in sender.batches) == [
+            ("a", list(range(0, 20, 2))),
+            ("b", list(range(1, 20, 2))),
+        ]
+        batcher.close()
+
+    def test_slow_key_does_not_hold_up_others(self):
+        release = threading.Event()
+        sender = _Sender()
+
+        def send(key: str, items: list[int]) -> list[str]:
+            if key == "slow":
+                release.wait(5)
+            return sender(key, items)
+
+        batcher = Batcher(send, max_batch_size=100, max_delay=0.01)
+        slow = batcher.submit("slow", 1)
+        fast = [batcher.submit("fast", i) for i in range(3)]
+
+        assert [future.result(timeout=1) for future in fast] == ["fast-0", "fast-1", "fast-2"]
+        assert not slow.done()
+        release.set()
+        assert slow.result(timeout=5) == "slow-1"
+        batcher.close()
+
+    def test_failed_batch_fails_every_caller(self):
+        def fail(key: str, items: list[int]) -> list[str]:
+            raise RuntimeError("boom")
+
+        batcher = Batcher(fail, max_batch_size=10, max_delay=60)
+        futures = [batcher.submit("a", i) for i in range(2)]
+        batcher.flush()
+
+        for future in futures:
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result(timeout=1)
+        batcher.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("a", 1)
+
+
+class TestMapBatched:
+    def test_dedupes_and_keeps_order(self):
+        batches: list[list[int]] = []
+
+        def send(batch: list[int]) -> list[int]:
+            batches.append(batch)
+            return [item * 10 for item in batch]
+
+        results = map_batched(send, [3, 1, 3, 2, 1, 4], key=lambda item: item, batch_size=2)
+
+        assert results == [30, 10, 30, 20, 10, 40]
+        assert batches == [[3, 1], [2, 4]]
+
+    def test_result_count_mismatch(self):
+        with pytest.raises(ValueError, match="Expected 2 results"):
+            map_batched(lambda batch: batch[:1], [1, 2], key=lambda item: item, batch_size=2)
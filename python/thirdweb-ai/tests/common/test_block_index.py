@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from thirdweb_ai.common.block_index import BlockIndex, parse_time
+
+GENESIS = 1_700_000_000
+HEAD = 1_000
+
+
+class _Chain:
+    """A chain with a block every 12 seconds, answering block queries like the blocks endpoint."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    def __call__(self, chain_id: int, params: dict) -> list[dict]:
+        self.requests.append(params)
+        blocks = [{"block_number": n, "block_timestamp": GENESIS + 12 * n} for n in range(HEAD + 1)]
+        for key, op in (("gt", int.__gt__), ("gte", int.__ge__), ("lt", int.__lt__), ("lte", int.__le__)):
+            if f"filter_block_number_{key}" in params:
+                blocks = [b for b in blocks if op(b["block_number"], params[f"filter_block_number_{key}"])]
+            if f"filter_block_timestamp_{key}" in params:
+                blocks = [b for b in blocks if op(b["block_timestamp"], params[f"filter_block_timestamp_{key}"])]
+        if params["sort_order"] == "desc":
+            blocks.reverse()
+        return blocks[: params["limit"]]
+
+
+class TestParseTime:
+    def test_formats(self):
+        now = 1_735_689_600
+        assert parse_time(now) == now
+        assert parse_time(now * 1000) == now
+        assert parse_time(str(now)) == now
+        assert parse_time("2025-01-01T00:00:00Z") == now
+        assert parse_time("2025-01-01") == now
+        assert parse_time(datetime(2025, 1, 1, tzinfo=timezone.utc)) == now
+        assert parse_time("now", now=now) == now
+        assert parse_time("24h", now=now) == now - 86400
+        assert parse_time("30m ago", now=now) == now - 1800
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="Invalid time"):
+            parse_time("yesterday-ish")
+
+
+class TestBlockIndex:
+    def test_block_range(self):
+        chain = _Chain()
+        index = BlockIndex(chain)
+
+        # block 100 is at GENESIS + 1200, the window ends between blocks 199 and 200
+        assert index.block_range(1, since=GENESIS + 1195, until=GENESIS + 2395) == (100, 199)
+        assert len(chain.requests) == 2
+        assert chain.requests[0]["filter_block_timestamp_gte"] == GENESIS + 1195
+        assert chain.requests[0]["sort_order"] == "asc"
+        assert chain.requests[1]["sort_order"] == "desc"
+
+    def test_answers_locally_between_adjacent_blocks(self):
+        chain = _Chain()
+        index = BlockIndex(chain)
+        index.add(1, [{"block_number": 10, "block_timestamp": GENESIS + 120}])
+        index.add(1, [{"block_number": 11, "block_timestamp": GENESIS + 132}])
+
+        assert index.first_block_at_or_after(1, GENESIS + 125) == 11
+        assert index.last_block_at_or_before(1, GENESIS + 125) == 10
+        assert chain.requests == []
+
+    def test_narrows_lookups_to_known_blocks(self):
+        chain = _Chain()
+        index = BlockIndex(chain)
+        index.add(1, [{"block_number": 10, "block_timestamp": GENESIS + 120}])
+        index.add(1, [{"block_number": 20, "block_timestamp": GENESIS + 240}])
+
+        assert index.first_block_at_or_after(1, GENESIS + 125) == 11
+        assert chain.requests[0]["filter_block_number_gt"] == 10
+        assert chain.requests[0]["filter_block_number_lte"] == 20
+        # the boundary is remembered
+        assert index.first_block_at_or_after(1, GENESIS + 125) == 11
+        assert len(chain.requests) == 1
+        assert len(index) == 3
+
+    def test_future_boundary_is_not_remembered(self):
+        chain = _Chain()
+        index = BlockIndex(chain)
+        future = GENESIS + 12 * HEAD + 60
+
+        assert index.first_block_at_or_after(1, future) is None
+        assert index.first_block_at_or_after(1, future) is None
+        assert len(chain.requests) == 2
+        assert index.block_range(1, until=GENESIS - 1) == (None, None)
+
+    def test_last_block_before_a_future_time_is_looked_up_again(self):
+        chain = _Chain()
+        index = BlockIndex(chain)
+        future = GENESIS + 12 * HEAD + 60
+
+        assert index.last_block_at_or_before(1, future) == HEAD
+        assert index.last_block_at_or_before(1, future) == HEAD
+        assert len(chain.requests) == 2
+
+        # a block after the time is known, the boundary can't change anymore
+        index.add(1, [{"block_number": HEAD + 6, "block_timestamp": future + 12}])
+        assert index.last_block_at_or_before(1, future) == HEAD
+        assert index.last_block_at_or_before(1, future) == HEAD
+        assert len(chain.requests) == 3
@@ -0,0 +1,84 @@
+import time
+from pathlib import Path
+
+from thirdweb_ai.common.cache import MemoryCache, SqliteCache, make_cache_key
+
+
+class TestMakeCacheKey:
+    def test_param_order_is_ignored(self):
+        assert make_cache_key("get", "https://x.test/a", {"b": 1, "a": [2, 3]}) == make_cache_key(
+            "GET", "https://x.test/a", {"a": [2, 3], "b": 1}
+        )
+
+    def test_params_are_part_of_the_key(self):
+        assert make_cache_key("GET", "https://x.test/a", {"a": 1}) != make_cache_key("GET", "https://x.test/a")
+
+
+class TestMemoryCache:
+    def test_hit_and_miss(self):
+        cache = MemoryCache()
+        assert cache.get("a") is None
+        cache.set("a", b"1", ttl=60)
+        assert cache.get("a") == b"1"
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (1, 1, 1, 1)
+
+    def test_expiry(self):
+        cache = MemoryCache()
+        cache.set("a", b"1", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats().entries == 0
+
+    def test_lru_eviction_by_entries(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", b"1", ttl=60)
+        cache.set("b", b"2", ttl=60)
+        cache.get("a")
+        cache.set("c", b"3", ttl=60)
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.stats().evictions == 1
+
+    def test_eviction_by_size(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.set("a", b"12345", ttl=60)
+        cache.set("b", b"123456", ttl=60)
+        assert cache.get("a") is None
+        assert cache.stats().size_bytes == 6
+        cache.set("c", b"x" * 11, ttl=60)
+        assert cache.get("c") is None
+
+
+class TestSqliteCache:
+    def test_persists_across_instances(self, tmp_path: Path):
+        path = tmp_path / "cache.sqlite"
+        SqliteCache(path).set("a", b"1", ttl=60)
+
+        cache = SqliteCache(path)
+        assert cache.get("a") == b"1"
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries, stats.size_bytes) == (1, 1, 1, 1)
+
+    def test_expiry(self, tmp_path: Path):
+        cache = SqliteCache(tmp_path / "cache.sqlite")
+        cache.set("a", b"1", ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+
+    def test_compaction_evicts_least_recently_used(self, tmp_path: Path):
+        cache = SqliteCache(tmp_path / "cache.sqlite", max_bytes=10, compact_interval=1000)
+        cache.set("a", b"12345", ttl=60)
+        time.sleep(0.01)
+        cache.set("b", b"12345", ttl=60)
+        time.sleep(0.01)
+        cache.get("a")
+        cache.set("c", b"12345", ttl=60)
+
+        cache.compact()
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"12345"
+        assert cache.get("c") == b"12345"
+        assert cache.stats().evictions == 1
@@ -0,0 +1,73 @@
+import pytest
+
+from thirdweb_ai.common.columns import Columns, column_kind
+from thirdweb_ai.common.pagination import paginate
+
+MAX_UINT256 = 2**256 - 1
+
+
+def _transactions() -> list[dict]:
+    return [
+        {"hash": "0x01", "block_number": 10, "value": "1000000000000000000", "decoded": {"name": "transfer"}},
+        {"hash": "0x02", "block_number": 11, "value": str(MAX_UINT256), "decoded": None, "topics": ["0xab"]},
+    ]
+
+
+class TestColumns:
+    def test_fills_columns_from_pages(self):
+        pages = [[{"block_number": n, "value": str(n)} for n in range(page * 10, page * 10 + 10)] for page in range(3)]
+
+        columns = Columns.collect(
+            paginate(lambda page, limit: pages[page] if page < 3 else [], limit=10, prefetch=False)
+        )
+
+        assert len(columns) == 30
+        assert columns["block_number"] == list(range(30))
+        assert columns.kinds() == {"block_number": "int", "value": "int"}
+
+    def test_nested_keys_and_late_columns(self):
+        columns = Columns.collect(_transactions(), keys=["hash", "decoded.name"])
+        assert columns.keys == ["hash", "decoded.name"]
+        assert columns["decoded.name"] == ["transfer", None]
+
+        columns = Columns.collect(_transactions())
+        assert columns.keys == ["hash", "block_number", "value", "decoded", "topics"]
+        assert columns["topics"] == [None, ["0xab"]]
+        assert next(columns.rows())["hash"] == "0x01"
+
+    def test_column_kind(self):
+        assert column_kind([1, None, "2"]) == "int"
+        assert column_kind([1, 2.5]) == "float"
+        assert column_kind(["0x1", "2"]) == "str"
+        assert column_kind([None]) == "null"
+        assert column_kind([{"a": 1}, "b"]) == "json"
+
+    def test_to_numpy_keeps_big_ints(self):
+        np = pytest.importorskip("numpy")
+
+        arrays = Columns.collect(_transactions()).to_numpy()
+
+        assert arrays["block_number"].dtype == np.int64
+        assert arrays["block_number"].sum() == 21
+        assert arrays["value"].dtype == object
+        assert arrays["value"][1] == MAX_UINT256
+        assert arrays["topics"][1] == ["0xab"]
+
+    def test_to_arrow_and_parquet(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        columns = Columns.collect(_transactions())
+
+        table = columns.to_arrow()
+        assert table.schema.field("block_number").type == pa.int64()
+        # beyond 76 digits the value is kept as its decimal text
+        assert table.column("value").to_pylist() == ["1000000000000000000", str(MAX_UINT256)]
+        assert table.column("decoded").to_pylist() == ['{"name":"transfer"}', None]
+
+        decimals = Columns.collect([{"a": str(2**100), "b": str(2**200)}]).to_arrow()
+        assert decimals.schema.field("a").type == pa.decimal128(38, 0)
+        assert decimals.schema.field("b").type == pa.decimal256(76, 0)
+        assert int(decimals.column("b")[0].as_py()) == 2**200
+
+        columns.write_parquet(tmp_path / "transactions.parquet")
+        assert pq.read_table(tmp_path / "transactions.parquet").num_rows == 2
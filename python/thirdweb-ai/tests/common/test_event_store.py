@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from thirdweb_ai.common.event_store import EventStore
+
+ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+TRANSFER = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+def _event(block: int, log_index: int = 0, chain_id: int = 1, topic: str = TRANSFER) -> dict:
+    return {
+        "chain_id": chain_id,
+        "address": ADDRESS,
+        "block_number": str(block),
+        "transaction_hash": f"0x{block:064x}",
+        "log_index": log_index,
+        "topics": [topic],
+        "block_timestamp": 1_700_000_000 + block,
+    }
+
+
+class TestEventStore:
+    def test_add_and_query(self, tmp_path: Path):
+        store = EventStore(tmp_path / "events.db")
+
+        assert store.add_events([_event(1), _event(2), _event(2, 1), _event(3, chain_id=137)]) == 4
+        # events are keyed by chain, transaction and log index
+        assert store.add_events([_event(1)]) == 0
+
+        events = store.query([1], ADDRESS.lower())
+        assert [(e["block_number"], e["log_index"]) for e in events] == [("2", 1), ("2", 0), ("1", 0)]
+        assert len(store.query([1, 137], ADDRESS)) == 4
+        assert [e["block_number"] for e in store.query([1], ADDRESS, sort_order="asc", limit=1, offset=1)] == ["2"]
+        assert store.query([1], ADDRESS, from_block=2, to_block=2, topic_0=TRANSFER.upper().replace("0X", "0x"))
+        assert store.query([1], ADDRESS, topic_0="0x" + "0" * 64) == []
+        assert len(store.query([1], ADDRESS, transaction_hash=f"0x{2:064x}")) == 2
+
+    def test_sync_state(self, tmp_path: Path):
+        store = EventStore(tmp_path / "events.db")
+        assert store.sync_state(1, ADDRESS) is None
+
+        store.mark_synced(1, ADDRESS, last_block=100, from_block=50)
+        store.mark_synced(1, ADDRESS.lower(), last_block=90, from_block=60)
+
+        state = store.sync_state(1, ADDRESS)
+        assert state is not None
+        assert (state.from_block, state.last_block) == (50, 100)
+        assert store.sync_state(1, ADDRESS, topic=TRANSFER) is None
+        assert store.sync_state(137, ADDRESS) is None
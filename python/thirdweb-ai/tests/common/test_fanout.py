@@ -0,0 +1,100 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from thirdweb_ai.common.fanout import afan_out, chain_groups, fan_out
+from thirdweb_ai.common.metrics import metrics
+
+
+def _events(chains: list[int], count: int = 30) -> list[dict]:
+    """Events of every chain, interleaved and sorted by timestamp descending like the API would."""
+    events = [
+        {"chain_id": chain, "block_timestamp": 1000 - 7 * i - chain, "block_number": i}
+        for chain in chains
+        for i in range(count)
+    ]
+    return sorted(events, key=lambda e: e["block_timestamp"], reverse=True)
+
+
+def _fetch(requests: list[tuple[list[int], int, int]]):
+    def fetch_page(chains: list[int], page: int, limit: int) -> list[dict]:
+        requests.append((chains, page, limit))
+        return _events(chains)[page * limit : (page + 1) * limit]
+
+    return fetch_page
+
+
+def test_chain_groups():
+    assert chain_groups([1, 2, 3, 4, 5, 6, 7, 1], size=5) == [[1, 2, 3, 4, 5], [6, 7]]
+    assert chain_groups([]) == []
+
+
+class TestFanOut:
+    def test_merges_groups_in_order(self):
+        metrics.reset()
+        chains = list(range(1, 13))
+        requests: list[tuple[list[int], int, int]] = []
+
+        items = list(fan_out(_fetch(requests), chains, sort_by="block_timestamp", limit=25))
+
+        assert len(items) == 12 * 30
+        assert items == _events(chains)
+        assert sorted({tuple(chains) for chains, _, _ in requests}) == [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12)]
+        assert metrics.get_summary("fanout.chain_latency_seconds", chain=11).count == 3
+
+    def test_ascending_and_max_items(self):
+        chains = list(range(1, 8))
+        requests: list[tuple[list[int], int, int]] = []
+
+        def fetch_page(chains: list[int], page: int, limit: int) -> list[dict]:
+            return list(reversed(_fetch(requests)(chains, 0, 1000)))[page * limit : (page + 1) * limit]
+
+        items = list(fan_out(fetch_page, chains, sort_by="block_timestamp", descending=False, max_items=10))
+
+        assert items == list(reversed(_events(chains)))[:10]
+
+    def test_stop_when(self):
+        items = list(
+            fan_out(
+                _fetch([]),
+                list(range(1, 10)),
+                sort_by="block_timestamp",
+                stop_when=lambda e: e["block_timestamp"] < 900,
+            )
+        )
+        assert items
+        assert all(e["block_timestamp"] >= 900 for e in items)
+
+    def test_from_a_thread_of_the_busy_executor(self):
+        chains = list(range(1, 13))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                lambda: list(fan_out(_fetch([]), chains, sort_by="block_timestamp", limit=25, executor=executor))
+            )
+            assert future.result(timeout=5) == _events(chains)
+
+
+class TestAsyncFanOut:
+    @pytest.mark.asyncio
+    async def test_merges_groups_in_order(self):
+        chains = list(range(1, 13))
+        requests: list[tuple[list[int], int, int]] = []
+        fetch = _fetch(requests)
+
+        async def fetch_page(chains: list[int], page: int, limit: int) -> list[dict]:
+            await asyncio.sleep(0)
+            return fetch(chains, page, limit)
+
+        items = [item async for item in afan_out(fetch_page, chains, sort_by="block_timestamp", limit=25)]
+
+        assert items == _events(chains)
+
+    @pytest.mark.asyncio
+    async def test_max_items(self):
+        async def fetch_page(chains: list[int], page: int, limit: int) -> list[dict]:
+            return _events(chains)[page * limit : (page + 1) * limit]
+
+        items = [item async for item in afan_out(fetch_page, list(range(1, 8)), sort_by="block_timestamp", max_items=5)]
+
+        assert items == _events(list(range(1, 8)))[:5]
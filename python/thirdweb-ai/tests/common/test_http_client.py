@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from thirdweb_ai.common.http_client import HttpClientFactory, HttpConfig
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClientFactory:
+    def test_client_is_shared(self):
+        factory = HttpClientFactory()
+        assert factory.get_client() is factory.get_client()
+        factory.close()
+
+    def test_pool_stats(self, server_url: str):
+        factory = HttpClientFactory(HttpConfig(max_connections=10, host_limits={"127.0.0.1": 2}))
+        client = factory.get_client()
+
+        for _ in range(3):
+            assert client.get(f"{server_url}/").json() == {"ok": True}
+
+        stats = {s.host: s for s in factory.stats()}
+        assert set(stats) == {"*", "127.0.0.1"}
+        assert stats["*"].requests == 0
+        assert stats["127.0.0.1"].requests == 3
+        assert stats["127.0.0.1"].max_connections == 2
+        assert stats["127.0.0.1"].connections == 1
+        assert stats["127.0.0.1"].idle_connections == 1
+        assert stats["127.0.0.1"].in_flight == 0
+        assert stats["127.0.0.1"].utilization == 0
+        factory.close()
+
+    @pytest.mark.asyncio
+    async def test_async_client_per_loop(self, server_url: str):
+        factory = HttpClientFactory()
+        client = factory.get_async_client()
+        assert client is factory.get_async_client()
+
+        response = await client.get(f"{server_url}/")
+
+        assert response.json() == {"ok": True}
+        assert [(s.client, s.requests) for s in factory.stats()] == [("async", 1)]
+        await factory.aclose()
+
+    def test_close_closes_the_async_clients_of_every_loop(self):
+        factory = HttpClientFactory()
+        running = asyncio.new_event_loop()
+        thread = threading.Thread(target=running.run_forever, daemon=True)
+        thread.start()
+        stopped = asyncio.new_event_loop()
+
+        async def get_client():
+            return factory.get_async_client()
+
+        on_running = asyncio.run_coroutine_threadsafe(get_client(), running).result(timeout=5)
+        on_stopped = stopped.run_until_complete(get_client())
+
+        factory.close()
+
+        assert on_stopped.is_closed
+        # closed on its own loop
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), running).result(timeout=5)
+        assert on_running.is_closed
+        running.call_soon_threadsafe(running.stop)
+        thread.join(timeout=5)
+        running.close()
+        stopped.close()
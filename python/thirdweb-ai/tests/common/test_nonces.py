@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+
+from thirdweb_ai.common.nonces import NonceManager
+from thirdweb_ai.common.tx_watcher import TransactionWatcher
+
+NOW = 1_700_000_000
+
+
+class _Backend:
+    """Nonce endpoints of a single wallet, recording cancels and resets."""
+
+    def __init__(self, transactions: dict[int, dict | None]):
+        self.transactions = transactions
+        self.cancelled: list[int] = []
+        self.resets: list[tuple[int | None, str | None]] = []
+
+    def get_nonce(self, chain_id=None, backend_wallet_address=None) -> int:
+        return max(self.transactions)
+
+    def get_transactions_by_nonce(self, from_nonce, to_nonce=None, chain_id=None, backend_wallet_address=None):
+        nonces = range(from_nonce, (to_nonce if to_nonce is not None else max(self.transactions)) + 1)
+        return [{"nonce": nonce, "transaction": self.transactions.get(nonce)} for nonce in reversed(nonces)]
+
+    def cancel_nonces(self, to_nonce, chain_id=None, backend_wallet_address=None) -> list[int]:
+        cancelled = [nonce for nonce, tx in self.transactions.items() if nonce <= to_nonce and _unsettled(tx)]
+        self.cancelled.extend(cancelled)
+        return cancelled
+
+    def reset_nonces(self, chain_id=None, backend_wallet_address=None, sync_onchain=True):
+        self.resets.append((chain_id, backend_wallet_address))
+        return {"status": "success", "count": 1}
+
+
+def _unsettled(transaction: dict | None) -> bool:
+    return transaction is None or transaction["status"] not in ("mined", "cancelled")
+
+
+def _sent(age: float, now: float = NOW) -> dict:
+    return {"status": "sent", "sentAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - age))}
+
+
+class _Statuses:
+    """Keeps transactions sent until they are released."""
+
+    def __init__(self):
+        self.mined: set[str] = set()
+
+    def __call__(self, queue_id: str) -> dict:
+        return {"queueId": queue_id, "status": "mined" if queue_id in self.mined else "sent"}
+
+
+def _manager(backend: _Backend, statuses: _Statuses, **kwargs) -> NonceManager:
+    watcher = TransactionWatcher(statuses, min_interval=0.01, max_interval=0.01)
+    return NonceManager(backend, watcher, ["0xa", "0xb"], **kwargs)
+
+
+class TestWalletPool:
+    def test_sends_from_least_loaded_wallet(self):
+        statuses = _Statuses()
+        manager = _manager(_Backend({0: None}), statuses)
+        senders: list[str] = []
+
+        def send(wallet: str) -> str:
+            senders.append(wallet)
+            return f"q{len(senders)}"
+
+        for _ in range(4):
+            manager.submit(137, send)
+
+        assert sorted(senders) == ["0xa", "0xa", "0xb", "0xb"]
+        assert manager.in_flight(137) == {(137, "0xa"): 2, (137, "0xb"): 2}
+
+        statuses.mined.update(["q1", "q2", "q3"])
+        deadline = time.monotonic() + 5
+        while sum(manager.in_flight(137).values()) > 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sum(manager.in_flight(137).values()) == 1
+
+        manager.submit(137, send)
+        assert manager.in_flight(137) == {(137, "0xa"): 1, (137, "0xb"): 1}
+        manager.watcher.close()
+
+    def test_waits_for_a_free_slot(self):
+        statuses = _Statuses()
+        manager = _manager(_Backend({0: None}), statuses, max_in_flight=1)
+        manager.submit(1, lambda wallet: f"q-{wallet}")
+        manager.submit(1, lambda wallet: f"q-{wallet}")
+
+        with pytest.raises(TimeoutError):
+            manager.submit(1, lambda wallet: "never", timeout=0.05)
+
+        threading.Timer(0.05, lambda: statuses.mined.add("q-0xb")).start()
+        assert manager.submit(1, lambda wallet: f"next-{wallet}", timeout=5) == "next-0xb"
+        manager.watcher.close()
+
+    def test_failed_send_frees_its_slot(self):
+        manager = _manager(_Backend({0: None}), _Statuses(), max_in_flight=1)
+
+        def fail(wallet: str) -> str:
+            raise RuntimeError("rejected")
+
+        with pytest.raises(RuntimeError):
+            manager.submit(1, fail)
+        assert manager.in_flight() == {(1, "0xa"): 0}
+        manager.watcher.close()
+
+
+class TestStuckNonces:
+    def test_nonces_up_to_the_oldest_stuck_transaction(self):
+        backend = _Backend(
+            {
+                0: {"status": "mined"},
+                1: None,
+                2: _sent(age=900),
+                3: {"status": "errored"},
+                4: _sent(age=600),
+                5: _sent(age=10),
+            }
+        )
+        manager = _manager(backend, _Statuses(), stuck_after=300)
+
+        assert manager.find_stuck_nonces(1, "0xa", now=NOW) == [1, 2, 3, 4]
+        manager.stuck_after = 1000
+        assert manager.find_stuck_nonces(1, "0xa", now=NOW) == []
+        manager.watcher.close()
+
+    def test_repair_cancels_and_resyncs_stalled_wallets(self):
+        backend = _Backend({0: {"status": "mined"}, 1: _sent(age=900, now=time.time()), 2: None})
+        manager = _manager(backend, _Statuses(), stuck_after=0.05)
+        manager.submit(1, lambda wallet: "q1")
+
+        assert manager.stalled() == []
+        time.sleep(0.1)
+        assert manager.stalled() == [(1, "0xa")]
+
+        # nonce 2 waits for nonce 1 but is not stuck itself
+        assert manager.repair_stalled() == {(1, "0xa"): [1]}
+        assert backend.resets == [(1, "0xa")]
+        manager.watcher.close()
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from thirdweb_ai.common.pagination import apaginate, paginate
+
+
+class _Pages:
+    """Serves ``total`` numbered items, recording the pages requested."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requested: list[tuple[int, int]] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, page: int, limit: int) -> list[dict]:
+        with self.lock:
+            self.requested.append((page, limit))
+        start = page * limit
+        return [{"n": n} for n in range(start, min(start + limit, self.total))]
+
+
+class TestPaginate:
+    def test_iterates_over_all_pages(self):
+        pages = _Pages(25)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            items = [item["n"] for item in paginate(pages, limit=10, executor=executor)]
+        assert items == list(range(25))
+        assert sorted(pages.requested) == [(0, 10), (1, 10), (2, 10)]
+
+    def test_full_last_page_needs_an_empty_page(self):
+        pages = _Pages(20)
+        assert len(list(paginate(pages, limit=10, prefetch=False))) == 20
+        assert pages.requested == [(0, 10), (1, 10), (2, 10)]
+
+    def test_max_items_limits_requests(self):
+        pages = _Pages(1000)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            items = list(paginate(pages, limit=10, max_items=15, executor=executor))
+        assert len(items) == 15
+        assert sorted(pages.requested) == [(0, 10), (1, 10)]
+
+        pages = _Pages(1000)
+        assert len(list(paginate(pages, limit=100, max_items=5))) == 5
+        assert pages.requested == [(0, 5)]
+
+    def test_stop_when(self):
+        pages = _Pages(100)
+        items = list(paginate(pages, limit=10, stop_when=lambda item: item["n"] >= 12, prefetch=False))
+        assert [item["n"] for item in items] == list(range(12))
+        assert pages.requested == [(0, 10), (1, 10)]
+
+    def test_prefetches_the_next_page(self):
+        pages = _Pages(100)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            iterator = paginate(pages, limit=10, executor=executor)
+            next(iterator)
+            executor.submit(lambda: None).result()
+            assert sorted(pages.requested) == [(0, 10), (1, 10)]
+            iterator.close()
+
+    def test_prefetch_from_a_thread_of_the_busy_executor(self):
+        pages = _Pages(35)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # the only worker iterates, the prefetched pages can't start and are fetched inline
+            future = executor.submit(lambda: [item["n"] for item in paginate(pages, limit=10, executor=executor)])
+            assert future.result(timeout=5) == list(range(35))
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError, match="limit must be positive"):
+            list(paginate(_Pages(1), limit=0))
+
+
+class TestAsyncPaginate:
+    @pytest.mark.asyncio
+    async def test_iterates_over_all_pages(self):
+        pages = _Pages(25)
+
+        async def fetch(page: int, limit: int) -> list[dict]:
+            await asyncio.sleep(0)
+            return pages(page, limit)
+
+        items = [item["n"] async for item in apaginate(fetch, limit=10)]
+        assert items == list(range(25))
+        assert sorted(pages.requested) == [(0, 10), (1, 10), (2, 10)]
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_the_prefetch(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fetch(page: int, limit: int) -> list[dict]:
+            if page == 0:
+                return [{"n": n} for n in range(limit)]
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return []
+
+        iterator = apaginate(fetch, limit=10)
+        async for _ in iterator:
+            await started.wait()
+            break
+        await iterator.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
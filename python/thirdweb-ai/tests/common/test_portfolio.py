@@ -0,0 +1,30 @@
+from thirdweb_ai.common.portfolio import BalanceRequest, BalanceUpdate, Portfolio
+
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+WALLET_A = "0x000000000000000000000000000000000000000a"
+WALLET_B = "0x000000000000000000000000000000000000000b"
+
+
+def _usdc(balance: int, chain_id: int = 1) -> dict:
+    return {"chain_id": chain_id, "token_address": USDC, "balance": str(balance), "symbol": "USDC", "decimals": 6}
+
+
+class TestPortfolio:
+    def test_aggregates_and_values_positions(self):
+        portfolio = Portfolio()
+        portfolio.add(BalanceUpdate(BalanceRequest(WALLET_A, [1, 137], "erc20"), [_usdc(3_000_000), _usdc(1, 137)]))
+        portfolio.add(BalanceUpdate(BalanceRequest(WALLET_B, [1, 137], "erc20"), [_usdc(1_000_000)]))
+        portfolio.add(BalanceUpdate(BalanceRequest(WALLET_B, [1], "erc721"), [], error="HTTPStatusError: 500"))
+
+        portfolio.apply_prices([{"chain_id": 1, "address": USDC.upper().replace("0X", "0x"), "price_usd": 0.5}])
+
+        assert portfolio.fungible_tokens() == [(1, USDC), (137, USDC)]
+        assert portfolio.total_value_usd == 2.0
+        assert portfolio.value_by_chain() == {1: 2.0, 137: 0.0}
+        assert portfolio.value_by_wallet() == {WALLET_A: 1.5, WALLET_B: 0.5}
+        summary = portfolio.to_dict(max_positions=1)
+        assert summary["position_count"] == 2
+        assert summary["positions"][0]["wallets"] == {WALLET_A: "3000000", WALLET_B: "1000000"}
+        assert summary["errors"] == [
+            {"owner": WALLET_B, "chain_ids": [1], "token_type": "erc721", "error": "HTTPStatusError: 500"}
+        ]
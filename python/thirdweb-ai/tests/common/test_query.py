@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from thirdweb_ai.common.query import EventQuery
+
+ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+TRANSFER = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+class TestEventQuery:
+    def test_defaults(self):
+        assert EventQuery().to_params() == {"sort_by": "block_number", "sort_order": "desc", "decode": True}
+
+    def test_builder(self):
+        query = (
+            EventQuery()
+            .on_chains(1, 137)
+            .emitted_by(ADDRESS.lower())
+            .with_topic(0, TRANSFER)
+            .blocks(from_block=100)
+            .between(datetime(2025, 1, 1, tzinfo=timezone.utc), 1_738_368_000)
+            .grouped_by("toStartOfDay(block_timestamp) AS day")
+            .aggregated("count() AS count")
+            .sorted("block_timestamp", "asc")
+            .paged(2, limit=50)
+        )
+
+        assert query.to_params() == {
+            "sort_by": "block_timestamp",
+            "sort_order": "asc",
+            "decode": True,
+            "chain": [1, 137],
+            "filter_address": ADDRESS,
+            "filter_topic_0": TRANSFER,
+            "filter_block_number_gte": 100,
+            "filter_block_timestamp_gte": 1_735_689_600,
+            "filter_block_timestamp_lte": 1_738_368_000,
+            "group_by": ["toStartOfDay(block_timestamp) AS day"],
+            "aggregate": ["count() AS count"],
+            "page": 2,
+            "limit": 50,
+        }
+
+    def test_queries_are_immutable(self):
+        query = EventQuery()
+        query.with_topic(1, TRANSFER)
+        assert query.topics == (None, None, None, None)
+
+    def test_validation(self):
+        with pytest.raises(ValueError, match="Invalid topic index"):
+            EventQuery().with_topic(4, TRANSFER)
+        with pytest.raises(ValueError, match="Invalid transaction hash"):
+            EventQuery().with_topic(0, "0x1234")
+        with pytest.raises(ValueError, match="Invalid blockchain address"):
+            EventQuery().emitted_by("0x1234")
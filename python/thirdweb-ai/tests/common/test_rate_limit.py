@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.rate_limit import AdaptiveConcurrencyLimit, RateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    def test_burst_is_free_then_rate_applies(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+        # callers queue behind each other
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError, match="rate must be positive"):
+            TokenBucket(rate=0)
+
+    @pytest.mark.asyncio
+    async def test_acquire_async_waits(self):
+        bucket = TokenBucket(rate=20, burst=1)
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+        assert time.monotonic() - started >= 0.09
+
+
+class TestAdaptiveConcurrencyLimit:
+    def test_additive_increase_multiplicative_decrease(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=4, cooldown=0)
+        for _ in range(6):
+            limit.acquire()
+            limit.release(200, 0.01)
+        assert limit.limit == 5
+
+        limit.acquire()
+        limit.release(429, 0.01)
+        assert limit.limit == 2
+
+    def test_slow_responses_decrease_the_limit(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=8, latency_threshold=1.0, cooldown=0)
+        limit.acquire()
+        limit.release(200, 2.0)
+        assert limit.limit == 4
+
+    def test_decreases_once_per_cooldown(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=8, cooldown=60)
+        for _ in range(3):
+            limit.acquire()
+        for _ in range(3):
+            limit.release(429, 0.01)
+        assert limit.limit == 4
+
+    def test_never_below_min_limit(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=2, min_limit=1, cooldown=0)
+        for _ in range(5):
+            limit.acquire()
+            limit.release(429, 0.01)
+        assert limit.limit == 1
+
+    def test_callers_over_the_limit_wait(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=2)
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal peak
+            limit.acquire()
+            with lock:
+                peak = max(peak, limit.in_flight)
+            time.sleep(0.02)
+            limit.release(200, 0.02)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: work(), range(8)))
+        assert peak <= limit.max_limit
+        assert peak <= 3
+        assert limit.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_async_waiters_are_woken(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=1)
+        order = []
+
+        async def work(i: int):
+            await limit.acquire_async()
+            order.append(i)
+            await asyncio.sleep(0.01)
+            limit.release(200, 0.01)
+
+        await asyncio.gather(*(work(i) for i in range(4)))
+        assert order == [0, 1, 2, 3]
+        assert limit.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=1)
+        await limit.acquire_async()
+        waiter = asyncio.create_task(limit.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limit.release(200, 0.01)
+        assert limit.in_flight == 0
+
+
+class TestRateLimiter:
+    def test_endpoint_limits_and_wait_metrics(self):
+        metrics.reset()
+        limiter = RateLimiter(endpoints={"events*": 4})
+
+        started = time.monotonic()
+        for _ in range(5):
+            with limiter.slot("/events/0xabc", service="Insight") as slot:
+                slot.status_code = 200
+        assert time.monotonic() - started >= 0.2
+
+        with limiter.slot("/tokens/price", service="Insight") as slot:
+            assert slot.endpoint == "*"
+
+        waits = metrics.get_summary("ratelimit.wait_seconds", service="Insight", endpoint="events*")
+        assert waits.count == 5
+        assert waits.total >= 0.2
+
+    def test_endpoint_limits_use_the_burst(self):
+        limiter = RateLimiter(burst=3, endpoints={"events*": 100, "tokens/*": (100, 1)})
+        assert [limiter.endpoint_buckets[pattern].burst for pattern in ("events*", "tokens/*")] == [3, 1]
+
+    def test_slot_reports_status_to_concurrency_limit(self):
+        concurrency = AdaptiveConcurrencyLimit(initial_limit=4, cooldown=0)
+        limiter = RateLimiter(concurrency=concurrency)
+        with limiter.slot("/events") as slot:
+            assert concurrency.in_flight == 1
+            slot.status_code = 429
+        assert concurrency.in_flight == 0
+        assert concurrency.limit == 2
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+
+from thirdweb_ai.common.retry import RetryPolicy, parse_retry_after
+
+
+def _response(status: int, retry_after: str | None = None) -> httpx.Response:
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return httpx.Response(status, headers=headers)
+
+
+class TestParseRetryAfter:
+    def test_missing(self):
+        assert parse_retry_after(_response(429)) is None
+
+    def test_seconds(self):
+        assert parse_retry_after(_response(429, "3")) == 3.0
+
+    def test_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = parse_retry_after(_response(503, format_datetime(retry_at, usegmt=True)))
+        assert delay is not None
+        assert 25 <= delay <= 30
+
+    def test_invalid(self):
+        assert parse_retry_after(_response(429, "soon")) is None
+
+
+class TestRetryBudget:
+    def test_only_retryable_statuses(self):
+        budget = RetryPolicy(backoff_base=0).start()
+        assert budget.next_delay(_response(404)) is None
+        assert budget.next_delay(_response(429)) == 0
+
+    def test_max_retries(self):
+        budget = RetryPolicy(max_retries=2, backoff_base=0).start()
+        assert budget.next_delay(_response(502)) == 0
+        assert budget.next_delay(None) == 0
+        assert budget.next_delay(_response(502)) is None
+
+    def test_retry_after_is_honored(self):
+        budget = RetryPolicy(backoff_base=0).start()
+        assert budget.next_delay(_response(429, "2")) == 2.0
+
+    def test_retry_after_beyond_limit_fails_fast(self):
+        budget = RetryPolicy(max_retry_after=5).start()
+        assert budget.next_delay(_response(429, "30")) is None
+
+    def test_max_wait(self):
+        budget = RetryPolicy(max_wait=3, backoff_base=0).start()
+        assert budget.next_delay(_response(429, "2")) == 2.0
+        assert budget.next_delay(_response(429, "2")) is None
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=4)
+        assert all(0 <= policy.backoff(attempt) <= 4 for attempt in range(10))
@@ -0,0 +1,54 @@
+import pytest
+
+from thirdweb_ai.common.selector_db import SelectorDatabase, default_selectors, encode_database
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+
+class TestSelectorDatabase:
+    def test_bundled_signatures(self):
+        assert default_selectors.lookup("0xa9059cbb") == ["transfer(address,uint256)"]
+        assert default_selectors.lookup("0x095EA7B3") == ["approve(address,uint256)"]
+        assert default_selectors.lookup(TRANSFER_TOPIC) == ["Transfer(address,address,uint256)"]
+        assert default_selectors.lookup("0x12345678") == []
+
+    def test_build_and_open(self, tmp_path):
+        signatures = ["transfer(address,uint256)", "approve(address, uint256)", "Transfer(address,address,uint256)"]
+        SelectorDatabase.build(tmp_path / "selectors.db", signatures)
+
+        database = SelectorDatabase.open(tmp_path / "selectors.db")
+
+        assert len(database) == 3
+        assert database.lookup_many(["0xa9059cbb", "0x095ea7b3", "0xa9059cbb", "0x70a08231"]) == {
+            "0xa9059cbb": ["transfer(address,uint256)"],
+            "0x095ea7b3": ["approve(address,uint256)"],
+            "0x70a08231": [],
+        }
+
+    def test_loads_lazily(self):
+        loads: list[int] = []
+
+        def load() -> bytes:
+            loads.append(1)
+            return encode_database(["transfer(address,uint256)"])
+
+        database = SelectorDatabase(load)
+        assert loads == []
+
+        database.lookup("0xa9059cbb")
+        database.lookup("0xa9059cbb")
+        assert loads == [1]
+
+    def test_selector_collisions(self):
+        # both signatures hash to 0x42966c68
+        database = SelectorDatabase.from_signatures(["burn(uint256)", "collate_propagate_storage(bytes16)"])
+
+        assert sorted(database.lookup("0x42966c68")) == ["burn(uint256)", "collate_propagate_storage(bytes16)"]
+
+    def test_invalid_input(self, tmp_path):
+        (tmp_path / "other.db").write_bytes(b"not a database")
+
+        with pytest.raises(ValueError, match="Invalid selector"):
+            default_selectors.lookup("0x1234")
+        with pytest.raises(ValueError, match="Not a selector database"):
+            SelectorDatabase.open(tmp_path / "other.db").lookup("0xa9059cbb")
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from thirdweb_ai.common.singleflight import AsyncSingleFlight, SingleFlight, make_request_key
+
+
+class TestMakeRequestKey:
+    def test_headers_are_part_of_the_key(self):
+        url = "https://insight.thirdweb.com/v1/events"
+        assert make_request_key("GET", url, {"a": 1}, {"X-Secret-Key": "a"}) == make_request_key(
+            "GET", url, {"a": 1}, {"X-Secret-Key": "a"}
+        )
+        assert make_request_key("GET", url, {"a": 1}, {"X-Secret-Key": "a"}) != make_request_key(
+            "GET", url, {"a": 1}, {"X-Secret-Key": "b"}
+        )
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_are_shared(self):
+        group: SingleFlight[int] = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def work() -> int:
+            calls.append(1)
+            started.set()
+            release.wait(timeout=5)
+            return 42
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(group.do, "key", work) for _ in range(5)]
+            assert started.wait(timeout=5)
+            # give the followers time to join the call in flight
+            time.sleep(0.1)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert {result for result, _ in results} == {42}
+
+    def test_errors_reach_every_waiter(self):
+        group: SingleFlight[int] = SingleFlight()
+        release = threading.Event()
+
+        def fail() -> int:
+            release.wait(timeout=5)
+            raise ValueError("upstream failed")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(group.do, "key", fail) for _ in range(3)]
+            time.sleep(0.1)
+            release.set()
+            for future in futures:
+                with pytest.raises(ValueError, match="upstream failed"):
+                    future.result()
+
+    def test_sequential_calls_are_not_shared(self):
+        group: SingleFlight[int] = SingleFlight()
+        assert group.do("key", lambda: 1) == (1, False)
+        assert group.do("key", lambda: 2) == (2, False)
+
+
+class TestAsyncSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_shared(self):
+        group: AsyncSingleFlight[int] = AsyncSingleFlight()
+        calls = []
+
+        async def work() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(group.do("key", work) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert [result for result, _ in results] == [42] * 5
+        assert sum(shared for _, shared in results) == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        group: AsyncSingleFlight[int] = AsyncSingleFlight()
+
+        async def fail() -> int:
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        results = await asyncio.gather(*(group.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_waiters(self):
+        group: AsyncSingleFlight[int] = AsyncSingleFlight()
+        calls = []
+
+        async def work() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 42
+
+        leader = asyncio.create_task(group.do("key", work))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(group.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        results = await asyncio.gather(*waiters)
+
+        assert leader.cancelled()
+        assert [result for result, _ in results] == [42] * 3
+        # one of the waiters made the call again, the others shared it
+        assert len(calls) == 2
+        assert sum(shared for _, shared in results) == 2
@@ -0,0 +1,62 @@
+import threading
+
+from thirdweb_ai.common.tx_watcher import TransactionWatcher
+
+
+class _Statuses:
+    """Moves every transaction from queued to sent to its final status, one step per poll."""
+
+    def __init__(self, final: dict[str, str]):
+        self.final = final
+        self.polls: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, queue_id: str) -> dict:
+        with self.lock:
+            polls = self.polls[queue_id] = self.polls.get(queue_id, 0) + 1
+        steps = ["queued", "sent", self.final.get(queue_id, "sent")]
+        return {"queueId": queue_id, "status": steps[min(polls, len(steps)) - 1], "chainId": "137"}
+
+
+def _watcher(statuses: _Statuses) -> TransactionWatcher:
+    return TransactionWatcher(statuses, min_interval=0.01, max_interval=0.02)
+
+
+class TestTransactionWatcher:
+    def test_wait_until_final(self):
+        statuses = _Statuses({"a": "mined", "b": "errored"})
+        watcher = _watcher(statuses)
+        seen: list[str] = []
+
+        watcher.watch("a", callback=lambda status: seen.append(status["status"]))
+        out = watcher.wait(["a", "b", "a"], timeout=5)
+
+        assert {queue_id: status["status"] for queue_id, status in out.items()} == {"a": "mined", "b": "errored"}
+        assert seen == ["mined"]
+        assert statuses.polls == {"a": 3, "b": 3}
+        assert watcher.pending == []
+        watcher.close()
+
+    def test_timeout_returns_last_status(self):
+        watcher = _watcher(_Statuses({}))
+
+        out = watcher.wait(["stuck"], timeout=0.2)
+
+        assert out["stuck"]["status"] == "sent"
+        assert watcher.pending == ["stuck"]
+        watcher.close()
+
+    def test_failed_polls_are_retried(self):
+        calls = []
+
+        def flaky(queue_id: str) -> dict:
+            calls.append(queue_id)
+            if len(calls) < 3:
+                raise ConnectionError("down")
+            return {"queueId": queue_id, "status": "mined"}
+
+        watcher = TransactionWatcher(flaky, min_interval=0.01, max_interval=0.02)
+
+        assert watcher.watch("a").result(timeout=5)["status"] == "mined"
+        assert len(calls) == 3
+        watcher.close()
@@ -1,6 +1,14 @@
 import pytest
 
-from thirdweb_ai.common.utils import normalize_chain_id
+from thirdweb_ai.common.utils import match_path, normalize_chain_id
+
+
+class TestMatchPath:
+    def test_first_match_wins(self):
+        ttls = {"resolve/0x????????": 100.0, "resolve/*": 1.0}
+        assert match_path("/resolve/0x095ea7b3", ttls) == ("resolve/0x????????", 100.0)
+        assert match_path("resolve/vitalik.eth", ttls) == ("resolve/*", 1.0)
+        assert match_path("events", ttls) is None
 
 
 class TestNormalizeChainId:
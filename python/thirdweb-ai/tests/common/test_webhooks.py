@@ -0,0 +1,85 @@
+import json
+import time
+
+import httpx
+import pytest
+
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.webhooks import WebhookReceiver, sign_webhook, verify_webhook
+
+SECRET = "whsec"
+
+
+def _signed(payload: dict, secret: str = SECRET, timestamp: int | None = None) -> tuple[bytes, dict[str, str]]:
+    body = json.dumps(payload).encode()
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    headers = {"X-Engine-Timestamp": str(timestamp), "X-Engine-Signature": sign_webhook(body, timestamp, secret)}
+    return body, headers
+
+
+class TestSignatures:
+    def test_verify(self):
+        body = b'{"queueId":"q1"}'
+        signature = sign_webhook(body, 1_700_000_000, SECRET)
+
+        assert verify_webhook(body, "1700000000", signature, SECRET, now=1_700_000_010)
+        assert not verify_webhook(body, "1700000000", signature, "other", now=1_700_000_010)
+        assert not verify_webhook(body + b" ", "1700000000", signature, SECRET, now=1_700_000_010)
+        assert not verify_webhook(body, "1700000000", signature, SECRET, now=1_700_001_000)
+        assert not verify_webhook(body, None, signature, SECRET)
+
+
+class TestWebhookReceiver:
+    @pytest.mark.asyncio
+    async def test_dispatches_verified_notifications(self):
+        receiver = WebhookReceiver([SECRET])
+        transactions = receiver.subscribe("transaction")
+        events = receiver.subscribe("event-log")
+        seen: list[dict] = []
+        receiver.add_listener("transaction", seen.append)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=receiver), base_url="http://local") as client:
+            body, headers = _signed({"queueId": "q1", "status": "mined"})
+            response = await client.post("/", content=body, headers=headers)
+            assert response.json() == {"received": "transaction"}
+
+            body, headers = _signed({"type": "event-log", "data": {"eventName": "Transfer"}})
+            assert (await client.post("/", content=body, headers=headers)).status_code == 200
+
+            body, headers = _signed({"queueId": "q2", "status": "mined"}, secret="forged")
+            assert (await client.post("/", content=body, headers=headers)).status_code == 401
+            body, headers = _signed({"queueId": "q3", "status": "mined"}, timestamp=1)
+            assert (await client.post("/", content=body, headers=headers)).status_code == 401
+            assert (await client.get("/")).status_code == 405
+
+        assert transactions.get_nowait()["queueId"] == "q1"
+        assert transactions.empty()
+        assert events.get_nowait()["data"]["eventName"] == "Transfer"
+        assert [payload["queueId"] for payload in seen] == ["q1"]
+
+    def test_full_queue_drops_oldest(self):
+        receiver = WebhookReceiver(max_queue_size=2)
+        notifications = receiver.subscribe("transaction")
+
+        for i in range(3):
+            receiver.dispatch({"queueId": f"q{i}", "status": "sent"})
+
+        assert [notifications.get_nowait()["queueId"] for _ in range(2)] == ["q1", "q2"]
+
+    def test_failing_listener_does_not_stop_dispatch(self):
+        metrics.reset()
+        receiver = WebhookReceiver()
+        seen: list[str] = []
+
+        def fail(payload: dict) -> None:
+            raise RuntimeError("boom")
+
+        receiver.add_listener("transaction", fail)
+        receiver.add_listener("transaction", lambda payload: seen.append(payload["queueId"]))
+        notifications = receiver.subscribe("transaction")
+
+        assert receiver.dispatch({"queueId": "q1", "status": "mined"}) == "transaction"
+
+        assert seen == ["q1"]
+        assert notifications.get_nowait()["queueId"] == "q1"
+        assert metrics.get_counter("webhooks.listener_errors", kind="transaction") == 1
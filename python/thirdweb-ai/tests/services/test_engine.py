@@ -0,0 +1,269 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from thirdweb_ai.common.webhooks import WebhookReceiver, sign_webhook
+from thirdweb_ai.services.engine import AsyncEngine, Engine
+
+WALLET = "0x000000000000000000000000000000000000dEaD"
+RECIPIENT = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+
+
+class _Engine:
+    """Answers Engine requests with sequential queue IDs, recording every request."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.lock = threading.Lock()
+        self.next_id = 0
+
+    def _queue_ids(self, count: int) -> list[str]:
+        with self.lock:
+            ids = [f"q{self.next_id + i}" for i in range(count)]
+            self.next_id += count
+        return ids
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.requests.append(request)
+        body = json.loads(request.content or b"null")
+        if request.url.path.endswith("/read-batch"):
+            results = [{"success": True, "result": f"{c['functionName']}{c['args']}"} for c in body["calls"]]
+            return httpx.Response(200, json={"results": results})
+        if request.url.path.endswith("/send-transaction-batch"):
+            return httpx.Response(200, json={"result": {"queueIds": self._queue_ids(len(body))}})
+        return httpx.Response(200, json={"result": {"queueId": self._queue_ids(1)[0]}})
+
+
+def _engine(handler: _Engine) -> Engine:
+    engine = Engine(
+        engine_url="https://engine.test", engine_auth_jwt="jwt", chain_id=137, backend_wallet_address=WALLET
+    )
+    engine.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return engine
+
+
+class TestTransactionBatching:
+    def test_concurrent_sends_are_coalesced(self):
+        handler = _Engine()
+        engine = _engine(handler)
+        engine.enable_transaction_batching(max_batch_size=10, max_delay=0.05)
+        send = engine.send_transaction()
+
+        def run(i: int) -> str:
+            arguments = {"to_address": RECIPIENT, "value": str(i), "data": "0x", "chain_id": 137}
+            return send.run_json(arguments)["result"]["queueId"]
+
+        with ThreadPoolExecutor(10) as executor:
+            queue_ids = list(executor.map(run, range(20)))
+
+        assert len(set(queue_ids)) == 20
+        assert len(handler.requests) == 2
+        assert all(r.url.path == "/backend-wallet/137/send-transaction-batch" for r in handler.requests)
+        sent = [tx for r in handler.requests for tx in json.loads(r.content)]
+        assert sorted(int(tx["value"]) for tx in sent) == list(range(20))
+        assert handler.requests[0].headers["X-Backend-Wallet-Address"] == WALLET
+        engine.transaction_batcher.close()
+
+    def test_atomic_batch_tool(self):
+        handler = _Engine()
+        engine = _engine(handler)
+
+        out = engine.send_transaction_batch().run_json(
+            {
+                "transactions": [{"toAddress": RECIPIENT, "value": "1", "data": "0x"}] * 3,
+                "atomic": True,
+            }
+        )
+
+        assert out == {"result": {"queueIds": ["q0", "q0", "q0"]}}
+        assert handler.requests[0].url.path == "/backend-wallet/137/send-transaction-batch-atomic"
+        assert len(json.loads(handler.requests[0].content)["transactions"]) == 3
+
+    def test_large_batches_are_chunked_in_order(self):
+        handler = _Engine()
+        engine = _engine(handler)
+        transactions = [{"toAddress": RECIPIENT, "value": str(i), "data": "0x"} for i in range(120)]
+
+        queue_ids = engine.send_transactions(transactions, max_batch_size=50)
+
+        assert len(queue_ids) == 120
+        assert len(handler.requests) == 3
+        values = {tx["value"]: queue_ids[i] for i, tx in enumerate(transactions)}
+        assert len(set(values.values())) == 120
+
+
+class TestReadContracts:
+    def test_calls_are_deduplicated_chunked_and_ordered(self):
+        handler = _Engine()
+        engine = _engine(handler)
+        calls = [(RECIPIENT, "balanceOf", [f"0x{i % 30:040x}"]) for i in range(60)]
+
+        results = engine.read_contracts(calls, batch_size=10)
+
+        assert [r["result"] for r in results] == [f"balanceOf['0x{i % 30:040x}']" for i in range(60)]
+        assert len(handler.requests) == 3
+        assert all(r.url.path == "/contract/137/read-batch" for r in handler.requests)
+
+    def test_read_contract_batch_tool(self):
+        handler = _Engine()
+        engine = _engine(handler)
+
+        out = engine.read_contract_batch().run_json(
+            {
+                "calls": [
+                    {"contractAddress": RECIPIENT, "functionName": "totalSupply", "args": []},
+                    {"contractAddress": RECIPIENT.lower(), "functionName": "totalSupply"},
+                ],
+                "chain_id": 1,
+            }
+        )
+
+        assert out == {"results": [{"success": True, "result": "totalSupply[]"}] * 2}
+        assert handler.requests[0].url.path == "/contract/1/read-batch"
+        assert len(json.loads(handler.requests[0].content)["calls"]) == 1
+
+
+def _mined_on_second_poll(polls: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        queue_id = request.url.path.rsplit("/", 1)[-1]
+        polls.append(queue_id)
+        status = "mined" if polls.count(queue_id) > 1 else "sent"
+        return httpx.Response(
+            200, json={"result": {"queueId": queue_id, "status": status, "transactionHash": "0x01", "data": "0x"}}
+        )
+
+    return handler
+
+
+class TestWaitForTransactions:
+    def test_waits_until_mined(self):
+        polls: list[str] = []
+        handler = _mined_on_second_poll(polls)
+        engine = Engine(engine_url="https://engine.test", engine_auth_jwt="jwt", chain_id=137)
+        engine.client = httpx.Client(transport=httpx.MockTransport(handler))
+        engine.transaction_watcher.min_interval = engine.transaction_watcher.max_interval = 0.01
+
+        out = engine.wait_for_transactions().run_json({"queue_ids": ["q1", "q2"], "timeout_seconds": 5})
+
+        assert out["pending"] == []
+        assert out["result"]["q1"]["status"] == "mined"
+        assert "data" not in out["result"]["q1"]
+        assert sorted(polls) == ["q1", "q1", "q2", "q2"]
+        engine.transaction_watcher.close()
+
+    @pytest.mark.asyncio
+    async def test_waits_until_mined_on_the_event_loop(self):
+        polls: list[str] = []
+        engine = AsyncEngine(engine_url="https://engine.test", engine_auth_jwt="jwt", chain_id=137)
+        # the watcher polls from its own thread
+        engine.client = httpx.Client(transport=httpx.MockTransport(_mined_on_second_poll(polls)))
+        engine.transaction_watcher.min_interval = engine.transaction_watcher.max_interval = 0.01
+
+        out = await engine.wait_for_transactions().run_json_async({"queue_ids": ["q1", "q2"], "timeout_seconds": 5})
+
+        assert out["pending"] == []
+        assert out["result"]["q2"]["status"] == "mined"
+        engine.transaction_watcher.close()
+
+
+class TestWebhookReceiver:
+    @pytest.mark.asyncio
+    async def test_pushed_status_resolves_watched_transaction(self):
+        requests: list[tuple[str, dict]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            requests.append((request.url.path, body))
+            if request.url.path == "/webhooks/create":
+                webhook_id = len(requests)
+                return httpx.Response(
+                    200, json={"result": {"id": webhook_id, "secret": f"secret-{webhook_id}", **body}}
+                )
+            return httpx.Response(200, json={"result": {"id": "sub", **body}})
+
+        engine = _engine(_Engine())
+        engine.client = httpx.Client(transport=httpx.MockTransport(handler))
+        receiver = WebhookReceiver()
+
+        webhooks = engine.register_webhook_receiver(receiver, "https://agent.test/hooks", contracts=[(1, RECIPIENT)])
+
+        assert [webhook["eventType"] for webhook in webhooks] == ["all_transactions", "contract_subscription"]
+        assert requests[2] == (
+            "/contract-subscriptions/add",
+            {
+                "chain": "1",
+                "contractAddress": RECIPIENT,
+                "webhookId": 2,
+                "processEventLogs": True,
+                "processTransactionReceipts": False,
+            },
+        )
+
+        # polls would only happen in an hour, the notification resolves the transaction
+        engine.transaction_watcher.min_interval = engine.transaction_watcher.max_interval = 3600
+        future = engine.transaction_watcher.watch("q1")
+        body = json.dumps({"queueId": "q1", "status": "mined", "transactionHash": "0x01"}).encode()
+        timestamp = str(int(time.time()))
+        headers = {"X-Engine-Timestamp": timestamp, "X-Engine-Signature": sign_webhook(body, timestamp, "secret-1")}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=receiver), base_url="http://local") as client:
+            response = await client.post("/hooks", content=body, headers=headers)
+
+        assert response.status_code == 200
+        assert future.result(timeout=1)["transactionHash"] == "0x01"
+        engine.transaction_watcher.close()
+
+
+class TestWalletPool:
+    def test_sends_are_spread_over_the_pool(self):
+        handler = _Engine()
+        engine = _engine(handler)
+        engine.transaction_watcher.min_interval = engine.transaction_watcher.max_interval = 3600
+        engine.enable_wallet_pool([WALLET, RECIPIENT])
+
+        for _ in range(2):
+            engine.send_transaction().run_json({"to_address": RECIPIENT, "value": "1", "data": "0x", "chain_id": 1})
+        engine.send_transaction().run_json(
+            {"to_address": RECIPIENT, "value": "1", "data": "0x", "chain_id": 1, "backend_wallet_address": WALLET}
+        )
+
+        senders = [request.headers["X-Backend-Wallet-Address"] for request in handler.requests]
+        assert senders == [WALLET, RECIPIENT, WALLET]
+        assert engine.nonce_manager is not None
+        assert engine.nonce_manager.in_flight() == {(1, RECIPIENT): 1, (1, WALLET): 1}
+        engine.transaction_watcher.close()
+
+    def test_nonce_endpoints(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path.endswith("/get-nonce"):
+                return httpx.Response(200, json={"result": {"nonce": 7}})
+            if request.url.path.endswith("/get-transactions-by-nonce"):
+                return httpx.Response(200, json={"result": [{"nonce": 7, "transaction": None}]})
+            if request.url.path.endswith("/cancel-nonces"):
+                return httpx.Response(200, json={"result": {"cancelledNonces": [6, 7]}})
+            return httpx.Response(200, json={"result": {"status": "success", "count": 1}})
+
+        engine = _engine(_Engine())
+        engine.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        assert engine.get_nonce() == 7
+        assert engine.get_transactions_by_nonce(6, 7) == [{"nonce": 7, "transaction": None}]
+        assert engine.cancel_nonces(7) == [6, 7]
+        assert engine.reset_nonces()["count"] == 1
+
+        assert [request.url.path for request in requests] == [
+            f"/backend-wallet/137/{WALLET}/get-nonce",
+            f"/backend-wallet/137/{WALLET}/get-transactions-by-nonce",
+            "/backend-wallet/137/cancel-nonces",
+            "/backend-wallet/reset-nonces",
+        ]
+        assert dict(requests[1].url.params) == {"fromNonce": "6", "toNonce": "7"}
+        assert json.loads(requests[2].content) == {"toNonce": 7}
+        assert json.loads(requests[3].content) == {"syncOnchainNonces": True, "chainId": 137, "walletAddress": WALLET}
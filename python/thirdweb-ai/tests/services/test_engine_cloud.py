@@ -0,0 +1,42 @@
+import json
+
+import httpx
+
+from thirdweb_ai.services.engine_cloud import EngineCloud
+
+ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+
+
+def _reads(requests: list[dict]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        return httpx.Response(200, json={"result": [{"success": True, "result": p["method"]} for p in body["params"]]})
+
+    return handler
+
+
+class TestReadContracts:
+    def test_read_contracts_batches_params(self):
+        requests: list[dict] = []
+        engine = EngineCloud(secret_key="test", vault_access_token="vault")
+        engine.client = httpx.Client(transport=httpx.MockTransport(_reads(requests)))
+        calls = [{"contractAddress": ADDRESS, "method": method, "params": [], "abi": []} for method in "abcab"]
+
+        results = engine.read_contracts(calls, chain_id=8453, batch_size=2)
+
+        assert [r["result"] for r in results] == list("abcab")
+        assert sorted(len(body["params"]) for body in requests) == [1, 2]
+        assert requests[0]["readOptions"]["chainId"] == 8453
+
+    def test_read_contract_batch_tool(self):
+        requests: list[dict] = []
+        engine = EngineCloud(secret_key="test", vault_access_token="vault")
+        engine.client = httpx.Client(transport=httpx.MockTransport(_reads(requests)))
+        calls = [{"contractAddress": ADDRESS, "method": method, "params": [], "abi": []} for method in "aba"]
+
+        out = engine.read_contract_batch().run_json({"calls": calls, "chain_id": 1, "from_address": ADDRESS})
+
+        assert [r["result"] for r in out["results"]] == list("aba")
+        assert len(requests) == 1
+        assert requests[0]["readOptions"] == {"multicallAddress": None, "chainId": 1, "from": ADDRESS}
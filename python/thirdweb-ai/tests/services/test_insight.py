@@ -0,0 +1,616 @@
+import httpx
+import pytest
+from eth_abi.abi import encode
+
+from thirdweb_ai.common.address import validate_address
+from thirdweb_ai.common.cache import default_cache
+from thirdweb_ai.common.event_store import EventStore
+from thirdweb_ai.common.query import EventQuery
+from thirdweb_ai.services.insight import AsyncInsight, Insight, _resolved_signatures
+from thirdweb_ai.tools.executor import set_tool_executor
+
+ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    default_cache.clear()
+
+
+class _Events:
+    """Serves ``total`` events newest first, recording the query of every request."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requests: list[httpx.QueryParams] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.params)
+        page, limit = int(request.url.params["page"]), int(request.url.params["limit"])
+        blocks = range(self.total - page * limit, max(self.total - (page + 1) * limit, 0), -1)
+        return httpx.Response(200, json={"data": [{"block_number": block} for block in blocks]})
+
+
+class TestIterators:
+    def test_iter_events(self):
+        events = _Events(250)
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(events))
+
+        blocks = [
+            event["block_number"]
+            for event in insight.iter_events(contract_address=ADDRESS, from_block=10, limit=100, prefetch=False)
+        ]
+
+        assert blocks == list(range(250, 0, -1))
+        assert [params["page"] for params in events.requests] == ["0", "1", "2"]
+        assert events.requests[0]["filter_address"] == ADDRESS
+        assert events.requests[0]["filter_block_number_gte"] == "10"
+        assert events.requests[0]["sort_order"] == "desc"
+
+    def test_iter_nft_transfers_stop_when(self):
+        events = _Events(250)
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(events))
+
+        transfers = list(
+            insight.iter_nft_transfers(ADDRESS, limit=50, stop_when=lambda t: t["block_number"] <= 200, prefetch=False)
+        )
+
+        assert len(transfers) == 50
+        assert len(events.requests) == 2
+        assert events.requests[0]["chain"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_aiter_transactions(self):
+        events = _Events(30)
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(events))
+
+        transactions = [tx async for tx in insight.aiter_transactions(from_address=ADDRESS, limit=20, max_items=25)]
+
+        assert len(transactions) == 25
+        assert events.requests[0]["filter_from_address"] == ADDRESS
+
+
+class TestChains:
+    def test_chain_ids(self):
+        assert Insight(secret_key="test").chain_ids == [1]
+        assert Insight(secret_key="test", chain_id=137).chain_ids == [137]
+        assert Insight(secret_key="test", chain_id=[1, 137]).chain_ids == [1, 137]
+
+    def test_iter_events_fans_out_over_many_chains(self):
+        chains: list[list[str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            group = request.url.params.get_list("chain")
+            chains.append(group)
+            if request.url.params["page"] != "0":
+                return httpx.Response(200, json={"data": []})
+            data = [{"chain_id": int(chain), "block_timestamp": 100 - int(chain)} for chain in group]
+            return httpx.Response(200, json={"data": data})
+
+        insight = Insight(secret_key="test", chain_id=list(range(1, 13)))
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        events = list(insight.iter_events(sort_by="block_timestamp", limit=5))
+
+        assert [event["chain_id"] for event in events] == list(range(1, 13))
+        assert max(len(group) for group in chains) == 5
+
+    @staticmethod
+    def _events_per_chain(requests: list[httpx.QueryParams]):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.params)
+            group = [int(chain) for chain in request.url.params.get_list("chain")]
+            events = [{"chain_id": chain, "block_number": 1000 - 12 * i - chain} for i in range(50) for chain in group]
+            events.sort(key=lambda event: event["block_number"], reverse=True)
+            return httpx.Response(200, json={"data": events[: int(request.url.params["limit"])]})
+
+        return handler
+
+    def test_tool_page_over_many_chains(self):
+        requests: list[httpx.QueryParams] = []
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(self._events_per_chain(requests)))
+
+        out = insight.get_contract_events().run_json(
+            {"contract_address": ADDRESS, "chain_id": list(range(1, 13)), "page": 1}
+        )
+
+        # events of all chains merged in the order of the API, the second page of 20
+        blocks = sorted((1000 - 12 * i - chain for i in range(50) for chain in range(1, 13)), reverse=True)
+        assert [event["block_number"] for event in out["data"]] == blocks[20:40]
+        assert out["meta"]["chain_ids"] == list(range(1, 13))
+        assert sorted(len(params.get_list("chain")) for params in requests) == [2, 5, 5]
+        assert {params["limit"] for params in requests} == {"40"}
+
+    def test_aggregations_over_too_many_chains(self):
+        insight = Insight(secret_key="test")
+        with pytest.raises(ValueError, match="at most 5 chains"):
+            insight.get_events().run_json({"chain_id": list(range(1, 8)), "aggregate": ["count() AS count"]})
+
+    @pytest.mark.asyncio
+    async def test_async_tool_page_over_many_chains(self):
+        requests: list[httpx.QueryParams] = []
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(self._events_per_chain(requests)))
+
+        out = await insight.get_filtered_transactions().run_json_async({"chain_id": list(range(1, 13))})
+
+        assert len(out["data"]) == 20
+        assert sorted(len(params.get_list("chain")) for params in requests) == [2, 5, 5]
+
+
+class TestBackfill:
+    def test_backfill_events(self, tmp_path):
+        ranges: list[tuple[str, str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            params = request.url.params
+            ranges.append((params["filter_block_number_gte"], params["filter_block_number_lte"]))
+            assert params["sort_order"] == "asc"
+            if params["page"] != "0":
+                return httpx.Response(200, json={"data": []})
+            start, end = int(params["filter_block_number_gte"]), int(params["filter_block_number_lte"])
+            return httpx.Response(200, json={"data": [{"block_number": block} for block in range(start, end + 1)]})
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        backfill = insight.backfill_events(
+            from_block=100, to_block=149, contract_address=ADDRESS, shard_size=10, workers=4, limit=10
+        )
+
+        assert [event["block_number"] for event in backfill] == list(range(100, 150))
+        assert ("100", "109") in ranges
+        assert ("140", "149") in ranges
+
+
+class TestEventSync:
+    @staticmethod
+    def _upstream(latest: list[int]):
+        requests: list[httpx.QueryParams] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            params = request.url.params
+            requests.append(params)
+            after = int(params.get("filter_block_number_gt", -1))
+            if params.get("page", "0") != "0":
+                return httpx.Response(200, json={"data": []})
+            data = [
+                {
+                    "chain_id": 1,
+                    "address": ADDRESS,
+                    "block_number": block,
+                    "transaction_hash": f"0x{block:064x}",
+                    "log_index": 0,
+                    "topics": [],
+                }
+                for block in range(1, latest[0] + 1)
+                if block > after
+            ]
+            return httpx.Response(200, json={"data": data})
+
+        return handler, requests
+
+    def test_sync_is_incremental_and_answers_tools(self, tmp_path):
+        latest = [30]
+        handler, requests = self._upstream(latest)
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        insight.event_store = EventStore(tmp_path / "events.db")
+
+        assert insight.sync_events(ADDRESS) == 30
+        latest[0] = 35
+        assert insight.sync_events(ADDRESS) == 5
+        assert requests[-1]["filter_block_number_gt"] == "30"
+        assert requests[-1]["sort_order"] == "asc"
+
+        sent = len(requests)
+        out = insight.get_contract_events().run_json({"contract_address": ADDRESS, "page": 1})
+        assert out["meta"]["source"] == "event_store"
+        assert [event["block_number"] for event in out["data"]] == list(range(15, 0, -1))
+        assert len(requests) == sent
+
+        # untracked contracts still go upstream
+        other = "0x" + "1" * 40
+        insight.get_contract_events().run_json({"contract_address": other})
+        assert len(requests) == sent + 1
+
+    def test_stale_sync_is_refreshed(self, tmp_path):
+        latest = [10]
+        handler, requests = self._upstream(latest)
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        insight.event_store = EventStore(tmp_path / "events.db")
+        insight.sync_events(ADDRESS)
+        insight.event_store_max_age = 0
+        latest[0] = 12
+
+        out = insight.get_events().run_json({"contract_address": ADDRESS})
+
+        assert out["data"][0]["block_number"] == 12
+        assert requests[-1]["filter_block_number_gt"] == "10"
+
+    @pytest.mark.asyncio
+    async def test_async_tool_asks_the_api_when_stale(self, tmp_path):
+        latest = [10]
+        handler, _ = self._upstream(latest)
+        insight = AsyncInsight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        insight.event_store = EventStore(tmp_path / "events.db")
+        insight.sync_events(ADDRESS)
+        insight.event_store_max_age = 0
+        latest[0] = 11
+
+        out = await insight.get_contract_events().run_json_async({"contract_address": ADDRESS})
+
+        # syncing would write to the store on every replay of the body, the API answers instead
+        assert out.get("meta", {}).get("source") != "event_store"
+        assert out["data"][-1]["block_number"] == 11
+        assert insight.event_store.sync_state(1, ADDRESS).last_block == 10
+
+
+class TestEventFilters:
+    def test_get_events_pushes_filters_and_aggregations_down(self):
+        requests: list[httpx.QueryParams] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.params)
+            return httpx.Response(
+                200, json={"data": [{"block_number": 1}] * 20, "aggregations": [{"day": "2025-01-01", "count": 42}]}
+            )
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        transfer = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+        out = insight.get_events().run_json(
+            {
+                "contract_address": ADDRESS,
+                "topics": [transfer, None, "0x" + "0" * 64],
+                "from_timestamp": 1_735_689_600,
+                "group_by": ["toStartOfDay(block_timestamp) AS day"],
+                "aggregate": ["count() AS count"],
+            }
+        )
+
+        assert out == {"aggregations": [{"day": "2025-01-01", "count": 42}]}
+        params = requests[0]
+        assert params["filter_topic_0"] == transfer
+        assert "filter_topic_1" not in params
+        assert params["filter_topic_2"] == "0x" + "0" * 64
+        assert params["filter_block_timestamp_gte"] == "1735689600"
+        assert params.get_list("group_by") == ["toStartOfDay(block_timestamp) AS day"]
+        assert params.get_list("aggregate") == ["count() AS count"]
+
+    def test_query_events_uses_service_chains(self):
+        requests: list[httpx.QueryParams] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.params)
+            return httpx.Response(200, json={"data": []})
+
+        insight = Insight(secret_key="test", chain_id=[1, 137])
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        insight.query_events(EventQuery().emitted_by(ADDRESS).blocks(1, 2))
+
+        assert requests[0].get_list("chain") == ["1", "137"]
+        assert requests[0]["filter_block_number_lte"] == "2"
+
+    def test_time_window_becomes_block_range(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path.endswith("/blocks"):
+                # a block every 12 seconds from 2025-01-01
+                params = request.url.params
+                if "filter_block_timestamp_gte" in params:
+                    number = -(-(int(params["filter_block_timestamp_gte"]) - 1_735_689_600) // 12)
+                else:
+                    number = (int(params["filter_block_timestamp_lte"]) - 1_735_689_600) // 12
+                return httpx.Response(
+                    200, json={"data": [{"block_number": number, "block_timestamp": 1_735_689_600 + 12 * number}]}
+                )
+            return httpx.Response(200, json={"data": []})
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        arguments = {"contract_address": ADDRESS, "since": "2025-01-02T00:00:00Z", "until": "2025-01-02T01:00:00Z"}
+
+        insight.get_events().run_json(arguments)
+        insight.get_contract_events().run_json(arguments)
+
+        events = [request.url.params for request in requests if not request.url.path.endswith("/blocks")]
+        # no block after the window is known, so later blocks may still fall into it and its end is looked up again
+        assert [request.url.path.endswith("/blocks") for request in requests] == [True, True, False, True, False]
+        for params in events:
+            assert params["filter_block_number_gte"] == "7200"
+            assert params["filter_block_number_lte"] == "7500"
+            assert "filter_block_timestamp_gte" not in params
+
+    def test_time_window_across_chains_filters_timestamps(self):
+        requests: list[httpx.QueryParams] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.params)
+            return httpx.Response(200, json={"data": []})
+
+        insight = Insight(secret_key="test", chain_id=[1, 137])
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        insight.get_filtered_transactions().run_json({"from_address": ADDRESS, "since": "1735689600"})
+
+        assert len(requests) == 1
+        assert requests[0]["filter_block_timestamp_gte"] == "1735689600"
+
+
+TRANSFER_ABI = [
+    {
+        "type": "event",
+        "name": "Transfer",
+        "inputs": [
+            {"name": "from", "type": "address", "indexed": True},
+            {"name": "to", "type": "address", "indexed": True},
+            {"name": "value", "type": "uint256", "indexed": False},
+        ],
+    }
+]
+
+
+def _transfer_log(value: int) -> dict:
+    topic = "0x" + encode(["address"], [ADDRESS]).hex()
+    return {
+        "chain_id": 1,
+        "address": ADDRESS,
+        "topics": ["0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef", topic, topic],
+        "data": "0x" + encode(["uint256"], [value]).hex(),
+    }
+
+
+class TestLocalDecoding:
+    def test_iter_events_decodes_locally(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path.startswith("/v1/contracts/abi/"):
+                return httpx.Response(200, json=TRANSFER_ABI)
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={"data": [_transfer_log(value) for value in range(page * 2, page * 2 + 2)]})
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        events = list(
+            insight.iter_events(contract_address=ADDRESS, limit=2, max_items=6, prefetch=False, decode_locally=True)
+        )
+
+        assert [event["decoded"]["non_indexed_params"]["value"] for event in events] == list(range(6))
+        event_requests = [r for r in requests if r.url.path == "/v1/events"]
+        assert {r.url.params["decode"] for r in event_requests} == {"false"}
+        assert len(requests) - len(event_requests) == 1
+
+
+class TestSelectorDatabase:
+    def test_known_selectors_are_decoded_without_requests(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError(f"unexpected request {request.url}")
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        out = insight.decode_signature().run_json({"signature": "0xa9059cbb"})
+
+        decoded = {"name": "transfer", "signature": "transfer(address,uint256)"}
+        assert out == {
+            "data": {"type": "function_signature", "transactions": [{"decodedData": decoded}]},
+            "meta": {"source": "selector_database"},
+        }
+        assert _resolved_signatures(out) == ["transfer(address,uint256)"]
+
+    def test_decode_signatures_falls_back_to_the_api(self):
+        requests: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.path)
+            transaction = {"decoded": {"name": "foo", "signature": "foo(uint256)"}}
+            return httpx.Response(200, json={"data": {"type": "function_signature", "transactions": [transaction]}})
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        decoded = insight.decode_signatures(["0x095ea7b3", "0x2fbebd38", "0x095ea7b3"])
+
+        assert decoded == {"0x095ea7b3": ["approve(address,uint256)"], "0x2fbebd38": ["foo(uint256)"]}
+        assert requests == ["/v1/resolve/0x2fbebd38"]
+
+    def test_decode_signatures_on_a_busy_tool_executor(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            transaction = {"decoded": {"signature": f"f{request.url.path[-8:]}()"}}
+            return httpx.Response(200, json={"data": {"transactions": [transaction]}})
+
+        insight = Insight(secret_key="test")
+        insight.selector_database = None
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        executor = set_tool_executor(max_workers=1)
+        try:
+            # called from the only worker, the lookups must not wait for a free worker
+            future = executor.submit(insight.decode_signatures, ["0x00000001", "0x00000002"])
+            decoded = future.result(timeout=5)
+        finally:
+            set_tool_executor()
+
+        assert decoded == {"0x00000001": ["f00000001()"], "0x00000002": ["f00000002()"]}
+
+
+class _Prices:
+    """Serves a price for every token requested on every chain but the ones in ``unpriced``."""
+
+    def __init__(self, unpriced: frozenset[str] = frozenset()):
+        self.unpriced = unpriced
+        self.requests: list[httpx.QueryParams] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url.params)
+        data = [
+            {"chain_id": int(chain), "address": address.lower(), "price_usd": int(address, 16) % 1000}
+            for chain in request.url.params.get_list("chain")
+            for address in request.url.params.get_list("address")
+            if address.lower() not in self.unpriced
+        ]
+        return httpx.Response(200, json={"data": data})
+
+
+class TestTokenPrices:
+    def test_dedupes_chunks_and_caches(self):
+        prices = _Prices(unpriced=frozenset({f"0x{1:040x}"}))
+        insight = Insight(secret_key="test", chain_id=[1, 137])
+        insight.client = httpx.Client(transport=httpx.MockTransport(prices))
+        tokens = [f"0x{i:040x}" for i in range(1, 121)]
+
+        result = insight.get_prices([*tokens, *tokens[:10]])
+
+        assert len(prices.requests) == 3
+        assert max(len(params.get_list("address")) for params in prices.requests) <= 50
+        assert [(p["address"], p["chain_id"]) for p in result] == [(t, c) for t in tokens[1:] for c in (1, 137)]
+
+        assert insight.get_prices(tokens[::-1], chain_id=1)[0]["address"] == tokens[-1]
+        assert len(prices.requests) == 3
+
+    def test_historical_prices(self):
+        prices = _Prices()
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(prices))
+
+        out = insight.get_token_prices().run_json({"token_addresses": [ADDRESS], "timestamp": 1_700_000_000})
+
+        assert out["data"][0]["address"] == ADDRESS.lower()
+        assert prices.requests[0]["timestamp"] == "1700000000"
+        insight.get_prices([ADDRESS])
+        assert len(prices.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_tool(self):
+        prices = _Prices()
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(prices))
+        tokens = [f"0x{i:040x}" for i in range(1, 121)]
+
+        out = await insight.get_token_prices().run_json_async({"token_addresses": tokens})
+
+        assert [p["address"] for p in out["data"]] == tokens
+        assert len(prices.requests) == 3
+
+
+class _Balances:
+    """Serves one token per chain for every wallet, failing for the wallets in ``failing``."""
+
+    def __init__(self, failing: frozenset[str] = frozenset()):
+        self.failing = failing
+        self.requests: list[httpx.URL] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request.url)
+        if request.url.path == "/v1/tokens/price":
+            params = request.url.params
+            data = [
+                {"chain_id": int(c), "address": a, "price_usd": 2.0}
+                for c in params.get_list("chain")
+                for a in params.get_list("address")
+            ]
+            return httpx.Response(200, json={"data": data})
+        owner = request.url.path.rsplit("/", 1)[-1]
+        if owner in self.failing:
+            return httpx.Response(400, json={"error": "bad request"})
+        token = f"0x{int(owner, 16) % 7:040x}"
+        balances = [
+            {"chain_id": int(c), "token_address": token, "balance": "10", "decimals": 1}
+            for c in request.url.params.get_list("chain")
+        ]
+        return httpx.Response(200, json={"data": balances})
+
+
+class TestPortfolio:
+    def test_portfolio_tool(self):
+        wallets = [f"0x{i:040x}" for i in range(1, 15)]
+        balances = _Balances(failing=frozenset({validate_address(wallets[0])}))
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(balances))
+
+        out = insight.get_portfolio().run_json({"owner_addresses": wallets, "chain_id": list(range(1, 9))})
+
+        # 14 wallets with 8 chains in 2 groups of chains, and the prices of 7 tokens on 8 chains
+        balance_requests = [url for url in balances.requests if url.path.startswith("/v1/tokens/erc20/")]
+        price_requests = [url for url in balances.requests if url.path == "/v1/tokens/price"]
+        assert len(balance_requests) == 14 * 2
+        assert len(price_requests) == 2
+        assert out["position_count"] == 7 * 8
+        assert out["total_value_usd"] == 13 * 8 * 2.0
+        assert len(out["errors"]) == 2
+
+    def test_iter_balances_streams_updates(self):
+        wallets = [f"0x{i:040x}" for i in range(1, 4)]
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(_Balances()))
+
+        updates = list(insight.iter_balances(wallets, chain_id=[1, 137], token_types=["erc20", "erc721"]))
+
+        assert len(updates) == 6
+        assert {(u.request.owner, u.request.token_type) for u in updates} == {
+            (validate_address(w), t) for w in wallets for t in ("erc20", "erc721")
+        }
+
+
+class TestResolveMany:
+    def test_results_in_input_order_with_errors(self):
+        tx_hash = "0x" + "ab" * 32
+        paths: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            if request.url.path.endswith("unknown.eth"):
+                return httpx.Response(404, json={"error": "not found"})
+            return httpx.Response(200, json={"data": {"type": "transaction", "transactions": [{"hash": tx_hash}]}})
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        out = insight.resolve_many().run_json(
+            {"identifiers": [tx_hash, "vitalik.eth", "not an id", tx_hash.upper().replace("0X", "0x"), "unknown.eth"]}
+        )
+
+        results = out["data"]
+        assert [r["input"] for r in results] == [
+            tx_hash,
+            "vitalik.eth",
+            "not an id",
+            tx_hash.upper().replace("0X", "0x"),
+            "unknown.eth",
+        ]
+        assert results[0]["data"]["transactions"] == [{"hash": tx_hash}]
+        assert results[3]["data"] == results[0]["data"]
+        assert "Invalid transaction hash, block, address or ENS name" in results[2]["error"]
+        assert results[4]["error"].startswith("HTTPStatusError")
+        assert sorted(paths) == sorted([f"/v1/resolve/{tx_hash}", "/v1/resolve/vitalik.eth", "/v1/resolve/unknown.eth"])
+
+    def test_malformed_responses_fail_only_their_item(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("broken.eth"):
+                return httpx.Response(200, content=b"<html>")
+            if request.url.path.endswith("nodata.eth"):
+                return httpx.Response(200, json={"unexpected": True})
+            return httpx.Response(200, json={"data": {"type": "address"}})
+
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        results = insight.resolve_identifiers(["broken.eth", "vitalik.eth", "nodata.eth"])
+
+        assert results[0]["error"].startswith("JSONDecodeError")
+        assert results[1]["data"] == {"type": "address"}
+        assert results[2]["error"].startswith("KeyError")
@@ -0,0 +1,405 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from thirdweb_ai.common.cache import MemoryCache, SqliteCache, default_cache
+from thirdweb_ai.common.metrics import metrics
+from thirdweb_ai.common.rate_limit import AdaptiveConcurrencyLimit, RateLimiter, set_rate_limiter
+from thirdweb_ai.common.retry import RetryPolicy
+from thirdweb_ai.services.engine import Engine
+from thirdweb_ai.services.insight import DEFAULT_RESOLVE_CONCURRENCY, AsyncInsight, Insight
+from thirdweb_ai.services.service import AsyncService
+from thirdweb_ai.tools.tool import tool
+
+ADDRESS = "0xd8dA6BF26964aF9D7eEd9e03E53415D37aA96045"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    default_cache.clear()
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={"data": [{"block_number": 1, "address": ADDRESS, "chain_id": 1}], "path": request.url.path},
+    )
+
+
+class TestService:
+    def test_sync_tool(self):
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(_handler))
+        tool = insight.get_events()
+
+        out = tool.run_json({"contract_address": ADDRESS})
+
+        assert not tool.is_async
+        assert out["path"] == "/v1/events"
+        assert out["data"] == [{"block_number": 1, "address": ADDRESS}]
+
+
+class _Flaky:
+    """Fails with the given statuses before answering successfully."""
+
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers={"Retry-After": "0"})
+        return _handler(request)
+
+
+class TestRetries:
+    def test_get_is_retried(self):
+        metrics.reset()
+        flaky = _Flaky(429, 502)
+        insight = Insight(secret_key="test")
+        insight.retry_policy = RetryPolicy(backoff_base=0)
+        insight.client = httpx.Client(transport=httpx.MockTransport(flaky))
+
+        out = insight.get_contract_metadata().run_json({"contract_address": ADDRESS})
+
+        assert out["path"] == f"/v1/contracts/metadata/{ADDRESS}"
+        assert flaky.calls == 3
+        assert metrics.get_counter("http.retries", service="Insight") == 2
+        assert metrics.get_counter("http.retries", reason=429) == 1
+
+    def test_retry_budget_exhausted(self):
+        flaky = _Flaky(503, 503, 503)
+        insight = Insight(secret_key="test")
+        insight.retry_policy = RetryPolicy(max_retries=2, backoff_base=0)
+        insight.client = httpx.Client(transport=httpx.MockTransport(flaky))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            insight.get_contract_metadata().run_json({"contract_address": ADDRESS})
+        assert flaky.calls == 3
+
+    def test_engine_writes_are_not_retried(self):
+        flaky = _Flaky(503)
+        engine = Engine(
+            engine_url="https://engine.test", engine_auth_jwt="jwt", chain_id=1, backend_wallet_address=ADDRESS
+        )
+        engine.retry_policy = RetryPolicy(backoff_base=0)
+        engine.client = httpx.Client(transport=httpx.MockTransport(flaky))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            engine.send_transaction().run_json({"to_address": ADDRESS, "value": "0", "data": "0x", "chain_id": 1})
+        assert flaky.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_async_get_is_retried(self):
+        flaky = _Flaky(429)
+        insight = AsyncInsight(secret_key="test")
+        insight.retry_policy = RetryPolicy(backoff_base=0)
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(flaky))
+
+        out = await insight.get_contract_metadata().run_json_async({"contract_address": ADDRESS})
+
+        assert out["path"] == f"/v1/contracts/metadata/{ADDRESS}"
+        assert flaky.calls == 2
+
+
+class _Counting:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return _handler(request)
+
+
+class TestCache:
+    def test_cached_endpoint(self):
+        metrics.reset()
+        handler = _Counting()
+        insight = Insight(secret_key="test")
+        insight.cache = MemoryCache()
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        tool = insight.get_contract_metadata()
+
+        first = tool.run_json({"contract_address": ADDRESS, "chain_id": [1, 137]})
+        first["data"].clear()
+        second = tool.run_json({"contract_address": ADDRESS, "chain_id": [1, 137]})
+
+        assert handler.calls == 1
+        assert second["data"] == [{"block_number": 1, "address": ADDRESS, "chain_id": 1}]
+        assert metrics.get_counter("cache.hits", service="Insight", endpoint="contracts/metadata/*") == 1
+        assert metrics.get_counter("cache.misses", service="Insight") == 1
+
+    def test_responses_are_not_shared_between_secret_keys(self):
+        handler = _Counting()
+        for secret_key in ("A", "B", "A"):
+            insight = Insight(secret_key=secret_key)
+            insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+            insight.get_contract_metadata().run_json({"contract_address": ADDRESS})
+
+        assert handler.calls == 2
+
+    def test_uncached_endpoint(self):
+        handler = _Counting()
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        tool = insight.get_events()
+
+        tool.run_json({"contract_address": ADDRESS})
+        tool.run_json({"contract_address": ADDRESS})
+
+        assert handler.calls == 2
+
+    def test_cache_disabled(self):
+        handler = _Counting()
+        insight = Insight(secret_key="test")
+        insight.cache = None
+        insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+        tool = insight.get_contract_metadata()
+
+        tool.run_json({"contract_address": ADDRESS})
+        tool.run_json({"contract_address": ADDRESS})
+
+        assert handler.calls == 2
+
+    def test_persistent_cache(self, tmp_path: Path):
+        handler = _Counting()
+        signature = "0x095ea7b3"
+        for _ in range(2):
+            # a fresh service and memory cache, as after a restart
+            insight = Insight(secret_key="test")
+            insight.cache = MemoryCache()
+            insight.persistent_cache = SqliteCache(tmp_path / "cache.sqlite")
+            insight.selector_database = None
+            insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+            insight.decode_signature().run_json({"signature": signature})
+
+        assert handler.calls == 1
+        assert metrics.get_counter("cache.hits", tier="persistent", endpoint="resolve/0x????????") >= 1
+
+    def test_unfinished_lookups_are_not_persisted(self, tmp_path: Path):
+        transaction_hash = "0x" + "ab" * 32
+        answers = [
+            {"data": {}},
+            {"data": {"transactions": [{"hash": transaction_hash, "block_number": None}]}},
+            {"data": {"transactions": [{"hash": transaction_hash, "block_number": 7}]}},
+        ]
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=answers[min(len(requests), len(answers)) - 1])
+
+        for _ in range(4):
+            # a fresh service and memory cache, as after a restart
+            insight = Insight(secret_key="test")
+            insight.cache = MemoryCache()
+            insight.persistent_cache = SqliteCache(tmp_path / "cache.sqlite")
+            insight.client = httpx.Client(transport=httpx.MockTransport(handler))
+            out = insight.get_transaction_details().run_json({"transaction_hash": transaction_hash})
+
+        assert len(requests) == 3
+        assert out["data"]["transactions"][0]["block_number"] == 7
+
+    @pytest.mark.asyncio
+    async def test_async_cached_endpoint(self):
+        metrics.reset()
+        handler = _Counting()
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        tool = insight.get_contract_metadata()
+
+        await tool.run_json_async({"contract_address": ADDRESS})
+        await tool.run_json_async({"contract_address": ADDRESS})
+
+        assert handler.calls == 1
+        assert metrics.get_counter("cache.misses", service="AsyncInsight") == 1
+        assert metrics.get_counter("cache.hits", service="AsyncInsight") == 1
+
+
+class TestCoalescing:
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_are_sent_once(self):
+        metrics.reset()
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return _handler(request)
+
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        tool = insight.get_events()
+
+        results = await asyncio.gather(*(tool.run_json_async({"contract_address": ADDRESS}) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(result["data"] == [{"block_number": 1, "address": ADDRESS}] for result in results)
+        assert metrics.get_counter("http.coalesced", service="AsyncInsight") == 4
+
+    @pytest.mark.asyncio
+    async def test_coalescing_disabled(self):
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return _handler(request)
+
+        insight = AsyncInsight(secret_key="test")
+        insight.coalesce_requests = False
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        tool = insight.get_events()
+
+        await asyncio.gather(*(tool.run_json_async({"contract_address": ADDRESS}) for _ in range(3)))
+
+        assert len(calls) == 3
+
+
+class TestRateLimiting:
+    def test_requests_go_through_the_shared_limiter(self):
+        metrics.reset()
+        concurrency = AdaptiveConcurrencyLimit(initial_limit=4, cooldown=0)
+        limiter = RateLimiter(rate=1000, concurrency=concurrency)
+        insight = Insight(secret_key="test")
+        insight.retry_policy = RetryPolicy(backoff_base=0)
+        insight.client = httpx.Client(transport=httpx.MockTransport(_Flaky(429)))
+        insight.rate_limiter = limiter
+
+        insight.get_contract_metadata().run_json({"contract_address": ADDRESS})
+
+        assert concurrency.limit == 2
+        assert concurrency.in_flight == 0
+        assert metrics.get_summary("ratelimit.wait_seconds", service="Insight").count == 2
+
+    def test_limiter_registered_for_the_secret_key(self):
+        metrics.reset()
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(_handler))
+        other = Insight(secret_key="other")
+        limiter = RateLimiter(rate=1000)
+        set_rate_limiter("test", limiter)
+        try:
+            assert insight.rate_limiter is limiter
+            assert Insight(secret_key="test").rate_limiter is limiter
+            assert other.rate_limiter is None
+
+            insight.get_contract_metadata().run_json({"contract_address": ADDRESS})
+            assert metrics.get_summary("ratelimit.wait_seconds", service="Insight").count == 1
+
+            own = RateLimiter(rate=10)
+            insight.rate_limiter = own
+            assert insight.rate_limiter is own
+        finally:
+            set_rate_limiter("test", None)
+        assert Insight(secret_key="test").rate_limiter is None
+
+    @pytest.mark.asyncio
+    async def test_async_requests_go_through_the_limiter(self):
+        metrics.reset()
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        insight.rate_limiter = RateLimiter(rate=1000, concurrency=AdaptiveConcurrencyLimit())
+
+        await insight.get_contract_metadata().run_json_async({"contract_address": ADDRESS})
+
+        assert metrics.get_summary("ratelimit.wait_seconds", service="AsyncInsight").count == 1
+
+
+class TestAsyncService:
+    def test_get_tools_outside_event_loop(self):
+        tools = AsyncInsight(secret_key="test").get_tools()
+
+        assert len(tools) == len(Insight(secret_key="test").get_tools())
+        assert all(tool.is_async for tool in tools)
+
+    @pytest.mark.asyncio
+    async def test_async_tool_uses_async_client(self):
+        insight = AsyncInsight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(500)))
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+        tool = insight.get_events()
+
+        out = await tool.run_json_async({"contract_address": ADDRESS})
+
+        assert tool.is_async
+        assert out["path"] == "/v1/events"
+        assert out["data"] == [{"block_number": 1, "address": ADDRESS}]
+
+    @pytest.mark.asyncio
+    async def test_async_tool_raises_http_errors(self):
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: httpx.Response(404)))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await insight.get_contract_metadata().run_json_async({"contract_address": ADDRESS})
+
+    @pytest.mark.asyncio
+    async def test_sync_tool_runs_in_executor(self):
+        insight = Insight(secret_key="test")
+        insight.client = httpx.Client(transport=httpx.MockTransport(_handler))
+
+        out = await insight.get_contract_metadata().run_json_async({"contract_address": ADDRESS})
+
+        assert out["path"] == f"/v1/contracts/metadata/{ADDRESS}"
+
+    @pytest.mark.asyncio
+    async def test_async_bulk_tool_sends_requests_concurrently(self):
+        in_flight = 0
+        most_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            if request.url.path.endswith("0" * 64):
+                return httpx.Response(404)
+            return httpx.Response(200, json={"data": [{"hash": request.url.path.rsplit("/", 1)[-1]}]})
+
+        insight = AsyncInsight(secret_key="test")
+        insight.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        hashes = [f"0x{i:064x}" for i in range(10)]
+
+        out = await insight.resolve_many().run_json_async({"identifiers": hashes})
+
+        # at most the bound of resolve_identifiers at a time, instead of one after the other
+        assert most_in_flight == DEFAULT_RESOLVE_CONCURRENCY
+        assert "HTTPStatusError" in out["data"][0]["error"]
+        assert [item["data"][0]["hash"] for item in out["data"][1:]] == hashes[1:]
+
+
+class _Drifting(AsyncService):
+    def __init__(self):
+        super().__init__(base_url="https://api.test", secret_key="test")
+        self.runs = 0
+
+    @tool(description="Fetch two resources, the second one depending on how often the body ran.")
+    def drifting(self) -> dict:
+        self.runs += 1
+        first = self._get("first")
+        # like a time window that moves on between replays of the body
+        second = self._get("second", {"run": min(self.runs, 3)})
+        return {"first": first["path"], "second": second["query"]}
+
+
+class TestReplay:
+    @pytest.mark.asyncio
+    async def test_changed_requests_are_fetched_again(self):
+        requests: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(str(request.url))
+            return httpx.Response(200, json={"path": request.url.path, "query": request.url.query.decode()})
+
+        service = _Drifting()
+        service.async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        out = await service.drifting().run_json_async({})
+
+        assert out == {"first": "/first", "second": "run=3"}
+        assert requests == ["https://api.test/first", "https://api.test/second?run=2", "https://api.test/second?run=3"]
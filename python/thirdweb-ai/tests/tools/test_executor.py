@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated
+
+import pytest
+
+from thirdweb_ai.tools.executor import map_concurrently, run_tool_json_async
+from thirdweb_ai.tools.tool import FunctionTool
+
+
+def _blocking_tool(started: threading.Event, release: threading.Event) -> FunctionTool:
+    def wait(value: Annotated[int, "A value to echo back"]) -> int:
+        started.set()
+        release.wait(timeout=5)
+        return value
+
+    return FunctionTool(func_definition=wait, func_execute=wait, description="Echo a value")
+
+
+class TestRunToolJsonAsync:
+    @pytest.mark.asyncio
+    async def test_sync_tool_does_not_block_event_loop(self):
+        started, release = threading.Event(), threading.Event()
+        tool = _blocking_tool(started, release)
+
+        task = asyncio.create_task(run_tool_json_async(tool, {"value": 7}))
+        assert await asyncio.to_thread(started.wait, 5)
+        # the event loop keeps running while the tool is blocked in its worker thread
+        assert not task.done()
+        release.set()
+
+        assert await task == 7
+
+    @pytest.mark.asyncio
+    async def test_custom_executor(self):
+        started, release = threading.Event(), threading.Event()
+        release.set()
+        tool = _blocking_tool(started, release)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="custom") as executor:
+            assert await run_tool_json_async(tool, {"value": 3}, executor=executor) == 3
+
+    @pytest.mark.asyncio
+    async def test_native_async_tool_is_awaited(self):
+        def definition(value: Annotated[int, "A value to echo back"]) -> int:
+            raise AssertionError("the synchronous executor must not be used")
+
+        async def execute(value: int) -> int:
+            return value * 2
+
+        tool = FunctionTool(
+            func_definition=definition,
+            func_execute=definition,
+            func_execute_async=execute,
+            description="Double a value",
+        )
+
+        assert tool.is_async
+        assert await run_tool_json_async(tool, {"value": 4}) == 8
+
+
+class TestMapConcurrently:
+    def test_results_are_in_order(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert map_concurrently(lambda value: value * 2, range(10), executor=executor) == [v * 2 for v in range(10)]
+
+    def test_does_not_deadlock_a_busy_executor(self):
+        # the only worker runs the outer call, which must still be able to finish its items
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(map_concurrently, lambda value: value + 1, [1, 2, 3], executor)
+            assert future.result(timeout=5) == [2, 3, 4]
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def work(value: int) -> int:
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.01)
+            with lock:
+                running[0] -= 1
+            return value
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert map_concurrently(work, range(20), executor=executor, max_concurrency=3) == list(range(20))
+        assert 1 < peak[0] <= 3
@@ -4,6 +4,7 @@ from typing import Literal
 import click
 from thirdweb_ai import Engine, EngineCloud, Insight, Nebula, Storage
 from thirdweb_ai.adapters.mcp import add_fastmcp_tools
+from thirdweb_ai.common.cache import SqliteCache
 
 from mcp.server.fastmcp import FastMCP
 
@@ -61,6 +62,12 @@ from mcp.server.fastmcp import FastMCP
     default=lambda: os.getenv("THIRDWEB_VAULT_ACCESS_TOKEN"),
     help="Access token for the vault service, required for certain EngineCloud operations like creating server wallets. Falls back to THIRDWEB_VAULT_ACCESS_TOKEN environment variable if not specified.",
 )
+@click.option(
+    "--cache-path",
+    type=click.Path(dir_okay=False),
+    default=lambda: os.getenv("THIRDWEB_CACHE_PATH"),
+    help="Path of a SQLite file used to persist immutable insight results (transactions, blocks, signatures and contract ABIs) across restarts. Can be shared by several server processes on the same host. Falls back to THIRDWEB_CACHE_PATH environment variable if not specified.",
+)
 def main(
     port: int,
     transport: Literal["stdio", "sse"],
@@ -70,6 +77,7 @@ def main(
     engine_auth_jwt: str,
     engine_backend_wallet_address: str | None,
     vault_access_token: str | None,
+    cache_path: str | None,
 ):
     mcp = FastMCP("thirdweb MCP", port=port)
 
@@ -95,6 +103,8 @@ def main(
 
     if "insight" in services:
         insight = Insight(secret_key=secret_key, chain_id=chain_ids)
+        if cache_path:
+            insight.persistent_cache = SqliteCache(cache_path)
         add_fastmcp_tools(mcp, insight.get_tools())
 
     if "storage" in services: